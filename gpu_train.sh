@@ -8,4 +8,4 @@ module purge
 eval "$(conda shell.bash hook)"
 conda activate vex_adversarial
 
-python src/training.py
+python src/training.py --num-workers "$SLURM_CPUS_PER_GPU"
@@ -0,0 +1,64 @@
+"""
+Measures environment steps/sec of BatchedTippingPointEnv as the number of fields grows, against a DummyVecEnv of
+TippingPointEnv instances. Episodes are long enough that resets are excluded from the timed steps.
+
+Run from the src directory:
+    python -m benchmarks.batchedEnvBenchmark --steps 200
+"""
+import argparse
+import random
+import numpy as np
+from stable_baselines3.common.vec_env import DummyVecEnv
+from entities.enumerations import ObservationMode
+from rl_training.batchedEnvironment import BatchedTippingPointEnv
+from rl_training.environment import TippingPointEnv
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def benchmark_vec_env(env, steps: int) -> float:
+    random.seed(0)
+    env.reset()
+    actions = np.random.RandomState(0).randint(0, 10, size=(steps, env.num_envs))
+    step_iter = iter(actions)
+
+    return env.num_envs * measure_rate(lambda: env.step(next(step_iter)), steps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--max-envs", type=int, default=256)
+    parser.add_argument(
+        "--max-dummy-envs", type=int, default=16, help="Largest DummyVecEnv to compare against"
+    )
+    args = parser.parse_args()
+
+    mode = ObservationMode.ENTITY_LIST
+    episode = args.steps + 1
+
+    print(f"{'envs':>6} {'dummy steps/sec':>16} {'batched steps/sec':>18} {'per env':>10} {'speedup':>8}")
+    num_envs = 1
+    while num_envs <= args.max_envs:
+        batched = benchmark_vec_env(
+            BatchedTippingPointEnv(num_envs, episode, observation_mode=mode), args.steps
+        )
+
+        dummy = float("nan")
+        if num_envs <= args.max_dummy_envs:
+            dummy = benchmark_vec_env(
+                DummyVecEnv(
+                    [lambda: TippingPointEnv(episode, observation_mode=mode, copy_observations=False)]
+                    * num_envs
+                ),
+                args.steps,
+            )
+
+        print(
+            f"{num_envs:>6} {dummy:>16.0f} {batched:>18.0f} {batched / num_envs:>10.0f} "
+            f"{batched / dummy:>7.1f}x"
+        )
+        num_envs *= 2
+
+
+if __name__ == "__main__":
+    main()
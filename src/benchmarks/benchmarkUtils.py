@@ -0,0 +1,47 @@
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+
+def measure_rate(func: Callable[[], object], iterations: int) -> float:
+    """
+    Calls func the given number of times and returns the achieved calls per second
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+
+    return iterations / elapsed if elapsed > 0 else float("inf")
+
+
+def measure_allocations(
+    func: Callable[[], object], iterations: int
+) -> Tuple[float, float]:
+    """
+    Calls func the given number of times under tracemalloc, returning the mean peak bytes allocated per call and the
+    mean bytes retained per call
+    """
+    tracemalloc.start()
+    peak_total = 0
+    start_size, _ = tracemalloc.get_traced_memory()
+
+    for _ in range(iterations):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - before
+
+    end_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak_total / iterations, (end_size - start_size) / iterations
+
+
+def format_bytes(num_bytes: float) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
@@ -0,0 +1,61 @@
+"""
+Measures TippingPointEnv movement and step throughput with the batched collision query against the previous per-entity loop.
+
+Run from the src directory:
+    python -m benchmarks.collisionBenchmark --steps 2000
+"""
+import argparse
+import math
+import numpy as np
+from entities.fieldConfigurations import starting_representation
+from entities.fieldRepresentation import FieldState
+from entities.mathUtils import Pose2D
+from rl_training.environment import TippingPointEnv
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def legacy_move_collision(host, direction, field_rep):
+    ent_lst = [*field_rep.robots, *field_rep.goals, *field_rep.rings]
+    org_pos = host.pose
+    coords = np.array([org_pos.x, org_pos.y])
+    coords += direction
+    host.pose = Pose2D(coords[0], coords[1], math.atan2(direction[1], direction[0]))
+    colliding_ens = [en for en in ent_lst if en.is_colliding(host) and en is not host]
+
+    if len(colliding_ens) != 0:
+        host.pose = org_pos
+
+
+def benchmark_move_collision(move_collision, steps: int) -> tuple:
+    env = TippingPointEnv(steps * 2, copy_observations=False)
+    env.field_state = FieldState(starting_representation(), steps * 2)
+    rep = env.field_state.get_current_representation()
+    host = rep.robots[0]
+    rng = np.random.default_rng(0)
+    actions = iter(rng.integers(1, 5, size=steps))
+
+    if move_collision is not None:
+        env._move_collision = move_collision
+
+    move = lambda: env._move_collision(host, env._map_movement(next(actions)), rep)
+    move_rate = measure_rate(move, steps)
+
+    actions = iter(rng.integers(1, 5, size=steps))
+    step_rate = measure_rate(lambda: env.step(next(actions)), steps)
+
+    return move_rate, step_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'collision':<10} {'moves/sec':>10} {'steps/sec':>10}")
+    for name, move_collision in [("legacy", legacy_move_collision), ("batched", None)]:
+        move_rate, step_rate = benchmark_move_collision(move_collision, args.steps)
+        print(f"{name:<10} {move_rate:>10.1f} {step_rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
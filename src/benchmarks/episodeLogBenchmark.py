@@ -0,0 +1,75 @@
+"""
+Measures episode logging: env steps/sec with and without a record_dir, the size of the logs per step, and reading
+them back, as random seeks with EpisodeLog.get_representation and as a sequential pass with iter_representations.
+
+Run from the src directory:
+    python -m benchmarks.episodeLogBenchmark --steps 3000 --episode-steps 300 --seeks 200
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+import numpy as np
+from rl_training.environment import TippingPointEnv
+from rl_training.episodeLog import KEYFRAME_INTERVAL, EpisodeLog
+from benchmarks.benchmarkUtils import format_bytes
+
+
+def run_env(steps: int, episode_steps: int, **kwargs) -> float:
+    env = TippingPointEnv(episode_steps, **kwargs)
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    actions = [env.action_space.sample() for _ in range(steps)]
+
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=3000)
+    parser.add_argument("--episode-steps", type=int, default=300)
+    parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL)
+    parser.add_argument("--seeks", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'env':<12} {'steps/sec':>10}")
+        base_rate = run_env(args.steps, args.episode_steps)
+        print(f"{'plain':<12} {base_rate:>10.1f}")
+        rate = run_env(
+            args.steps, args.episode_steps, record_dir=tmp, keyframe_interval=args.keyframe_interval
+        )
+        print(f"{'recording':<12} {rate:>10.1f}   {100 * (base_rate / rate - 1):.1f}% overhead per step")
+
+        paths = sorted(glob.glob(os.path.join(tmp, "*.npz")))
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"\n{len(paths)} logs, {format_bytes(size)} total, {format_bytes(size / args.steps)} per step")
+
+        log = EpisodeLog(paths[0])
+        rng = np.random.default_rng(0)
+        steps = rng.integers(0, log.num_steps + 1, args.seeks)
+        start = time.perf_counter()
+        for step in steps:
+            log.get_representation(int(step))
+        seek_time = (time.perf_counter() - start) / args.seeks
+
+        start = time.perf_counter()
+        for _ in log.iter_representations():
+            pass
+        sequential_rate = (log.num_steps + 1) / (time.perf_counter() - start)
+
+        print(f"random seek  {1000 * seek_time:.2f} ms per step")
+        print(f"sequential   {sequential_rate:.1f} steps/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Microbenchmark of the dense observation export, comparing freshly allocated arrays against persistent buffers.
+
+Run from the src directory:
+    python -m benchmarks.exportBenchmark --iterations 500
+"""
+import argparse
+from entities.fieldConfigurations import starting_representation
+from entities.fieldRepresentation import ObservationBuffers
+from benchmarks.benchmarkUtils import format_bytes, measure_allocations, measure_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    rep = starting_representation()
+    buffers = ObservationBuffers()
+
+    cases = {
+        "allocate": lambda: rep.export_to_dict(),
+        "buffer copy": lambda: rep.export_to_dict(buffers, copy=True),
+        "buffer view": lambda: rep.export_to_dict(buffers, copy=False),
+    }
+
+    print(f"{'export':<12} {'bytes/call':>12} {'exports/sec':>12}")
+    for name, export in cases.items():
+        peak_bytes, _ = measure_allocations(export, args.iterations)
+        exports_per_sec = measure_rate(export, args.iterations)
+        print(f"{name:<12} {format_bytes(peak_bytes):>12} {exports_per_sec:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares the object model FieldRepresentation against the ArrayFieldRepresentation backend.
+
+Run from the src directory:
+    python -m benchmarks.fieldArraysBenchmark --iterations 1000
+"""
+import argparse
+from entities.enumerations import Color
+from entities.fieldArrays import ArrayFieldRepresentation
+from entities.fieldConfigurations import starting_representation
+from entities.fieldRepresentation import ObservationBuffers
+from entities.mathUtils import Pose2D
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    rep = starting_representation()
+    arrays = ArrayFieldRepresentation.from_representation(rep)
+    host = rep.robots[0]
+    host_idx = arrays.robots[0].idx
+    buffers = ObservationBuffers()
+
+    cases = {
+        "export": (
+            lambda: rep.export_to_dict(buffers, copy=False),
+            lambda: arrays.export_to_dict(buffers, copy=False),
+        ),
+        "score": (
+            lambda: sum(goal.get_current_score(Color.RED) for goal in rep.goals),
+            lambda: arrays.get_field_goal_score(Color.RED),
+        ),
+        "collision": (
+            lambda: [
+                ent
+                for ent in [*rep.robots, *rep.goals, *rep.rings]
+                if ent.is_colliding(host) and ent is not host
+            ],
+            lambda: arrays.get_colliding(Pose2D(48, 12), host.radius),
+        ),
+    }
+
+    print(f"{'operation':<10} {'objects/sec':>12} {'arrays/sec':>12}")
+    for name, (object_op, array_op) in cases.items():
+        object_rate = measure_rate(object_op, args.iterations)
+        array_rate = measure_rate(array_op, args.iterations)
+        print(f"{name:<10} {object_rate:>12.1f} {array_rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares branching starting_representation() for lookahead with copy.deepcopy against FieldRepresentation.fork and
+snapshot/restore, measuring branches/sec and the memory each branch keeps alive. Forks share their entities until
+changed, so the memory of a fork after moving the host is also reported, along with the size of the binary snapshot
+format against the JSON export.
+
+Run from the src directory:
+    python -m benchmarks.forkBenchmark --iterations 2000
+"""
+import argparse
+import copy
+import gc
+from entities.fieldConfigurations import starting_representation
+from entities.fieldRepresentation import FieldRepresentation
+from entities.fieldSnapshot import FieldSnapshot
+from entities.mathUtils import Pose2D
+from entities.robots import HostRobot
+from benchmarks.benchmarkUtils import format_bytes, measure_allocations, measure_rate
+
+# Branches kept alive when measuring memory, enough for a stable mean without holding thousands of deep copies
+MEMORY_ITERATIONS = 100
+
+
+def fork_and_move(rep: FieldRepresentation) -> FieldRepresentation:
+    fork = rep.fork()
+    host = next(robot for robot in fork.robots if type(robot) is HostRobot)
+    fork.set_pose(fork.get_writable(host), Pose2D(host.pose.x + 1, host.pose.y))
+    return fork
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    rep = starting_representation()
+    saved = rep.snapshot()
+    data = saved.to_bytes()
+
+    cases = [
+        ("deepcopy", lambda: copy.deepcopy(rep)),
+        ("fork", rep.fork),
+        ("fork + move host", lambda: fork_and_move(rep)),
+        ("snapshot", rep.snapshot),
+        ("restore", lambda: rep.restore(saved)),
+        ("snapshot to bytes", saved.to_bytes),
+        ("snapshot from bytes", lambda: FieldSnapshot.from_bytes(data)),
+    ]
+
+    print(f"{'case':<20} {'calls/sec':>10} {'memory/call':>12}")
+    base_rate = None
+    for name, func in cases:
+        gc.collect()
+        rate = measure_rate(func, args.iterations)
+        base_rate = base_rate or rate
+
+        # Results are kept alive, so the retained memory is what each branch costs
+        results = []
+        _, retained = measure_allocations(lambda: results.append(func()), MEMORY_ITERATIONS)
+        del results
+
+        print(f"{name:<20} {rate:>10.0f} {format_bytes(retained):>12}   {rate / base_rate:.1f}x")
+
+    print(f"Binary snapshot {format_bytes(len(data))}, JSON {format_bytes(len(rep.as_json()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures TippingPointEnv.render over an episode: the persistent, blitted figure of LiveFieldPlot against drawing a new
+figure with FieldRepresentation.draw every step, as render used to. Reports frames/sec, and the memory held at points
+through the episode to show whether it stays steady. Drawing new figures is slow, so it renders fewer steps.
+
+Run from the src directory:
+    python -m benchmarks.liveRenderBenchmark --steps 1000 --draw-steps 50
+"""
+import argparse
+import time
+import tracemalloc
+import matplotlib
+import matplotlib.pyplot as plt
+from rl_training.environment import TippingPointEnv
+from benchmarks.benchmarkUtils import format_bytes
+
+# Number of points through the episode at which the held memory is sampled
+NUM_SAMPLES = 4
+
+
+def render_draw(env: TippingPointEnv):
+    # Figures are never closed, as callers of the old render had to remember to
+    ax = env.field_state.get_current_representation().draw()
+    ax.figure.canvas.draw()
+
+
+def render_live(env: TippingPointEnv):
+    env.render()
+
+
+def measure(render, steps: int):
+    env = TippingPointEnv(steps + 1)
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    # The live figure is built outside the measurement, once per episode
+    env.render()
+
+    samples = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for step in range(1, steps + 1):
+        env.step(env.action_space.sample())
+        render(env)
+        if step % max(steps // NUM_SAMPLES, 1) == 0:
+            samples.append(tracemalloc.get_traced_memory()[0])
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    env.close()
+    plt.close("all")
+    return steps / elapsed, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--draw-steps", type=int, default=50)
+    args = parser.parse_args()
+
+    matplotlib.use("Agg")
+    # The leak of the old render is what is being measured
+    plt.rcParams["figure.max_open_warning"] = 0
+    print(f"{'render':<8} {'steps':>6} {'frames/sec':>11}   memory held through the episode")
+    base_rate = None
+    for name, render, steps in [("draw", render_draw, args.draw_steps), ("live", render_live, args.steps)]:
+        rate, samples = measure(render, steps)
+        base_rate = base_rate or rate
+        memory = " ".join(f"{format_bytes(sample):>9}" for sample in samples)
+        print(f"{name:<8} {steps:>6} {rate:>11.1f}   {memory}   {rate / base_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Measures FieldRepresentation.randomize resets/sec with the representation logger at each level, writing its records
+to a stream handler as configure_loggers does, into os.devnull. WARNING is the cost of the logging calls alone, as no
+spawn is logged at it.
+
+Run from the src directory:
+    python -m benchmarks.loggingBenchmark --resets 300
+"""
+import argparse
+import logging
+import os
+import numpy as np
+from entities.constants import REPRESENTATION_LOGGER_NAME
+from entities.fieldRepresentation import FieldRepresentation
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resets", type=int, default=300)
+    args = parser.parse_args()
+
+    logger = logging.getLogger(REPRESENTATION_LOGGER_NAME)
+    logger.propagate = False
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter("[%(created)f] | [%(levelname)s] | %(filename)s:%(lineno)d | %(message)s"))
+        logger.addHandler(handler)
+
+        rep = FieldRepresentation()
+        rng = np.random.default_rng(0)
+        print(f"{'level':<8} {'resets/sec':>11}")
+        for level in [logging.DEBUG, logging.INFO, logging.WARNING]:
+            logger.setLevel(level)
+            rate = measure_rate(lambda: rep.randomize(rng), args.resets)
+            print(f"{logging.getLevelName(level):<8} {rate:>11.1f}")
+
+        logger.removeHandler(handler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compares per-step allocations and throughput of the TippingPointEnv observation modes.
+
+Run from the src directory:
+    python -m benchmarks.observationBenchmark --steps 500
+"""
+import argparse
+from entities.enumerations import ObservationMode
+from rl_training.environment import TippingPointEnv
+from benchmarks.benchmarkUtils import format_bytes, measure_allocations, measure_rate
+
+
+def benchmark_observation_mode(mode: ObservationMode, steps: int, copy: bool) -> dict:
+    env = TippingPointEnv(steps * 3, observation_mode=mode, copy_observations=copy)
+    env.reset()
+    env.action_space.seed(0)
+
+    step = lambda: env.step(env.action_space.sample())
+
+    peak_bytes, retained_bytes = measure_allocations(step, steps)
+    steps_per_sec = measure_rate(step, steps)
+
+    return dict(
+        mode=mode.value,
+        peak_bytes=peak_bytes,
+        retained_bytes=retained_bytes,
+        steps_per_sec=steps_per_sec,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument(
+        "--copy", action="store_true", help="Return copies of the observation buffers"
+    )
+    args = parser.parse_args()
+
+    print(f"{'mode':<12} {'bytes/step':>12} {'retained/step':>14} {'steps/sec':>10}")
+    for mode in ObservationMode:
+        result = benchmark_observation_mode(mode, args.steps, args.copy)
+        print(
+            f"{result['mode']:<12} {format_bytes(result['peak_bytes']):>12} "
+            f"{format_bytes(result['retained_bytes']):>14} {result['steps_per_sec']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares all-pairs entity distances computed with per-entity distance_between_entities calls against the batched
+Pose2DArray matrix.
+
+Run from the src directory:
+    python -m benchmarks.pairwiseDistanceBenchmark --entities 80
+"""
+import argparse
+import random
+from entities.mathUtils import (
+    Pose2D,
+    distance_between_entities,
+    get_entity_arrays,
+    get_pairwise_entity_distances,
+)
+from entities.scoring_elements import LowNeutralGoal, Ring
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def make_entities(count: int) -> list:
+    rand = random.Random(0)
+    return [
+        (Ring if i % 4 else LowNeutralGoal)(Pose2D(rand.uniform(-72, 72), rand.uniform(0, 144)))
+        for i in range(count)
+    ]
+
+
+def scalar_pairwise(entities: list) -> list:
+    return [[distance_between_entities(ent1, ent2) for ent2 in entities] for ent1 in entities]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=80)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    entities = make_entities(args.entities)
+    poses, radii = get_entity_arrays(entities)
+
+    scalar = measure_rate(lambda: scalar_pairwise(entities), args.iterations)
+    batched = measure_rate(lambda: get_pairwise_entity_distances(poses, radii), args.iterations)
+    with_gather = measure_rate(
+        lambda: get_pairwise_entity_distances(*get_entity_arrays(entities)), args.iterations
+    )
+
+    print(f"{args.entities} entities, {args.entities ** 2} pairs")
+    print(f"{'method':<24} {'matrices/sec':>12} {'speedup':>8}")
+    for name, rate in [("scalar", scalar), ("Pose2DArray", batched), ("Pose2DArray + gather", with_gather)]:
+        print(f"{name:<24} {rate:>12.1f} {rate / scalar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
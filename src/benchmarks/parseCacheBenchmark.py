@@ -0,0 +1,57 @@
+"""
+Measures loading the example field files and a config file through ParseCache against parsing them on every load, as
+each worker of a training sweep does. Reports loads/sec for each, and the hit rate and time saved by the cache.
+
+The parsers import through the src package, so run from the project root:
+    python -m src.benchmarks.parseCacheBenchmark --iterations 200
+"""
+import argparse
+import glob
+import json
+import os
+import tempfile
+from src.benchmarks.benchmarkUtils import measure_rate
+from src.parsers.configParser import dict_config_parser
+from src.parsers.fieldParser import FieldParser
+from src.parsers.parseCache import ParseCache
+
+FIELD_FILES = os.path.join(os.path.dirname(__file__), "..", "examples", "fieldRepresentation", "*.json")
+
+
+def parse_field(path: str):
+    with open(path) as f:
+        return FieldParser().parse_representation(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    field_paths = sorted(glob.glob(FIELD_FILES))
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, "config.json")
+        with open(config_path, "w") as f:
+            json.dump({f"param_{i}": [i, i / 2, f"value {i}"] for i in range(200)}, f)
+
+        cache = ParseCache(os.path.join(tmp, "cache"))
+        cases = [
+            ("config", lambda: dict_config_parser(config_path), lambda: dict_config_parser(config_path, cache)),
+            (
+                "fields",
+                lambda: [parse_field(path) for path in field_paths],
+                lambda: [cache.load_field(path) for path in field_paths],
+            ),
+        ]
+
+        print(f"{'files':<8} {'parsed/sec':>11} {'cached/sec':>11} {'speedup':>8}")
+        for name, parse, load in cases:
+            parse_rate = measure_rate(parse, args.iterations)
+            cached_rate = measure_rate(load, args.iterations)
+            print(f"{name:<8} {parse_rate:>11.1f} {cached_rate:>11.1f} {cached_rate / parse_rate:>7.1f}x")
+
+        print(f"\n{cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measures MCTSPlanner decisions from a randomized field: simulations/sec and decision time for a fixed node budget,
+with rollouts in process and over process pools of increasing size. Worker start up is excluded.
+
+Run from the src directory:
+    python -m benchmarks.plannerBenchmark --budget 200 --decisions 3
+"""
+import argparse
+import os
+from rl_training.environment import TippingPointEnv
+from rl_training.mctsPlanner import MCTSPlanner, random_policy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=int, default=200)
+    parser.add_argument("--decisions", type=int, default=3)
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument("--rollout-depth", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Node budget {args.budget}, time limit {args.time_limit}s, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'sims/sec':>9} {'sec/decision':>13} {'table nodes':>12}")
+    for num_workers in [1, 2, 4]:
+        env = TippingPointEnv(1000)
+        env.reset(seed=0)
+
+        with MCTSPlanner(
+            node_budget=args.budget,
+            time_limit=args.time_limit,
+            opposing_policy=random_policy,
+            rollout_depth=args.rollout_depth,
+            num_workers=num_workers,
+            seed=0,
+        ) as planner:
+            simulations, elapsed = 0, 0.0
+            for _ in range(args.decisions):
+                env.step(planner.plan(env.field_state))
+                simulations += planner.simulations
+                elapsed += planner.elapsed
+
+        print(
+            f"{num_workers:>8} {simulations / elapsed:>9.0f} {elapsed / args.decisions:>13.3f} "
+            f"{len(planner.table):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compares recording an episode the way train_model used to, drawing every frame with matplotlib, round tripping it
+through a JPEG and keeping every frame until the end, against RasterRenderer frames streamed to a VideoWriter. Reports
+frames/sec and the memory still held once the frames are recorded. The matplotlib pipeline is slow, so it records
+fewer frames.
+
+Run from the src directory:
+    python -m benchmarks.renderBenchmark --frames 1000 --matplotlib-frames 20
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+import cv2
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.transforms import Bbox
+from rl_training.environment import TippingPointEnv
+from rl_training.videoWriter import VideoWriter
+from benchmarks.benchmarkUtils import format_bytes
+
+
+def record_matplotlib(env: TippingPointEnv, frames: int, path: str) -> None:
+    imgs = []
+    for _ in range(frames):
+        env.step(env.action_space.sample())
+        ax = env.render()
+        ax.figure.canvas.draw()
+        buff = io.BytesIO()
+        plt.savefig(
+            buff, format="jpg", dpi=ax.figure.dpi, bbox_inches=Bbox([[1.0, 1.0], [15, 10.75]]), pad_inches=2
+        )
+        buff.seek(0)
+        imgs.append(cv2.cvtColor(plt.imread(buff, "jpg"), cv2.COLOR_RGB2BGR))
+        plt.close("all")
+
+    height, width, _ = imgs[0].shape
+    video = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 30, (width, height))
+    for img in imgs:
+        video.write(img)
+    video.release()
+
+
+def record_raster(env: TippingPointEnv, frames: int, path: str) -> None:
+    height, width, _ = env.render(mode="rgb_array").shape
+    with VideoWriter(path, (width, height), 30) as video:
+        for _ in range(frames):
+            env.step(env.action_space.sample())
+            video.write(env.render(mode="rgb_array"))
+
+
+def measure(record, frames: int, path: str):
+    # Episodes are long enough that no reset happens while recording
+    env = TippingPointEnv(frames + 1)
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    # Warm up sprites and fonts outside the measurement
+    env.render(mode="rgb_array")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    record(env, frames, path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return frames / elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--matplotlib-frames", type=int, default=20)
+    args = parser.parse_args()
+
+    matplotlib.use("Agg")
+    print(f"{'pipeline':<12} {'frames':>7} {'frames/sec':>11} {'peak memory':>12} {'memory/frame':>13}")
+    base_rate = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, record, frames in [
+            ("matplotlib", record_matplotlib, args.matplotlib_frames),
+            ("raster", record_raster, args.frames),
+        ]:
+            rate, peak = measure(record, frames, os.path.join(tmp, f"{name}.mp4"))
+            base_rate = base_rate or rate
+            print(
+                f"{name:<12} {frames:>7} {rate:>11.1f} {format_bytes(peak):>12} {format_bytes(peak / frames):>13}"
+                f"   {rate / base_rate:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
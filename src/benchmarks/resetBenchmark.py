@@ -0,0 +1,49 @@
+"""
+Measures FieldRepresentation.randomize resets/sec as the number of rings and goals on the field grows. Spawn logging
+is disabled, as it would dominate the measurement.
+
+Run from the src directory:
+    python -m benchmarks.resetBenchmark --resets 200
+"""
+import argparse
+import logging
+import numpy as np
+from entities.constants import (
+    MAX_NUM_BLUE_GOALS,
+    MAX_NUM_LOW_NEUTRAL_GOALS,
+    MAX_NUM_RED_GOALS,
+    MAX_NUM_RINGS,
+)
+from entities.fieldRepresentation import FieldCounts, FieldRepresentation
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resets", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rep = FieldRepresentation()
+    rng = np.random.default_rng(0)
+
+    print(f"{'scale':>6} {'rings':>6} {'entities':>9} {'resets/sec':>11} {'us/entity':>10}")
+    # Twice as many rings no longer reliably fit on the field without overlapping
+    for scale in [0.25, 0.5, 1, 1.5]:
+        counts = FieldCounts(
+            max_rings=int(MAX_NUM_RINGS * scale),
+            max_red_goals=int(MAX_NUM_RED_GOALS * scale),
+            max_blue_goals=int(MAX_NUM_BLUE_GOALS * scale),
+            max_low_neutral_goals=int(MAX_NUM_LOW_NEUTRAL_GOALS * scale),
+        )
+        rate = measure_rate(lambda: rep.randomize(rng, counts), args.resets)
+        num_entities = len(rep.rings) + len(rep.goals) + len(rep.robots)
+
+        print(
+            f"{scale:>6} {counts.max_rings:>6} {num_entities:>9} {rate:>11.0f} "
+            f"{1e6 / (rate * num_entities):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+A/B training benchmark of the sparse reward against the score delta reward, with and without shaping. Trains PPO on
+TippingPointEnv with each reward and reports the timesteps taken until the mean final score margin of the host alliance
+over the last episodes reaches a threshold. The score margin is used as the common measure as the rewards differ in
+scale.
+
+Run from the src directory:
+    python -m benchmarks.rewardBenchmark --timesteps 100000 --threshold 20
+"""
+import argparse
+import time
+from collections import deque
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.ppo import PPO
+from entities.enumerations import ObservationMode, RewardMode
+from rl_training.environment import TippingPointEnv
+
+
+class ScoreMarginCallback(BaseCallback):
+    """
+    Stops training once the mean score margin of the last episodes reaches the threshold, recording when it did
+    """
+
+    def __init__(self, threshold: float, window: int):
+        super().__init__()
+        self.threshold = threshold
+        self.margins = deque(maxlen=window)
+        self.reached_at = None
+
+    def _on_step(self) -> bool:
+        for info in self.locals["infos"]:
+            if "score_margin" in info:
+                self.margins.append(info["score_margin"])
+
+        if len(self.margins) == self.margins.maxlen and np.mean(self.margins) >= self.threshold:
+            self.reached_at = self.num_timesteps
+            return False
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--timesteps", type=int, default=100000)
+    parser.add_argument("--episode-steps", type=int, default=100)
+    parser.add_argument("--threshold", type=float, default=20)
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rewards = [
+        ("sparse", dict(reward_mode=RewardMode.SPARSE)),
+        ("score delta", dict(reward_mode=RewardMode.SCORE_DELTA)),
+        (
+            "score delta shaped",
+            dict(reward_mode=RewardMode.SCORE_DELTA, goal_distance_weight=1.0, rings_held_weight=0.1),
+        ),
+    ]
+
+    print(f"Threshold mean score margin {args.threshold} over {args.window} episodes of {args.episode_steps} steps")
+    print(f"{'reward':<20} {'timesteps':>10} {'final margin':>13} {'sec':>7}")
+    for name, kwargs in rewards:
+        env = DummyVecEnv(
+            [lambda: TippingPointEnv(args.episode_steps, ObservationMode.ENTITY_LIST, False, **kwargs)]
+        )
+        env.seed(args.seed)
+        model = PPO("MultiInputPolicy", env, seed=args.seed, verbose=0)
+        callback = ScoreMarginCallback(args.threshold, args.window)
+
+        start = time.perf_counter()
+        model.learn(total_timesteps=args.timesteps, callback=callback)
+        elapsed = time.perf_counter() - start
+
+        reached = "not reached" if callback.reached_at is None else str(callback.reached_at)
+        margin = np.mean(callback.margins) if callback.margins else float("nan")
+        print(f"{name:<20} {reached:>10} {margin:>13.1f} {elapsed:>7.1f}")
+        env.close()
+
+
+if __name__ == "__main__":
+    main()
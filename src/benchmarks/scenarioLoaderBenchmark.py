@@ -0,0 +1,43 @@
+"""
+Measures loading a corpus of scenarios with load_scenarios: scenarios/sec into FieldRepresentation and straight into
+ArrayFieldRepresentation, parsed in this process and across a pool of workers. The corpus is a JSON Lines file of
+copies of starting_representation() and ending_representation(). Workers only pay off with spare cores, as each
+scenario is also shipped back to this process.
+
+The parsers import through the src package, so run from the project root:
+    python -m src.benchmarks.scenarioLoaderBenchmark --scenarios 2000 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from src.benchmarks.benchmarkUtils import format_bytes
+from src.entities.fieldConfigurations import ending_representation, starting_representation
+from src.parsers.scenarioLoader import CHUNK_SIZE, load_scenarios, write_scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scenarios.jsonl")
+        reps = [starting_representation(), ending_representation()]
+        write_scenarios(path, (reps[i % 2] for i in range(args.scenarios)))
+        print(f"{args.scenarios} scenarios, {format_bytes(os.path.getsize(path))}\n")
+
+        print(f"{'target':<8} {'workers':>8} {'scenarios/sec':>14}")
+        for arrays in [False, True]:
+            for workers in [0, args.workers]:
+                start = time.perf_counter()
+                for _ in load_scenarios(path, arrays, workers, args.chunk_size):
+                    pass
+                rate = args.scenarios / (time.perf_counter() - start)
+                print(f"{'arrays' if arrays else 'objects':<8} {workers:>8} {rate:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Compares serializing ending_representation() as JSON, through as_json and json.loads, against the binary encoding of
+FieldRepresentation.to_bytes and from_bytes. Reports bytes per state, and states/sec and MB/sec of encoded output for
+each direction. JSON only decodes into dictionaries, as it does not round trip into entities, while from_bytes rebuilds
+the field.
+
+Run from the src directory:
+    python -m benchmarks.serializationBenchmark --iterations 500
+"""
+import argparse
+import json
+from entities.fieldConfigurations import ending_representation
+from entities.fieldRepresentation import FieldRepresentation
+from benchmarks.benchmarkUtils import format_bytes, measure_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    rep = ending_representation()
+    text = rep.as_json()
+    data = rep.to_bytes()
+    assert FieldRepresentation.from_bytes(data).to_bytes() == data
+
+    cases = [
+        ("json", len(text.encode()), rep.as_json, lambda: json.loads(text)),
+        ("binary", len(data), rep.to_bytes, lambda: FieldRepresentation.from_bytes(data)),
+    ]
+
+    print(f"{'format':<8} {'bytes/state':>12} {'encode/sec':>11} {'encode MB/s':>12} {'decode/sec':>11} {'decode MB/s':>12}")
+    for name, size, encode, decode in cases:
+        encode_rate = measure_rate(encode, args.iterations)
+        decode_rate = measure_rate(decode, args.iterations)
+        print(
+            f"{name:<8} {format_bytes(size):>12} {encode_rate:>11.0f} {encode_rate * size / 1e6:>12.2f}"
+            f" {decode_rate:>11.0f} {decode_rate * size / 1e6:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Shows how adjacency detection and movement collision scale with the number of rings, comparing full scans of the
+entity lists against the SpatialGrid used by TippingPointEnv. Rings are either packed onto the field, raising the
+density around the host, or spread over a proportionally wider field so the density stays constant.
+
+Run from the src directory:
+    python -m benchmarks.spatialIndexBenchmark --steps 500
+"""
+import argparse
+import random
+from entities.constants import FIELD_WIDTH_IN, MAX_NUM_RINGS
+from entities.enumerations import Color
+from entities.fieldRepresentation import FieldRepresentation, FieldState
+from entities.mathUtils import Pose2D, distance_between_entities
+from entities.robots import HostRobot
+from entities.scoring_elements import LowNeutralGoal, Ring
+from rl_training.environment import TippingPointEnv
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def make_representation(num_rings: int, width: float, seed: int = 0) -> FieldRepresentation:
+    rng = random.Random(seed)
+    random_pose = lambda: Pose2D(rng.uniform(-width / 2, width / 2), rng.uniform(0, 144))
+
+    return FieldRepresentation(
+        robots=[HostRobot(Color.RED, Pose2D(0, 72))],
+        goals=[LowNeutralGoal(random_pose()) for _ in range(7)],
+        rings=[Ring(random_pose()) for _ in range(num_rings)],
+    )
+
+
+def scan_step(env, host, rep, action):
+    adjacent_goals = [
+        goal
+        for goal in rep.goals
+        if distance_between_entities(goal, host) <= 2 and goal not in host.goals
+    ]
+    adjacent_rings = [
+        ring
+        for ring in rep.rings
+        if distance_between_entities(ring, host) <= 2 and ring not in host.rings
+    ]
+
+    direction = env._map_movement(action)
+    candidate = HostRobot(host.color, Pose2D(host.pose.x + direction[0], host.pose.y + direction[1]))
+    colliding = [
+        en for en in [*rep.robots, *rep.goals, *rep.rings] if en.is_colliding(candidate) and en is not host
+    ]
+    if not colliding:
+        host.pose = candidate.pose
+
+    return adjacent_goals, adjacent_rings
+
+
+def grid_step(env, host, rep, action):
+    adjacent = env._detect_adjacents(host, rep)
+    env._move_collision(host, env._map_movement(action), rep)
+    return adjacent
+
+
+def benchmark(step, num_rings: int, width: float, steps: int) -> float:
+    rep = make_representation(num_rings, width)
+    env = TippingPointEnv(steps)
+    env.field_state = FieldState(rep, steps)
+    host = rep.robots[0]
+
+    rng = random.Random(1)
+    return measure_rate(lambda: step(env, host, rep, rng.randint(1, 4)), steps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args()
+
+    for layout, spread in [("constant density", True), ("fixed field", False)]:
+        print(layout)
+        print(f"{'rings':>6} {'scan steps/sec':>15} {'grid steps/sec':>15}")
+        for multiplier in [1, 2, 4, 8, 16, 32]:
+            num_rings = MAX_NUM_RINGS * multiplier
+            width = FIELD_WIDTH_IN * (multiplier if spread else 1)
+            scan_rate = benchmark(scan_step, num_rings, width, args.steps)
+            grid_rate = benchmark(grid_step, num_rings, width, args.steps)
+            print(f"{num_rings:>6} {scan_rate:>15.1f} {grid_rate:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compares the length distribution of every spawn chain in FieldRepresentation.randomize with the previous recursive
+rule, which only continued a chain while percentage < percentage * ((i + 1) * discount), and times sampling a chain
+length with each.
+
+Run from the src directory:
+    python -m benchmarks.spawnChainBenchmark --samples 100000
+"""
+import argparse
+import numpy as np
+from entities.constants import *
+from entities.spawnChains import get_chain_length_probabilities, sample_chain_length
+from benchmarks.benchmarkUtils import measure_rate
+
+MAX_NUM_ROBOTS = MAX_NUM_HOST_ROBOTS + MAX_NUM_PARTNER_ROBOTS + MAX_NUM_OPPOSING_ROBOTS
+MAX_NUM_GOALS = (
+    MAX_NUM_RED_GOALS + MAX_NUM_BLUE_GOALS + MAX_NUM_LOW_NEUTRAL_GOALS + MAX_NUM_HIGH_NEUTRAL_GOALS
+)
+
+# Name, spawn percentage, discount factor and the most entities a chain can hold
+CHAINS = [
+    ("robots on ramp", SPAWN_ROBOT_ON_RAMP, ADDITIONAL_ROBOT_ON_RAMP_DISCOUNT_FACTOR, MAX_NUM_ROBOTS),
+    ("goals on ramp", SPAWN_GOAL_ON_RAMP, ADDITIONAL_GOAL_ON_RAMP_DISCOUNT_FACTOR, MAX_NUM_GOALS),
+    ("rings on ramp", SPAWN_RING_ON_RAMP, ADDITIONAL_RING_ON_RAMP_DISCOUNT_FACTOR, MAX_NUM_RINGS),
+    ("goals in robot", SPAWN_GOAL_IN_ROBOT, ADDITIONAL_GOAL_IN_ROBOT_DISCOUNT_FACTOR, MAX_NUM_GOALS),
+    ("rings in robot", SPAWN_RING_IN_ROBOT, ADDITIONAL_RING_IN_ROBOT_DISCOUNT_FACTOR, MAX_NUM_RINGS),
+    ("rings on goal", SPAWN_RING_ON_GOAL, ADDITIONAL_RING_ON_GOAL_DISCOUNT_FACTOR, MAX_NUM_RINGS),
+]
+
+
+def legacy_chain_length(percentage: float, discount: float, limit: int, current_iter: int = 0) -> int:
+    # The recursion of the previous spawn chains, which never drew a random number to continue
+    if percentage < (percentage * ((current_iter + 1) * discount)) and limit - current_iter > 2:
+        return 1 + legacy_chain_length(percentage, discount, limit, current_iter + 1)
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(f"{'chain':<16} {'legacy mean':>11} {'mean':>6} {'sampled':>8} {'P(>1)':>6} {'max':>4} {'chains/sec':>11}")
+    for name, percentage, discount, limit in CHAINS:
+        probabilities = get_chain_length_probabilities(percentage, discount, limit)
+        lengths = [sample_chain_length(rng, percentage, discount, limit) for _ in range(args.samples)]
+        rate = measure_rate(lambda: sample_chain_length(rng, percentage, discount, limit), args.samples)
+
+        print(
+            f"{name:<16} {legacy_chain_length(percentage, discount, limit):>11.2f} "
+            f"{np.dot(np.arange(1, limit + 1), probabilities):>6.2f} {np.mean(lengths):>8.2f} "
+            f"{1 - probabilities[0]:>6.3f} {max(lengths):>4} {rate:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares keying a field state by hashing its JSON export against the incremental state hash of FieldRepresentation,
+measured on ending_representation(): reading the kept hash, computing it from scratch, and keeping it current through
+a move of the host robot.
+
+Run from the src directory:
+    python -m benchmarks.stateHashBenchmark --iterations 2000
+"""
+import argparse
+from entities.fieldConfigurations import ending_representation
+from entities.mathUtils import Pose2D
+from entities.robots import HostRobot
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    rep = ending_representation()
+    robots = rep.robots + rep.red_platform.robots + rep.blue_platform.robots
+    host = next(robot for robot in robots if type(robot) is HostRobot)
+    poses = [host.pose, Pose2D(host.pose.x + 1, host.pose.y, host.pose.angle)]
+
+    def move_host():
+        rep.set_pose(host, poses[host.pose is poses[0]])
+
+    cases = [
+        ("hash(as_json())", lambda: hash(rep.as_json())),
+        ("compute_state_hash", rep.compute_state_hash),
+        ("get_state_hash", rep.get_state_hash),
+        ("set_pose", move_host),
+    ]
+
+    print(f"{'case':<20} {'calls/sec':>12}")
+    base_rate = None
+    for name, func in cases:
+        rate = measure_rate(func, args.iterations)
+        base_rate = base_rate or rate
+        print(f"{name:<20} {rate:>12.0f}   {rate / base_rate:.1f}x")
+
+    assert rep.get_state_hash() == rep.compute_state_hash()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measures environment steps/sec of TippingPointEnv with 1, 2, 4 and 8 worker processes, comparing SharedMemoryVecEnv
+against SubprocVecEnv, which pickles every observation through the pipes. Worker start up is excluded.
+
+Run from the src directory:
+    python -m benchmarks.workerScalingBenchmark --steps 200
+"""
+import argparse
+import os
+import numpy as np
+from stable_baselines3.common.vec_env import SubprocVecEnv
+from entities.enumerations import ObservationMode
+from rl_training.environment import TippingPointEnv
+from rl_training.sharedMemoryVecEnv import SharedMemoryVecEnv
+from benchmarks.benchmarkUtils import measure_rate
+
+
+def benchmark_workers(env, steps: int) -> float:
+    try:
+        env.reset()
+        actions = np.random.RandomState(0).randint(0, 10, size=(steps, env.num_envs))
+        step_iter = iter(actions)
+
+        return env.num_envs * measure_rate(lambda: env.step(next(step_iter)), steps)
+    finally:
+        env.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in ObservationMode],
+        default=ObservationMode.DENSE.value,
+    )
+    args = parser.parse_args()
+
+    episode = args.steps + 1
+    env_fn = lambda: TippingPointEnv(episode, args.mode, copy_observations=False)
+
+    print(f"Observation mode {args.mode}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'subproc steps/sec':>18} {'shared steps/sec':>17} {'scaling':>8}")
+    base_rate = None
+    for num_workers in [1, 2, 4, 8]:
+        subproc = benchmark_workers(SubprocVecEnv([env_fn] * num_workers), args.steps)
+        shared = benchmark_workers(
+            SharedMemoryVecEnv([env_fn] * num_workers, seed=0), args.steps
+        )
+        base_rate = base_rate or shared
+
+        print(f"{num_workers:>8} {subproc:>18.0f} {shared:>17.0f} {shared / base_rate:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,12 @@ PLATFORM_LENGTH_IN = 50
 PLATFORM_WIDTH_IN = 24
 FIELD_WIDTH_IN = 144
 
+# Define observation size
+MAX_NUM_OBSERVED_ENTITIES = 100
+
+# Define spatial index cell size, roughly the reach of an adjacency query
+SPATIAL_GRID_CELL_SIZE = 16
+
 # Define figure size
 FIG_SIZE = (12, 12)
 
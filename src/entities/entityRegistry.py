@@ -0,0 +1,95 @@
+from __future__ import annotations
+import copy
+from typing import Iterator
+
+
+class EntityRegistry:
+    """
+    Assigns stable integer ids to entities and maps between ids and entities in constant time. Entities are tracked by
+    identity rather than dataclass equality, so stacked entities sharing a pose, or equal in every field, are still
+    told apart. Ids are assigned in registration order and never reused within a registry.
+    """
+
+    def __init__(self):
+        self.__entities = {}
+        self.__ids = {}
+        self.__next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.__entities)
+
+    def __contains__(self, ent: object) -> bool:
+        return id(ent) in self.__ids
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.__entities)
+
+    def __deepcopy__(self, memo: dict) -> EntityRegistry:
+        # Ids must follow the copied entities, whose identities differ from the originals
+        registry = EntityRegistry()
+        registry.__next_id = self.__next_id
+        for entity_id, ent in self.__entities.items():
+            ent_copy = copy.deepcopy(ent, memo)
+            registry.__ids[id(ent_copy)] = entity_id
+            registry.__entities[entity_id] = ent_copy
+        return registry
+
+    def __copy__(self) -> EntityRegistry:
+        # Shares the entities, so forked fields keep the ids of the entities they share
+        registry = EntityRegistry()
+        registry.__next_id = self.__next_id
+        registry.__ids = self.__ids.copy()
+        registry.__entities = self.__entities.copy()
+        return registry
+
+    @classmethod
+    def from_entities(cls, entities: dict, next_id: int) -> EntityRegistry:
+        """
+        Registry holding the given entities under the given ids, such as when restoring a saved field
+
+        @param entities: Entities keyed by their id
+        @param next_id: Id of the next registered entity, past every id ever assigned
+        """
+        registry = cls()
+        registry.__next_id = next_id
+        for entity_id, ent in entities.items():
+            registry.__ids[id(ent)] = entity_id
+            registry.__entities[entity_id] = ent
+        return registry
+
+    @property
+    def next_id(self) -> int:
+        return self.__next_id
+
+    def register(self, ent: object) -> int:
+        """
+        Registers an entity, returning its id. Registering an already registered entity returns its existing id.
+        """
+        entity_id = self.__ids.get(id(ent))
+        if entity_id is None:
+            entity_id = self.__next_id
+            self.__next_id += 1
+
+            self.__ids[id(ent)] = entity_id
+            self.__entities[entity_id] = ent
+        return entity_id
+
+    def unregister(self, ent: object) -> int:
+        entity_id = self.__ids.pop(id(ent))
+        del self.__entities[entity_id]
+        return entity_id
+
+    def replace(self, old: object, new: object) -> int:
+        """
+        Gives the id of a registered entity to another entity, such as a copy taking its place
+        """
+        entity_id = self.__ids.pop(id(old))
+        self.__ids[id(new)] = entity_id
+        self.__entities[entity_id] = new
+        return entity_id
+
+    def get_id(self, ent: object) -> int:
+        return self.__ids[id(ent)]
+
+    def get(self, entity_id: int) -> object:
+        return self.__entities[entity_id]
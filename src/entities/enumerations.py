@@ -14,6 +14,48 @@ class GoalLevel(int, Enum):
     HIGH = 10
 
 
+class EntityKind(int, Enum):
+    RING = 0
+    RED_GOAL = 1
+    BLUE_GOAL = 2
+    LOW_NEUTRAL_GOAL = 3
+    HIGH_NEUTRAL_GOAL = 4
+    HOST_ROBOT = 5
+    PARTNER_ROBOT = 6
+    OPPOSING_ROBOT = 7
+
+
+class ObservationMode(str, Enum):
+    DENSE = "dense"
+    ENTITY_LIST = "entity_list"
+
+
+class RewardMode(str, Enum):
+    SPARSE = "sparse"
+    SCORE_DELTA = "score_delta"
+
+
+class EntityFeature(int, Enum):
+    """
+    Column indices of the entity list observation. Possession columns flatten the dense (level, type) possession layout
+    """
+
+    ID = 0
+    TYPE = 1
+    X = 2
+    Y = 3
+    ANGLE = 4
+    COLOR = 5
+    VALUE = 6
+    IS_OPPOSING = 7
+    BASE_GOALS = 8
+    BASE_RINGS = 9
+    LOW_GOALS = 10
+    LOW_RINGS = 11
+    HIGH_GOALS = 12
+    HIGH_RINGS = 13
+
+
 def convertColorToRGBA(color: Color) -> Tuple[float, float, float, float]:
     """
     Maps between the color enum and an RGBA value
@@ -0,0 +1,745 @@
+from __future__ import annotations
+from typing import List, Tuple
+import numpy as np
+from .constants import MAX_NUM_OBSERVED_ENTITIES
+from .enumerations import Color, EntityFeature, EntityKind, GoalLevel
+from .fieldRepresentation import FieldRepresentation, ObservationBuffers
+from .fieldSnapshot import get_entity_kind
+from .interfaces import IScorable, ITippable
+from .mathUtils import ICollisionsEnabled, Pose2D, get_colliding_indices
+from .platforms import BluePlatform, Platform, PlatformState, RedPlatform
+from .robots import HostRobot, OpposingRobot, PartnerRobot, Robot, RobotID
+from .scoring_elements import (
+    BlueGoal,
+    Goal,
+    HighNeutralGoal,
+    LowNeutralGoal,
+    RedGoal,
+    Ring,
+    RingContainer,
+)
+
+
+NO_OWNER = -1
+NO_PLATFORM = -1
+
+GOAL_KINDS = (
+    EntityKind.RED_GOAL,
+    EntityKind.BLUE_GOAL,
+    EntityKind.LOW_NEUTRAL_GOAL,
+    EntityKind.HIGH_NEUTRAL_GOAL,
+)
+ROBOT_KINDS = (
+    EntityKind.HOST_ROBOT,
+    EntityKind.PARTNER_ROBOT,
+    EntityKind.OPPOSING_ROBOT,
+)
+
+# Goal levels in ring count column order
+LEVELS = (GoalLevel.BASE, GoalLevel.LOW, GoalLevel.HIGH)
+LEVEL_VALUES = np.array([level.value for level in LEVELS])
+
+# Lookup tables indexed by EntityKind
+KIND_IS_GOAL = np.isin(np.arange(len(EntityKind)), GOAL_KINDS)
+KIND_IS_ROBOT = np.isin(np.arange(len(EntityKind)), ROBOT_KINDS)
+KIND_OBSERVATION_TYPE = np.array([2, 1, 1, 1, 0, 3, 3, 3])
+KIND_EXPORT_GROUP = np.array([0, 1, 1, 1, 1, 2, 2, 2])
+KIND_ROBOT_ID = np.array([0, 0, 0, 0, 0, RobotID.SELF, RobotID.PARTNER, RobotID.OPPOSING])
+
+
+class ArrayFieldRepresentation:
+    """
+    Structure-of-arrays alternative to FieldRepresentation. Every entity is a row in contiguous NumPy arrays indexed
+    by entity id, and the goals, rings, robots and platforms properties return thin views that follow the object
+    model API. Rings scored on a goal are stored as counts per level rather than as entities.
+    """
+
+    def __init__(self, capacity: int = 128):
+        self.count = 0
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.int8)
+        self.tipped = np.zeros(capacity, dtype=bool)
+        self.owner = np.full(capacity, NO_OWNER, dtype=np.int32)
+        self.platform = np.full(capacity, NO_PLATFORM, dtype=np.int8)
+        self.order = np.zeros(capacity, dtype=np.int64)
+        self.ring_counts = np.zeros((capacity, len(LEVELS)), dtype=np.int16)
+        self.ring_capacity = np.zeros((capacity, len(LEVELS)), dtype=np.int16)
+        self.place_level = np.zeros(capacity, dtype=np.int8)
+        self.platform_state = np.array(
+            [PlatformState.LEVEL, PlatformState.LEVEL], dtype=np.int8
+        )
+        self.field_counts = None
+        self.__next_order = 0
+
+    # Construction
+
+    def __grow(self) -> None:
+        capacity = len(self.kind) * 2
+        for name in [
+            "kind",
+            "alive",
+            "x",
+            "y",
+            "angle",
+            "radius",
+            "color",
+            "tipped",
+            "owner",
+            "platform",
+            "order",
+            "ring_counts",
+            "ring_capacity",
+            "place_level",
+        ]:
+            arr = getattr(self, name)
+            fill = NO_OWNER if name in ("owner", "platform") else 0
+            grown = np.full((capacity, *arr.shape[1:]), fill, dtype=arr.dtype)
+            grown[: len(arr)] = arr
+            setattr(self, name, grown)
+
+    def add_entity(
+        self,
+        kind: EntityKind,
+        pose: Pose2D,
+        radius: float,
+        color: Color = Color.NEUTRAL,
+        tipped: bool = False,
+        owner: int = NO_OWNER,
+        platform: int = NO_PLATFORM,
+    ) -> int:
+        if self.count == len(self.kind):
+            self.__grow()
+
+        idx = self.count
+        self.count += 1
+
+        self.kind[idx] = kind
+        self.alive[idx] = True
+        self.x[idx] = pose.x
+        self.y[idx] = pose.y
+        self.angle[idx] = pose.angle
+        self.radius[idx] = radius
+        self.color[idx] = color
+        self.tipped[idx] = tipped
+        self.owner[idx] = owner
+        self.platform[idx] = platform
+        self.order[idx] = self.__next_order
+        self.__next_order += 1
+
+        return idx
+
+    def __add_ring(self, ring: Ring, owner: int = NO_OWNER, platform: int = NO_PLATFORM) -> int:
+        return self.add_entity(
+            EntityKind.RING, ring.pose, ring.radius, owner=owner, platform=platform
+        )
+
+    def __add_goal(self, goal: Goal, owner: int = NO_OWNER, platform: int = NO_PLATFORM) -> int:
+        idx = self.add_entity(
+            get_entity_kind(goal),
+            goal.pose,
+            goal.radius,
+            goal.color,
+            goal.tipped,
+            owner,
+            platform,
+        )
+
+        for ldx, level in enumerate(LEVELS):
+            container = goal.ring_containers.get(level)
+            if container is not None:
+                self.ring_counts[idx, ldx] = container.get_utilization()
+                self.ring_capacity[idx, ldx] = container.max_storage
+
+        # The environment places rings on the last container of a goal
+        if goal.ring_containers:
+            self.place_level[idx] = LEVELS.index(list(goal.ring_containers.keys())[-1])
+
+        return idx
+
+    def __add_robot(self, robot: Robot, platform: int = NO_PLATFORM) -> int:
+        idx = self.add_entity(
+            get_entity_kind(robot),
+            robot.pose,
+            robot.radius,
+            robot.color,
+            robot.tipped,
+            platform=platform,
+        )
+
+        for ring in robot.rings:
+            self.__add_ring(ring, owner=idx)
+
+        for goal in robot.goals:
+            self.__add_goal(goal, owner=idx)
+
+        return idx
+
+    def __add_platform(self, platform: Platform) -> None:
+        self.platform_state[platform.color] = platform.state
+
+        for ring in platform.rings:
+            self.__add_ring(ring, platform=platform.color)
+
+        for goal in platform.goals:
+            self.__add_goal(goal, platform=platform.color)
+
+        for robot in platform.robots:
+            self.__add_robot(robot, platform.color)
+
+    @classmethod
+    def from_representation(cls, rep: FieldRepresentation) -> ArrayFieldRepresentation:
+        arrays = cls()
+
+        for ring in rep.rings:
+            arrays.__add_ring(ring)
+
+        for goal in rep.goals:
+            arrays.__add_goal(goal)
+
+        for robot in rep.robots:
+            arrays.__add_robot(robot)
+
+        arrays.__add_platform(rep.red_platform)
+        arrays.__add_platform(rep.blue_platform)
+        arrays.field_counts = rep.field_counts
+
+        return arrays
+
+    def __to_ring(self, idx: int) -> Ring:
+        return Ring(self.get_pose(idx))
+
+    def __to_goal(self, idx: int) -> Goal:
+        kind = self.kind[idx]
+        pose = self.get_pose(idx)
+
+        ring_containers = {}
+        for ldx, level in enumerate(LEVELS):
+            # Only the high neutral goal accepts a high branch container
+            if level == GoalLevel.HIGH and kind != EntityKind.HIGH_NEUTRAL_GOAL:
+                continue
+            ring_containers[level] = RingContainer(
+                int(self.ring_capacity[idx, ldx]),
+                [Ring(Pose2D(pose.x, pose.y, pose.angle)) for _ in range(self.ring_counts[idx, ldx])],
+            )
+
+        goal_cls = {
+            EntityKind.RED_GOAL: RedGoal,
+            EntityKind.BLUE_GOAL: BlueGoal,
+            EntityKind.LOW_NEUTRAL_GOAL: LowNeutralGoal,
+            EntityKind.HIGH_NEUTRAL_GOAL: HighNeutralGoal,
+        }[kind]
+
+        return goal_cls(pose, ring_containers=ring_containers, tipped=bool(self.tipped[idx]))
+
+    def __to_robot(self, idx: int) -> Robot:
+        robot_cls = {
+            EntityKind.HOST_ROBOT: HostRobot,
+            EntityKind.PARTNER_ROBOT: PartnerRobot,
+            EntityKind.OPPOSING_ROBOT: OpposingRobot,
+        }[self.kind[idx]]
+
+        return robot_cls(
+            Color(self.color[idx]),
+            self.get_pose(idx),
+            rings=[self.__to_ring(i) for i in self.get_held(idx, rings=True)],
+            goals=[self.__to_goal(i) for i in self.get_held(idx, goals=True)],
+            tipped=bool(self.tipped[idx]),
+        )
+
+    def __to_platform(self, color: Color) -> Platform:
+        platform_cls = RedPlatform if color == Color.RED else BluePlatform
+        ids = self.get_platform_ids(color)
+
+        return platform_cls(
+            PlatformState(self.platform_state[color]),
+            rings=[self.__to_ring(i) for i in ids if self.kind[i] == EntityKind.RING],
+            goals=[self.__to_goal(i) for i in ids if KIND_IS_GOAL[self.kind[i]]],
+            robots=[self.__to_robot(i) for i in ids if KIND_IS_ROBOT[self.kind[i]]],
+        )
+
+    def to_representation(self) -> FieldRepresentation:
+        kwargs = dict(
+            rings=[self.__to_ring(i) for i in self.get_field_ids(EntityKind.RING)],
+            goals=[self.__to_goal(i) for i in self.get_field_ids(*GOAL_KINDS)],
+            robots=[self.__to_robot(i) for i in self.get_field_ids(*ROBOT_KINDS)],
+            red_platform=self.__to_platform(Color.RED),
+            blue_platform=self.__to_platform(Color.BLUE),
+        )
+
+        if self.field_counts is not None:
+            kwargs["field_counts"] = self.field_counts
+
+        return FieldRepresentation(**kwargs)
+
+    # Queries
+
+    def get_pose(self, idx: int) -> Pose2D:
+        return Pose2D(float(self.x[idx]), float(self.y[idx]), float(self.angle[idx]))
+
+    def __sorted_ids(self, mask: np.ndarray) -> np.ndarray:
+        ids = np.flatnonzero(mask)
+        return ids[np.argsort(self.order[ids], kind="stable")]
+
+    def __kind_mask(self, kinds) -> np.ndarray:
+        n = self.count
+        if not kinds:
+            return self.alive[:n].copy()
+        return self.alive[:n] & np.isin(self.kind[:n], kinds)
+
+    def get_field_mask(self) -> np.ndarray:
+        n = self.count
+        return self.alive[:n] & (self.owner[:n] == NO_OWNER) & (self.platform[:n] == NO_PLATFORM)
+
+    def get_field_ids(self, *kinds: EntityKind) -> np.ndarray:
+        """
+        Ids of entities on the field (not held or on a platform), in insertion order, optionally filtered by kind
+        """
+        return self.__sorted_ids(self.get_field_mask() & self.__kind_mask(kinds))
+
+    def get_platform_ids(self, color: Color) -> np.ndarray:
+        n = self.count
+        mask = self.alive[:n] & (self.owner[:n] == NO_OWNER) & (self.platform[:n] == color)
+        return self.__sorted_ids(mask)
+
+    def get_held(self, owner: int, rings: bool = False, goals: bool = False) -> np.ndarray:
+        n = self.count
+        mask = self.alive[:n] & (self.owner[:n] == owner)
+        if rings and not goals:
+            mask &= self.kind[:n] == EntityKind.RING
+        elif goals and not rings:
+            mask &= KIND_IS_GOAL[self.kind[:n]]
+        return self.__sorted_ids(mask)
+
+    def get_export_ids(self) -> np.ndarray:
+        """
+        Ids of field entities in observation order: rings, then goals, then robots
+        """
+        ids = np.flatnonzero(self.get_field_mask())
+        return ids[np.lexsort((self.order[ids], KIND_EXPORT_GROUP[self.kind[ids]]))]
+
+    def get_host_id(self) -> int:
+        n = self.count
+        ids = np.flatnonzero(
+            self.alive[:n] & (self.owner[:n] == NO_OWNER) & (self.kind[:n] == EntityKind.HOST_ROBOT)
+        )
+        if len(ids) == 0:
+            return NO_OWNER
+        # Field robots come before red platform robots, then blue platform robots
+        return ids[np.lexsort((self.order[ids], self.platform[ids]))][0]
+
+    def get_host_color(self) -> Color:
+        host_id = self.get_host_id()
+        if host_id == NO_OWNER:
+            raise ValueError("Field has no host robot")
+        return Color(self.color[host_id])
+
+    # Scoring
+
+    def get_current_zones(self) -> np.ndarray:
+        y = self.y[: self.count]
+        return np.where(y <= 48, Color.RED, np.where(y >= 96, Color.BLUE, Color.NEUTRAL))
+
+    def get_ring_scores(self) -> np.ndarray:
+        return self.ring_counts[: self.count] @ LEVEL_VALUES
+
+    def get_goal_scores(self, color: Color) -> np.ndarray:
+        """
+        Score of every entity as a goal for the given alliance, matching Goal.get_current_score (zero for non-goals)
+        """
+        n = self.count
+        kind = self.kind[:n]
+        goal_color = self.color[:n]
+
+        scoring = (
+            KIND_IS_GOAL[kind]
+            & (self.get_current_zones() == color)
+            & ((goal_color == color) | (goal_color == Color.NEUTRAL))
+        )
+
+        return np.where(scoring, 20 + self.get_ring_scores(), 0)
+
+    def get_field_goal_score(self, color: Color) -> int:
+        scores = self.get_goal_scores(color)
+        return int(scores[self.get_field_ids(*GOAL_KINDS)].sum())
+
+    def get_platform_score(self, color: Color) -> int:
+        if self.platform_state[color] != PlatformState.LEVEL:
+            return 0
+
+        ids = self.get_platform_ids(color)
+        kind = self.kind[ids]
+        ent_color = self.color[ids]
+
+        robots = KIND_IS_ROBOT[kind] & (ent_color == color)
+        goals = KIND_IS_GOAL[kind] & ((ent_color == color) | (ent_color == Color.NEUTRAL))
+
+        return int((30 * robots.sum()) + (40 * goals.sum()))
+
+    def get_entity_values(self, host_col: Color) -> np.ndarray:
+        """
+        Observation value of every entity, matching the value column of FieldRepresentation.export_to_dict
+        """
+        n = self.count
+        kind = self.kind[:n]
+        goal_scores = self.get_goal_scores(host_col)
+
+        held = self.alive[:n] & (self.owner[:n] != NO_OWNER)
+        held_owner = self.owner[:n][held]
+        held_goal_scores = np.bincount(
+            held_owner, weights=goal_scores[held], minlength=n
+        )
+        held_rings = np.bincount(
+            held_owner, weights=(kind[held] == EntityKind.RING), minlength=n
+        )
+
+        values = np.zeros(n)
+        goals = KIND_IS_GOAL[kind] & (kind != EntityKind.HIGH_NEUTRAL_GOAL)
+        values[goals] = goal_scores[goals]
+        values[kind == EntityKind.RING] = 1
+        robots = KIND_IS_ROBOT[kind]
+        values[robots] = held_goal_scores[:n][robots] + held_rings[:n][robots]
+
+        return values
+
+    def __get_held_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        n = self.count
+        held = self.alive[:n] & (self.owner[:n] != NO_OWNER)
+        held_owner = self.owner[:n][held]
+        is_ring = self.kind[:n][held] == EntityKind.RING
+
+        rings = np.bincount(held_owner[is_ring], minlength=n)[:n]
+        goals = np.bincount(held_owner[~is_ring], minlength=n)[:n]
+        return rings, goals
+
+    # Geometry
+
+    def get_colliding(
+        self, pose: Pose2D, radius: float, ids: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Ids of entities colliding with a circle at pose, using the same rule as ICollisionsEnabled.is_colliding.
+        Defaults to testing against all field entities.
+        """
+        if ids is None:
+            ids = np.flatnonzero(self.get_field_mask())
+
+        return ids[get_colliding_indices(pose, radius, self.x[ids], self.y[ids], self.radius[ids])]
+
+    def get_entity_distances(self, idx: int, ids: np.ndarray) -> np.ndarray:
+        """
+        Edge to edge distances between an entity and others, matching distance_between_entities
+        """
+        dist = np.sqrt(((self.x[ids] - self.x[idx]) ** 2) + ((self.y[ids] - self.y[idx]) ** 2))
+        return np.maximum(dist - (self.radius[ids] + self.radius[idx]), 0)
+
+    def get_adjacent(self, idx: int, distance: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Field goals and rings within distance of an entity's edge
+        """
+        goals = self.get_field_ids(*GOAL_KINDS)
+        rings = self.get_field_ids(EntityKind.RING)
+
+        return (
+            goals[self.get_entity_distances(idx, goals) <= distance],
+            rings[self.get_entity_distances(idx, rings) <= distance],
+        )
+
+    # Mutation
+
+    def set_pose(self, idx: int, pose: Pose2D) -> None:
+        self.x[idx] = pose.x
+        self.y[idx] = pose.y
+        self.angle[idx] = pose.angle
+
+    def pick_up(self, robot_idx: int, idx: int) -> None:
+        self.owner[idx] = robot_idx
+        self.platform[idx] = NO_PLATFORM
+
+    def release(self, idx: int, pose: Pose2D) -> None:
+        self.owner[idx] = NO_OWNER
+        self.order[idx] = self.__next_order
+        self.__next_order += 1
+        self.set_pose(idx, pose)
+
+    def add_ring_to_goal(self, goal_idx: int, level: GoalLevel, ring_idx: int = None) -> bool:
+        ldx = LEVELS.index(level)
+        if self.ring_counts[goal_idx, ldx] >= self.ring_capacity[goal_idx, ldx]:
+            return False
+
+        self.ring_counts[goal_idx, ldx] += 1
+        if ring_idx is not None:
+            self.alive[ring_idx] = False
+        return True
+
+    # Export
+
+    def export_to_dict(self, buffers: ObservationBuffers = None, copy: bool = True) -> dict:
+        if buffers is None:
+            buffers = ObservationBuffers()
+            copy = False
+        else:
+            buffers.clear()
+
+        ids = self.get_export_ids()[:MAX_NUM_OBSERVED_ENTITIES]
+        slots = np.arange(len(ids))
+        if len(ids) == 0:
+            return buffers.as_dict(copy)
+
+        kind = self.kind[ids]
+        rings = kind == EntityKind.RING
+        goals = KIND_IS_GOAL[kind]
+        robots = KIND_IS_ROBOT[kind]
+
+        xs = np.clip(np.round(self.x[ids]), 0, 144)
+        ys = np.clip(np.round(self.y[ids]), 0, 144)
+        buffers.set_locations(xs, ys, KIND_OBSERVATION_TYPE[kind])
+
+        held_rings, held_goals = self.__get_held_counts()
+        buffers.possesion[slots[goals], :, 0] = self.ring_counts[ids[goals]]
+        buffers.possesion[slots[robots], 0, 1] = held_rings[ids[robots]]
+        buffers.possesion[slots[robots], 0, 0] = held_goals[ids[robots]]
+
+        buffers.color[slots[~rings]] = self.color[ids[~rings]]
+        buffers.value[slots] = self.get_entity_values(self.get_host_color())[ids]
+        buffers.is_opposing[slots] = KIND_ROBOT_ID[kind]
+
+        return buffers.as_dict(copy)
+
+    def export_to_entity_list(self, out: np.ndarray = None) -> np.ndarray:
+        if out is None:
+            entities = np.zeros(
+                (MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature)), dtype=np.float32
+            )
+        else:
+            entities = out
+            entities.fill(0)
+
+        ids = self.get_export_ids()[:MAX_NUM_OBSERVED_ENTITIES]
+        if len(ids) == 0:
+            return entities
+
+        kind = self.kind[ids]
+        rings = kind == EntityKind.RING
+        goals = KIND_IS_GOAL[kind]
+        robots = KIND_IS_ROBOT[kind]
+        rows = entities[: len(ids)]
+
+        rows[:, EntityFeature.ID] = np.arange(1, len(ids) + 1)
+        rows[:, EntityFeature.TYPE] = KIND_OBSERVATION_TYPE[kind]
+        rows[:, EntityFeature.X] = self.x[ids]
+        rows[:, EntityFeature.Y] = self.y[ids]
+        rows[:, EntityFeature.ANGLE] = self.angle[ids]
+        rows[:, EntityFeature.COLOR] = np.where(rings, 0, self.color[ids])
+        rows[:, EntityFeature.VALUE] = self.get_entity_values(self.get_host_color())[ids]
+        rows[:, EntityFeature.IS_OPPOSING] = KIND_ROBOT_ID[kind]
+
+        held_rings, held_goals = self.__get_held_counts()
+        possession = rows[:, EntityFeature.BASE_GOALS :].reshape(-1, 3, 2)
+        possession[goals, :, 0] = self.ring_counts[ids[goals]]
+        possession[robots, 0, 1] = held_rings[ids[robots]]
+        possession[robots, 0, 0] = held_goals[ids[robots]]
+        rows[:, EntityFeature.BASE_GOALS :] = possession.reshape(len(ids), -1)
+
+        return entities
+
+    # Object model views
+
+    def __view(self, idx: int):
+        kind = self.kind[idx]
+        if kind == EntityKind.RING:
+            return RingView(self, idx)
+        elif KIND_IS_GOAL[kind]:
+            return GoalView(self, idx)
+        return RobotView(self, idx)
+
+    def views(self, ids: np.ndarray) -> list:
+        return [self.__view(idx) for idx in ids]
+
+    @property
+    def rings(self) -> List[RingView]:
+        return self.views(self.get_field_ids(EntityKind.RING))
+
+    @property
+    def goals(self) -> List[GoalView]:
+        return self.views(self.get_field_ids(*GOAL_KINDS))
+
+    @property
+    def robots(self) -> List[RobotView]:
+        return self.views(self.get_field_ids(*ROBOT_KINDS))
+
+    @property
+    def red_platform(self) -> PlatformView:
+        return PlatformView(self, Color.RED)
+
+    @property
+    def blue_platform(self) -> PlatformView:
+        return PlatformView(self, Color.BLUE)
+
+
+class EntityView(ICollisionsEnabled):
+    """
+    Thin view of a single entity within an ArrayFieldRepresentation. Views of the same entity compare equal.
+    """
+
+    def __init__(self, arrays: ArrayFieldRepresentation, idx: int):
+        self.arrays = arrays
+        self.idx = int(idx)
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, EntityView)
+            and other.arrays is self.arrays
+            and other.idx == self.idx
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.arrays), self.idx))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.idx}, {EntityKind(self.arrays.kind[self.idx]).name})"
+
+    @property
+    def pose(self) -> Pose2D:
+        return self.arrays.get_pose(self.idx)
+
+    @pose.setter
+    def pose(self, pose: Pose2D) -> None:
+        self.arrays.set_pose(self.idx, pose)
+
+    @property
+    def radius(self) -> float:
+        return float(self.arrays.radius[self.idx])
+
+    @property
+    def kind(self) -> EntityKind:
+        return EntityKind(self.arrays.kind[self.idx])
+
+
+class RingView(EntityView):
+    pass
+
+
+class RingContainerView:
+    def __init__(self, arrays: ArrayFieldRepresentation, idx: int, level: GoalLevel):
+        self.arrays = arrays
+        self.idx = idx
+        self.level = level
+        self.__ldx = LEVELS.index(level)
+
+    @property
+    def max_storage(self) -> int:
+        return int(self.arrays.ring_capacity[self.idx, self.__ldx])
+
+    def add_ring(self, ring: RingView = None) -> bool:
+        ring_idx = ring.idx if isinstance(ring, RingView) else None
+        return self.arrays.add_ring_to_goal(self.idx, self.level, ring_idx)
+
+    def get_utilization(self) -> int:
+        return int(self.arrays.ring_counts[self.idx, self.__ldx])
+
+    def get_remaining_utilization(self) -> int:
+        return self.max_storage - self.get_utilization()
+
+
+class GoalView(EntityView, ITippable, IScorable):
+    @property
+    def color(self) -> Color:
+        return Color(self.arrays.color[self.idx])
+
+    @property
+    def level(self) -> GoalLevel:
+        if self.kind == EntityKind.HIGH_NEUTRAL_GOAL:
+            return GoalLevel.HIGH
+        return GoalLevel.LOW
+
+    @property
+    def tipped(self) -> bool:
+        return bool(self.arrays.tipped[self.idx])
+
+    @property
+    def ring_containers(self) -> dict[GoalLevel, RingContainerView]:
+        return {level: RingContainerView(self.arrays, self.idx, level) for level in LEVELS}
+
+    def is_tipped(self) -> bool:
+        return self.tipped
+
+    def get_ring_container(self, level: GoalLevel) -> RingContainerView:
+        return RingContainerView(self.arrays, self.idx, level)
+
+    def get_total_rings(self) -> int:
+        return int(self.arrays.ring_counts[self.idx].sum())
+
+    def get_ring_score(self) -> int:
+        return int(self.arrays.ring_counts[self.idx] @ LEVEL_VALUES)
+
+    def get_current_zone(self) -> Color:
+        return Color(self.arrays.get_current_zones()[self.idx])
+
+    def get_current_score(self, color: Color) -> int:
+        return int(self.arrays.get_goal_scores(color)[self.idx])
+
+    def add_ring(self, ring: RingView, level: GoalLevel) -> bool:
+        return self.get_ring_container(level).add_ring(ring)
+
+
+class RobotView(EntityView, ITippable):
+    @property
+    def color(self) -> Color:
+        return Color(self.arrays.color[self.idx])
+
+    @property
+    def id(self) -> RobotID:
+        return RobotID(KIND_ROBOT_ID[self.arrays.kind[self.idx]])
+
+    @property
+    def tipped(self) -> bool:
+        return bool(self.arrays.tipped[self.idx])
+
+    @property
+    def rings(self) -> List[RingView]:
+        return self.arrays.views(self.arrays.get_held(self.idx, rings=True))
+
+    @property
+    def goals(self) -> List[GoalView]:
+        return self.arrays.views(self.arrays.get_held(self.idx, goals=True))
+
+    def is_tipped(self) -> bool:
+        return self.tipped
+
+
+class PlatformView(IScorable):
+    def __init__(self, arrays: ArrayFieldRepresentation, color: Color):
+        self.arrays = arrays
+        self.color = color
+
+    @property
+    def state(self) -> PlatformState:
+        return PlatformState(self.arrays.platform_state[self.color])
+
+    @state.setter
+    def state(self, state: PlatformState) -> None:
+        self.arrays.platform_state[self.color] = state
+
+    def __platform_views(self, is_kind: np.ndarray) -> list:
+        ids = self.arrays.get_platform_ids(self.color)
+        return self.arrays.views(ids[is_kind[self.arrays.kind[ids]]])
+
+    @property
+    def rings(self) -> List[RingView]:
+        return self.__platform_views(np.arange(len(EntityKind)) == EntityKind.RING)
+
+    @property
+    def goals(self) -> List[GoalView]:
+        return self.__platform_views(KIND_IS_GOAL)
+
+    @property
+    def robots(self) -> List[RobotView]:
+        return self.__platform_views(KIND_IS_ROBOT)
+
+    def get_current_score(self) -> int:
+        return self.arrays.get_platform_score(self.color)
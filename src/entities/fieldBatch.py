@@ -0,0 +1,283 @@
+from __future__ import annotations
+import numpy as np
+from .constants import MAX_NUM_OBSERVED_ENTITIES
+from .enumerations import Color, EntityFeature, EntityKind
+from .fieldArrays import (
+    KIND_EXPORT_GROUP,
+    KIND_IS_GOAL,
+    KIND_IS_ROBOT,
+    KIND_OBSERVATION_TYPE,
+    KIND_ROBOT_ID,
+    LEVEL_VALUES,
+    LEVELS,
+    NO_OWNER,
+    NO_PLATFORM,
+    ArrayFieldRepresentation,
+)
+from .fieldRepresentation import FieldRepresentation, ObservationBuffers
+
+
+class FieldBatch:
+    """
+    Several fields stored as (num_fields, capacity) arrays, one row per field, with the per-entity layout of
+    ArrayFieldRepresentation. Unused entity slots are marked as not alive. Scoring and observation export work on
+    every field at once.
+
+    @param num_fields: Number of fields in the batch
+    @param capacity: Maximum number of entities in a single field
+    """
+
+    def __init__(self, num_fields: int, capacity: int = 128):
+        shape = (num_fields, capacity)
+        self.num_fields = num_fields
+        self.capacity = capacity
+
+        self.kind = np.zeros(shape, dtype=np.int8)
+        self.alive = np.zeros(shape, dtype=bool)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.angle = np.zeros(shape)
+        self.radius = np.zeros(shape)
+        self.color = np.zeros(shape, dtype=np.int8)
+        self.owner = np.full(shape, NO_OWNER, dtype=np.int32)
+        self.platform = np.full(shape, NO_PLATFORM, dtype=np.int8)
+        self.order = np.zeros(shape, dtype=np.int64)
+        self.ring_counts = np.zeros((*shape, len(LEVELS)), dtype=np.int16)
+        self.ring_capacity = np.zeros((*shape, len(LEVELS)), dtype=np.int16)
+        self.place_level = np.zeros(shape, dtype=np.int8)
+
+        # Entity index of each field's host robot, and the next free order value
+        self.host = np.zeros(num_fields, dtype=np.intp)
+        self.next_order = np.zeros(num_fields, dtype=np.int64)
+
+        self.__fields = np.arange(num_fields)
+
+    def load(self, field_idx: int, rep: FieldRepresentation) -> None:
+        """
+        Replaces a field of the batch with the contents of a field representation, raising a ValueError when it has
+        no host robot
+        """
+        arrays = ArrayFieldRepresentation.from_representation(rep)
+        n = arrays.count
+        if n > self.capacity:
+            raise ValueError(
+                f"Field has {n} entities, more than the batch capacity of {self.capacity}"
+            )
+        host_id = arrays.get_host_id()
+        if host_id == NO_OWNER:
+            raise ValueError("Field has no host robot")
+
+        for name in [
+            "kind",
+            "alive",
+            "x",
+            "y",
+            "angle",
+            "radius",
+            "color",
+            "owner",
+            "platform",
+            "order",
+            "ring_counts",
+            "ring_capacity",
+            "place_level",
+        ]:
+            row = getattr(self, name)[field_idx]
+            row[n:] = NO_OWNER if name in ("owner", "platform") else 0
+            row[:n] = getattr(arrays, name)[:n]
+
+        self.host[field_idx] = host_id
+        self.next_order[field_idx] = n
+
+    # Queries
+
+    def get_field_mask(self) -> np.ndarray:
+        """
+        Entities on the field, not held or on a platform
+        """
+        return self.alive & (self.owner == NO_OWNER) & (self.platform == NO_PLATFORM)
+
+    def get_host_values(self, arr: np.ndarray) -> np.ndarray:
+        return arr[self.__fields, self.host]
+
+    def get_host_color(self) -> np.ndarray:
+        return self.get_host_values(self.color)
+
+    def get_held_mask(self) -> np.ndarray:
+        """
+        Entities held by their field's host robot
+        """
+        return self.alive & (self.owner == self.host[:, None])
+
+    # Scoring
+
+    def __get_goal_scores_at(self, flat_ids: np.ndarray, color: np.ndarray) -> np.ndarray:
+        # Goal scores of the entities at flat (field * capacity + entity) indices, for one alliance color per entity
+        kind = self.kind.ravel()[flat_ids]
+        goal_color = self.color.ravel()[flat_ids]
+        y = self.y.ravel()[flat_ids]
+        counts = self.ring_counts.reshape(-1, len(LEVELS))[flat_ids]
+
+        zone = np.where(y <= 48, Color.RED, np.where(y >= 96, Color.BLUE, Color.NEUTRAL))
+        scoring = (
+            KIND_IS_GOAL[kind]
+            & (zone == color)
+            & ((goal_color == color) | (goal_color == Color.NEUTRAL))
+        )
+        ring_scores = sum(counts[:, ldx] * int(value) for ldx, value in enumerate(LEVEL_VALUES))
+        return np.where(scoring, 20 + ring_scores, 0)
+
+    def get_goal_scores(self, color: np.ndarray) -> np.ndarray:
+        """
+        Score of every entity as a goal for the given alliance of each field, matching Goal.get_current_score
+        """
+        color = np.broadcast_to(color, (self.num_fields,))
+        flat_ids = np.arange(self.kind.size)
+        return self.__get_goal_scores_at(
+            flat_ids, np.repeat(color, self.capacity)
+        ).reshape(self.kind.shape)
+
+    def get_field_goal_score(self, color: np.ndarray) -> np.ndarray:
+        """
+        Total score of the goals on each field, as summed by TippingPointEnv when an episode ends
+        """
+        return np.where(self.get_field_mask(), self.get_goal_scores(color), 0).sum(axis=1)
+
+    def __get_held_totals(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Number of rings, number of goals and total goal score for the host's alliance held by each robot, indexed by
+        # the flat index of the holding robot
+        held = np.flatnonzero(self.alive & (self.owner != NO_OWNER))
+        fields = held // self.capacity
+        owner = (fields * self.capacity) + self.owner.ravel()[held]
+        is_ring = self.kind.ravel()[held] == EntityKind.RING
+        goal_scores = self.__get_goal_scores_at(held, self.get_host_color()[fields])
+
+        return (
+            np.bincount(owner[is_ring], minlength=self.owner.size),
+            np.bincount(owner[~is_ring], minlength=self.owner.size),
+            np.bincount(owner, weights=goal_scores, minlength=self.owner.size),
+        )
+
+    def get_entity_values(self) -> np.ndarray:
+        """
+        Observation value of every entity, matching ArrayFieldRepresentation.get_entity_values
+        """
+        return self.get_features()[:, :, EntityFeature.VALUE]
+
+    # Export
+
+    def get_export_ids(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Entity indices in observation order for every field, rings then goals then robots, truncated to the
+        observation size. Returns the (num_fields, slots) indices and a mask of the slots in use.
+        """
+        field = self.get_field_mask()
+        key = np.where(
+            field,
+            (KIND_EXPORT_GROUP[self.kind].astype(np.int64) << 48) + self.order,
+            np.iinfo(np.int64).max,
+        )
+
+        num_slots = min(MAX_NUM_OBSERVED_ENTITIES, self.capacity)
+        ids = np.argsort(key, axis=1)[:, :num_slots]
+        valid = np.arange(num_slots) < field.sum(axis=1)[:, None]
+
+        return ids, valid
+
+    def __get_features_at(self, flat_ids: np.ndarray) -> np.ndarray:
+        # Entity list features of the entities at flat indices, without the id column. Most entities are rings, so
+        # goal and robot features are only computed for those entities.
+        kind = self.kind.ravel()[flat_ids]
+        rings = kind == EntityKind.RING
+
+        features = np.zeros((len(flat_ids), len(EntityFeature)), dtype=np.float32)
+        features[:, EntityFeature.TYPE] = KIND_OBSERVATION_TYPE[kind]
+        features[:, EntityFeature.X] = self.x.ravel()[flat_ids]
+        features[:, EntityFeature.Y] = self.y.ravel()[flat_ids]
+        features[:, EntityFeature.ANGLE] = self.angle.ravel()[flat_ids]
+        features[:, EntityFeature.COLOR] = np.where(rings, 0, self.color.ravel()[flat_ids])
+        features[:, EntityFeature.VALUE] = rings
+        features[:, EntityFeature.IS_OPPOSING] = KIND_ROBOT_ID[kind]
+
+        goals = np.flatnonzero(KIND_IS_GOAL[kind])
+        goal_ids = flat_ids[goals]
+        goal_scores = self.__get_goal_scores_at(
+            goal_ids, self.get_host_color()[goal_ids // self.capacity]
+        )
+        features[goals, EntityFeature.VALUE] = np.where(
+            kind[goals] == EntityKind.HIGH_NEUTRAL_GOAL, 0, goal_scores
+        )
+        counts = self.ring_counts.reshape(-1, len(LEVELS))[goal_ids]
+        features[goals, EntityFeature.BASE_GOALS] = counts[:, 0]
+        features[goals, EntityFeature.LOW_GOALS] = counts[:, 1]
+        features[goals, EntityFeature.HIGH_GOALS] = counts[:, 2]
+
+        robots = np.flatnonzero(KIND_IS_ROBOT[kind])
+        held_rings, held_goals, held_goal_scores = (
+            total[flat_ids[robots]] for total in self.__get_held_totals()
+        )
+        features[robots, EntityFeature.VALUE] = held_goal_scores + held_rings
+        features[robots, EntityFeature.BASE_GOALS] = held_goals
+        features[robots, EntityFeature.BASE_RINGS] = held_rings
+
+        return features
+
+    def get_features(self) -> np.ndarray:
+        """
+        Entity list features of every entity slot, (num_fields, capacity, len(EntityFeature)), without the id column
+        """
+        flat_ids = np.arange(self.kind.size)
+        return self.__get_features_at(flat_ids).reshape(*self.kind.shape, len(EntityFeature))
+
+    def __get_export_rows(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Field, slot and flat entity index of every exported entity
+        ids, valid = self.get_export_ids()
+        fields, slots = np.nonzero(valid)
+        return fields, slots, (fields * self.capacity) + ids[fields, slots]
+
+    def export_to_entity_list(self, out: np.ndarray = None) -> np.ndarray:
+        """
+        Exports every field as in FieldRepresentation.export_to_entity_list, into a
+        (num_fields, MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature)) float32 array
+        """
+        shape = (self.num_fields, MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature))
+        if out is None:
+            entities = np.zeros(shape, dtype=np.float32)
+        else:
+            entities = out
+            entities.fill(0)
+
+        fields, slots, flat_ids = self.__get_export_rows()
+        rows = self.__get_features_at(flat_ids)
+        rows[:, EntityFeature.ID] = slots + 1
+        entities[fields, slots] = rows
+
+        return entities
+
+    def export_to_dict(self, buffers: ObservationBuffers = None, copy: bool = True) -> dict:
+        """
+        Exports every field as in FieldRepresentation.export_to_dict, with a leading field dimension on each array
+        """
+        if buffers is None:
+            buffers = ObservationBuffers(self.num_fields)
+            copy = False
+        else:
+            buffers.clear()
+
+        fields, slots, flat_ids = self.__get_export_rows()
+        rows = self.__get_features_at(flat_ids)
+
+        # Positions are rounded at full precision, as the float32 features may round differently
+        buffers.set_locations(
+            np.clip(np.round(self.x.ravel()[flat_ids]), 0, 144),
+            np.clip(np.round(self.y.ravel()[flat_ids]), 0, 144),
+            rows[:, EntityFeature.TYPE],
+            slots,
+            fields,
+        )
+        buffers.possesion[fields, slots] = rows[:, EntityFeature.BASE_GOALS :].reshape(-1, 3, 2)
+        buffers.color[fields, slots] = rows[:, EntityFeature.COLOR]
+        buffers.value[fields, slots] = rows[:, EntityFeature.VALUE]
+        buffers.is_opposing[fields, slots] = rows[:, EntityFeature.IS_OPPOSING]
+
+        return buffers.as_dict(copy)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+import math
+from typing import Dict, List, Tuple
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.patches as mpatches
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.markers import MarkerStyle
+from matplotlib.path import Path
+from .constants import FIELD_WIDTH_IN, FIG_SIZE, PLATFORM_LENGTH_IN, PLATFORM_WIDTH_IN
+from .enumerations import convertColorToRGBA
+from .robots import HostRobot, OpposingRobot, PartnerRobot, Robot
+
+# Layout of the legend beside the field, following FieldRepresentation.draw
+LEGEND_X = 80
+LEGEND_Y = 120
+LEGEND_X_SPACING = 15
+LEGEND_Y_SPACING = 20
+
+# Order of the robots in the legend
+ROBOT_ORDER = {HostRobot: 0, PartnerRobot: 1, OpposingRobot: 2}
+
+# Rotated markers are cached to the nearest degree
+_marker_paths: Dict[Tuple[int, int], Path] = {}
+
+
+def get_marker_path(num_sides: int, angle: float) -> Path:
+    """
+    Path of a regular polygon marker rotated by angle degrees, scaled as scatter scales its markers
+    """
+    key = (num_sides, int(round(angle)) % 360)
+    path = _marker_paths.get(key)
+    if path is None:
+        marker = MarkerStyle((num_sides, 0, key[1]))
+        path = marker.get_path().transformed(marker.get_transform())
+        _marker_paths[key] = path
+    return path
+
+
+class LiveFieldPlot:
+    """
+    Field figure for live rendering, drawn like FieldRepresentation.draw but built once and then updated in place.
+    Artists are created by start for each episode, as the robots listed in the legend only change between episodes,
+    and update only moves, rotates and recolors them, redrawing them over a saved background by blitting.
+    """
+
+    def __init__(self):
+        self.fig, self.ax = plt.subplots(figsize=FIG_SIZE)
+        self.__artists = []
+        self.__legend_robots: List[int] = []
+        self.__background = None
+
+        for y, color in [(0, (1, 0, 0, 0.2)), (FIELD_WIDTH_IN - PLATFORM_WIDTH_IN, (0, 0, 1, 0.2))]:
+            self.ax.add_patch(
+                mpatches.Rectangle(
+                    (0 - (PLATFORM_LENGTH_IN / 2), y),
+                    PLATFORM_LENGTH_IN,
+                    PLATFORM_WIDTH_IN,
+                    fill=True,
+                    fc=color,
+                    ec=color[:3] + (0,),
+                    linewidth=2,
+                )
+            )
+        self.ax.text(75, 130, "Robots:", fontsize=20)
+        self.ax.set_xlim([-72, 72])
+        self.ax.set_ylim([0, 144])
+
+        # Only GUI canvases have a window to show
+        if type(self.fig.canvas) is not FigureCanvasAgg:
+            self.fig.show()
+
+    def __add(self, artist):
+        artist.set_animated(True)
+        self.__artists.append(artist)
+        return artist
+
+    def __scatter(self, size: float, clip_on: bool = True, **kwargs):
+        return self.__add(self.ax.scatter([], [], s=size, clip_on=clip_on, **kwargs))
+
+    def start(self, rep) -> None:
+        """
+        Creates the artists of an episode, replacing those of the last one, and saves the background they are drawn
+        over
+
+        @param rep: FieldRepresentation at the start of the episode
+        """
+        for artist in self.__artists:
+            artist.remove()
+        self.__artists = []
+
+        robots = self.__get_robots(rep)
+        self.__legend_robots = [rep.get_entity_id(robot) for robot in robots]
+        legend_y = LEGEND_Y - LEGEND_Y_SPACING * np.arange(len(robots))
+
+        self.robot_artist = self.__scatter(3000)
+        self.heading_artist = self.__scatter(500, color="black")
+        self.goal_artist = self.__scatter(2000)
+        self.ring_artist = self.__scatter(plt.rcParams["lines.markersize"] ** 2, color="purple")
+
+        self.legend_robot_artist = self.__scatter(3000, False)
+        self.legend_heading_artist = self.__scatter(500, False, color="black")
+        self.legend_goal_artist = self.__scatter(2000, False)
+        self.legend_ring_artist = self.__scatter(
+            plt.rcParams["lines.markersize"] ** 2, False, color="purple"
+        )
+        self.legend_ring_artist.set_offsets(np.stack([np.full(len(robots), LEGEND_X + 8), legend_y + 5], axis=1))
+        self.legend_goal_ring_artist = self.__scatter(
+            plt.rcParams["lines.markersize"] ** 2, False, color="purple"
+        )
+        self.robot_counters = [
+            self.__add(self.ax.text(LEGEND_X + 9, y + 3, "", fontsize=20)) for y in legend_y
+        ]
+        self.goal_counters = []
+
+        self.fig.canvas.draw()
+        self.__background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+    @staticmethod
+    def __get_robots(rep) -> List[Robot]:
+        return sorted(
+            rep.robots + rep.red_platform.robots + rep.blue_platform.robots,
+            key=lambda robot: ROBOT_ORDER.get(type(robot), len(ROBOT_ORDER)),
+        )
+
+    def __set_robots(self, robot_artist, heading_artist, robots: List[Robot], xy: np.ndarray) -> None:
+        angles = [math.degrees(robot.pose.angle) for robot in robots]
+        colors = [convertColorToRGBA(robot.color) for robot in robots]
+        is_host = [isinstance(robot, HostRobot) for robot in robots]
+
+        robot_artist.set_offsets(xy)
+        robot_artist.set_paths([get_marker_path(4, angle - 45) for angle in angles])
+        robot_artist.set_facecolors(colors)
+        robot_artist.set_edgecolors(["black" if host else color for host, color in zip(is_host, colors)])
+        robot_artist.set_linewidths([4 if host else 0 for host in is_host])
+
+        heading_artist.set_offsets(xy)
+        heading_artist.set_paths([get_marker_path(3, angle - 90) for angle in angles])
+
+    def __set_goals(self, goal_artist, goals: list, xy: np.ndarray) -> None:
+        goal_artist.set_offsets(xy)
+        goal_artist.set_paths([get_marker_path(6, math.degrees(goal.pose.angle)) for goal in goals])
+        goal_artist.set_facecolors([convertColorToRGBA(goal.color) for goal in goals])
+
+    def __set_goal_counters(self, xy: np.ndarray, counts: List[int]) -> None:
+        while len(self.goal_counters) < len(counts):
+            self.goal_counters.append(self.__add(self.ax.text(0, 0, "", fontsize=20)))
+
+        for idx, text in enumerate(self.goal_counters):
+            text.set_visible(idx < len(counts))
+            if idx < len(counts):
+                text.set_position((xy[idx, 0] + 9, xy[idx, 1] + 3))
+                text.set_text(str(counts[idx]))
+
+    @staticmethod
+    def __get_xy(ents) -> np.ndarray:
+        return np.array([[ent.pose.x, ent.pose.y] for ent in ents], dtype=float).reshape(-1, 2)
+
+    def update(self, rep) -> Axes:
+        """
+        Moves the artists to the field's state and redraws them, starting the episode when its robots are not those of
+        the current one
+
+        @param rep: FieldRepresentation to draw
+        @return: The axes of the figure
+        """
+        robots = self.__get_robots(rep)
+        if self.__background is None or [rep.get_entity_id(robot) for robot in robots] != self.__legend_robots:
+            self.start(rep)
+
+        goals = rep.goals + rep.red_platform.goals + rep.blue_platform.goals
+        rings = rep.rings + rep.red_platform.rings + rep.blue_platform.rings
+        self.__set_robots(self.robot_artist, self.heading_artist, robots, self.__get_xy(robots))
+        self.__set_goals(self.goal_artist, goals, self.__get_xy(goals))
+        self.ring_artist.set_offsets(self.__get_xy(rings))
+
+        legend_y = LEGEND_Y - LEGEND_Y_SPACING * np.arange(len(robots))
+        self.__set_robots(
+            self.legend_robot_artist,
+            self.legend_heading_artist,
+            robots,
+            np.stack([np.full(len(robots), LEGEND_X), legend_y], axis=1),
+        )
+        held = [
+            (goal, LEGEND_X + 20 + count * LEGEND_X_SPACING, y)
+            for robot, y in zip(robots, legend_y)
+            for count, goal in enumerate(robot.goals)
+        ]
+        held_xy = np.array([[x, y] for _, x, y in held], dtype=float).reshape(-1, 2)
+        self.__set_goals(self.legend_goal_artist, [goal for goal, _, _ in held], held_xy)
+        self.legend_goal_ring_artist.set_offsets(held_xy + [8, 5])
+        self.__set_goal_counters(held_xy, [goal.get_total_rings() for goal, _, _ in held])
+        for text, robot in zip(self.robot_counters, robots):
+            text.set_text(str(len(robot.rings)))
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self.__background)
+        for artist in self.__artists:
+            self.fig.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        return self.ax
+
+    def close(self) -> None:
+        plt.close(self.fig)
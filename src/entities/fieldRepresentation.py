@@ -1,19 +1,37 @@
 from __future__ import annotations
+import copy
 import json
-from logging import getLogger
+import logging
 import random
+from collections import Counter
 from matplotlib.axes import Axes
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from typing import Tuple
-from dataclasses import field
+from typing import Optional, Tuple
+from dataclasses import field, fields
 from .classUtils import nested_dataclass
 from .constants import *
-from .enumerations import Color, convertColorToRGBA
-from .interfaces import ISerializable
-from .mathUtils import Pose2D
-from .platforms import PlatformState, RedPlatform, BluePlatform
+from .entityRegistry import EntityRegistry
+from .enumerations import Color, EntityFeature, convertColorToRGBA
+from .fieldSnapshot import (
+    ENTITY_LISTS,
+    GOAL_RINGS,
+    LEVELS,
+    NO_PARENT,
+    NUM_ENTITY_LISTS,
+    REMOVED,
+    ROBOT_GOALS,
+    ROBOT_RINGS,
+    FieldSnapshot,
+    encode_field,
+    get_entity_record,
+    get_entity_records,
+)
+from .interfaces import ISerializable, serializable_fields
+from .logUtils import get_lazy_logger, log_spawn_summary
+from .mathUtils import Pose2D, Pose2DArray
+from .platforms import Platform, PlatformState, RedPlatform, BluePlatform
 from .scoring_elements import (
     BlueGoal,
     GoalLevel,
@@ -22,8 +40,15 @@ from .scoring_elements import (
     LowNeutralGoal,
     RedGoal,
     Ring,
+    RingContainer,
 )
 from .robots import HostRobot, OpposingRobot, PartnerRobot, Robot
+from .scoreBoard import FIELD_HOLDER, ScoreBoard
+from .spawnChains import sample_chain_length
+from .spawnPlacement import SpawnPlacer
+from .stateHash import get_field_hash, get_location_key, get_platform_key, get_state_key
+
+_log = get_lazy_logger(REPRESENTATION_LOGGER_NAME)
 
 
 @nested_dataclass
@@ -49,9 +74,7 @@ class FieldCounts:
         remaining = self.max_red_goals - self.red_goals
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining red goals is less than zero ({remaining})"
-            )
+            _log.error("Remaining red goals is less than zero (%s)", remaining)
 
         return remaining
 
@@ -59,9 +82,7 @@ class FieldCounts:
         remaining = self.max_blue_goals - self.blue_goals
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining blue goals is less than zero ({remaining})"
-            )
+            _log.error("Remaining blue goals is less than zero (%s)", remaining)
 
         return remaining
 
@@ -69,9 +90,7 @@ class FieldCounts:
         remaining = self.max_low_neutral_goals - self.low_neutral_goals
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining low neutral goals is less than zero ({remaining})"
-            )
+            _log.error("Remaining low neutral goals is less than zero (%s)", remaining)
 
         return remaining
 
@@ -79,9 +98,7 @@ class FieldCounts:
         remaining = self.max_high_neutral_goals - self.high_neutral_goals
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining high neutral goals is less than zero ({remaining})"
-            )
+            _log.error("Remaining high neutral goals is less than zero (%s)", remaining)
 
         return remaining
 
@@ -92,9 +109,7 @@ class FieldCounts:
         remaining += self.get_remaining_high_neutral_goals()
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Total remaining goals is less than zero ({remaining})"
-            )
+            _log.error("Total remaining goals is less than zero (%s)", remaining)
 
         return remaining
 
@@ -102,9 +117,7 @@ class FieldCounts:
         remaining = self.max_rings - self.rings
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining rings is less than zero ({remaining})"
-            )
+            _log.error("Remaining rings is less than zero (%s)", remaining)
 
         return remaining
 
@@ -112,9 +125,7 @@ class FieldCounts:
         remaining = self.max_host_robots - self.host_robots
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining host robots is less than zero ({remaining})"
-            )
+            _log.error("Remaining host robots is less than zero (%s)", remaining)
 
         return remaining
 
@@ -122,9 +133,7 @@ class FieldCounts:
         remaining = self.max_partner_robots - self.partner_robots
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining partner robots is less than zero ({remaining})"
-            )
+            _log.error("Remaining partner robots is less than zero (%s)", remaining)
 
         return remaining
 
@@ -132,9 +141,7 @@ class FieldCounts:
         remaining = self.max_opposing_robots - self.opposing_robots
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Remaining opposing robots is less than zero ({remaining})"
-            )
+            _log.error("Remaining opposing robots is less than zero (%s)", remaining)
 
         return remaining
 
@@ -144,13 +151,69 @@ class FieldCounts:
         remaining += self.get_remaining_opposing_robots()
 
         if remaining < 0:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Total remaining robots is less than zero ({remaining})"
-            )
+            _log.error("Total remaining robots is less than zero (%s)", remaining)
 
         return remaining
 
 
+class ObservationBuffers:
+    """
+    Persistent uint8 arrays for the dense observation, reused between exports. Only the location cells written by the
+    previous export are cleared, rather than re-zeroing the full location cube.
+
+    @param num_fields: When given, every array gains a leading dimension holding one observation per field
+    """
+
+    def __init__(self, num_fields: int = None):
+        batch = () if num_fields is None else (num_fields,)
+        self.location = np.zeros((*batch, 145, 145, MAX_NUM_OBSERVED_ENTITIES), dtype=np.uint8)
+        self.possesion = np.zeros((*batch, MAX_NUM_OBSERVED_ENTITIES, 3, 2), dtype=np.uint8)
+        self.color = np.zeros((*batch, MAX_NUM_OBSERVED_ENTITIES), dtype=np.uint8)
+        self.value = np.zeros((*batch, MAX_NUM_OBSERVED_ENTITIES), dtype=np.uint8)
+        self.is_opposing = np.zeros((*batch, MAX_NUM_OBSERVED_ENTITIES), dtype=np.uint8)
+        self.__dirty = None
+
+    def clear(self) -> None:
+        if self.__dirty is not None:
+            self.location[self.__dirty] = 0
+            self.__dirty = None
+
+        self.possesion.fill(0)
+        self.color.fill(0)
+        self.value.fill(0)
+        self.is_opposing.fill(0)
+
+    def set_locations(self, xs, ys, types, ids=None, fields=None) -> None:
+        """
+        Writes entity types into the location cube, remembering the cells so the next clear only resets those. Batched
+        buffers also take the field of every entity.
+        """
+        if ids is None:
+            ids = np.arange(len(xs))
+
+        self.__dirty = (
+            np.asarray(xs, dtype=np.intp),
+            np.asarray(ys, dtype=np.intp),
+            np.asarray(ids, dtype=np.intp),
+        )
+        if fields is not None:
+            self.__dirty = (np.asarray(fields, dtype=np.intp), *self.__dirty)
+        self.location[self.__dirty] = types
+
+    def as_dict(self, copy: bool = True) -> dict:
+        arrs = dict(
+            location=self.location,
+            possesion=self.possesion,
+            color=self.color,
+            value=self.value,
+            is_opposing=self.is_opposing,
+        )
+
+        if copy:
+            return {key: arr.copy() for key, arr in arrs.items()}
+        return arrs
+
+
 @nested_dataclass
 class FieldRepresentation(ISerializable):
     red_platform: RedPlatform = RedPlatform(PlatformState.LEVEL)
@@ -160,6 +223,14 @@ class FieldRepresentation(ISerializable):
     robots: list[Robot] = field(default_factory=list)
     field_counts: FieldCounts = FieldCounts()
 
+    def __post_init__(self):
+        # Ids of the entities only this field holds, or None when it shares none
+        self._owned_entities = None
+        # Ids of the entities changed since the last pop_changed_records, in order and mapped to whether their location
+        # changed, or None when not tracking
+        self._changed_entities = None
+        self.register_entities()
+
     def __get_alliance_color(
         self, random_color: int, host_alliance: bool = True
     ) -> Color:
@@ -168,29 +239,27 @@ class FieldRepresentation(ISerializable):
         return Color.BLUE if random_color == 0 else Color.RED
 
     def __generate_ring_list(
-        self, pose: Pose2D, percentage: float, discount: float, current_iter: int = 0
+        self, rng: np.random.Generator, pose: Pose2D, percentage: float, discount: float
     ) -> list[Ring]:
-        self.field_counts.rings += 1
-
-        if (
-            percentage < (percentage * ((current_iter + 1) * discount))
-            and self.field_counts.get_remaining_rings() > 1
-        ):
-            return [Ring(pose)] + self.__generate_ring_list(
-                pose, percentage, discount, current_iter + 1
-            )
-        else:
-            return [Ring(pose)]
+        count = sample_chain_length(rng, percentage, discount, self.field_counts.get_remaining_rings())
+        self.field_counts.rings += count
+
+        return [Ring(pose) for _ in range(count)]
 
-    def __add_rings_to_goal(self, goal: Goal) -> None:
-        percent = random.random()
+    def __add_rings_to_goal(self, rng: np.random.Generator, goal: Goal) -> None:
+        percent = rng.random()
 
         rings = self.__generate_ring_list(
-            goal.pose, SPAWN_RING_ON_GOAL, ADDITIONAL_RING_ON_GOAL_DISCOUNT_FACTOR
+            rng, goal.pose, SPAWN_RING_ON_GOAL, ADDITIONAL_RING_ON_GOAL_DISCOUNT_FACTOR
         )
 
-        getLogger(REPRESENTATION_LOGGER_NAME).info(
-            f"Spawned {len(rings)} rings on {type(goal).__name__} goal at ({goal.pose.x},{goal.pose.y},{goal.pose.angle})"
+        _log.debug(
+            "Spawned %s rings on %s goal at (%s,%s,%s)",
+            len(rings),
+            type(goal).__name__,
+            goal.pose.x,
+            goal.pose.y,
+            goal.pose.angle,
         )
 
         for ring in rings:
@@ -211,100 +280,185 @@ class FieldRepresentation(ISerializable):
             ):
                 goal.get_ring_container(GoalLevel.BASE).add_ring(ring)
 
-    def __generate_goal_list(
-        self, pose: Pose2D, percentage: float, discount: float, current_iter: int = 0
-    ) -> list[Goal]:
-        goal_num = random.randint(0, 3)
-
-        goal = None
-        if goal_num == 0 and self.field_counts.get_remaining_low_neutral_goals() > 0:
-            goal = LowNeutralGoal(pose)
+    def __generate_goal(self, rng: np.random.Generator, pose: Pose2D) -> Optional[Goal]:
+        # Only goals with some left are drawn, so a chain of up to the remaining goals always spawns
+        goal_types = [
+            goal_type
+            for goal_type, remaining in (
+                (LowNeutralGoal, self.field_counts.get_remaining_low_neutral_goals()),
+                (HighNeutralGoal, self.field_counts.get_remaining_high_neutral_goals()),
+                (RedGoal, self.field_counts.get_remaining_red_goals()),
+                (BlueGoal, self.field_counts.get_remaining_blue_goals()),
+            )
+            if remaining > 0
+        ]
+        if not goal_types:
+            _log.error("Attempting to spawn a goal when all goals are spawned")
+            return None
+
+        goal_type = goal_types[rng.integers(len(goal_types))]
+        goal = goal_type(pose)
+        if goal_type is LowNeutralGoal:
             self.field_counts.low_neutral_goals += 1
-        elif goal_num == 1 and self.field_counts.get_remaining_high_neutral_goals() > 0:
-            goal = HighNeutralGoal(pose)
+        elif goal_type is HighNeutralGoal:
             self.field_counts.high_neutral_goals += 1
-        elif goal_num == 2 and self.field_counts.get_remaining_red_goals() > 0:
-            goal = RedGoal(pose)
+        elif goal_type is RedGoal:
             self.field_counts.red_goals += 1
-        elif self.field_counts.get_remaining_blue_goals() > 0:
-            goal = BlueGoal(pose)
-            self.field_counts.blue_goals += 1
         else:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Attempting to spawn goal of number {goal_num} when all goals are spawned"
-            )
-
-        if goal is not None:
-            getLogger(REPRESENTATION_LOGGER_NAME).info(
-                f"Spawned {type(goal).__name__} at ({pose.x},{pose.y},{pose.angle})"
-            )
+            self.field_counts.blue_goals += 1
 
-            if random.random() < SPAWN_RING_ON_GOAL:
-                self.__add_rings_to_goal(goal)
+        _log.debug("Spawned %s at (%s,%s,%s)", type(goal).__name__, pose.x, pose.y, pose.angle)
 
-            if (
-                percentage < (percentage * ((current_iter + 1) * discount))
-                and self.field_counts.get_remaining_goals() > 1
-            ):
-                return [goal] + self.__generate_goal_list(
-                    pose, percentage, discount, current_iter + 1
-                )
-            else:
-                return [goal]
-        return []
+        if rng.random() < SPAWN_RING_ON_GOAL:
+            self.__add_rings_to_goal(rng, goal)
 
-    def __generate_robot_list(
-        self,
-        random_color: int,
-        pose: Pose2D,
-        percentage: float,
-        discount: float,
-        current_iter: int = 0,
-    ) -> list[Robot]:
-        robot_num = random.randint(0, 2)
+        return goal
 
-        robot = None
-        if robot_num == 0 and self.field_counts.get_remaining_host_robots() > 0:
+    def __generate_goal_list(
+        self, rng: np.random.Generator, pose: Pose2D, percentage: float, discount: float
+    ) -> list[Goal]:
+        count = sample_chain_length(rng, percentage, discount, self.field_counts.get_remaining_goals())
+
+        goals = []
+        for _ in range(count):
+            goal = self.__generate_goal(rng, pose)
+            if goal is None:
+                break
+            goals.append(goal)
+        return goals
+
+    def __generate_robot(
+        self, rng: np.random.Generator, random_color: int, pose: Pose2D
+    ) -> Optional[Robot]:
+        # Only robots with some left are drawn, so a chain of up to the remaining robots always spawns
+        robot_types = [
+            robot_type
+            for robot_type, remaining in (
+                (HostRobot, self.field_counts.get_remaining_host_robots()),
+                (PartnerRobot, self.field_counts.get_remaining_partner_robots()),
+                (OpposingRobot, self.field_counts.get_remaining_opposing_robots()),
+            )
+            if remaining > 0
+        ]
+        if not robot_types:
+            _log.error("Attempting to spawn a robot when all robots are spawned")
+            return None
+
+        robot_type = robot_types[rng.integers(len(robot_types))]
+        if robot_type is HostRobot:
             robot = HostRobot(self.__get_alliance_color(random_color), pose)
             self.field_counts.host_robots += 1
-        elif robot_num == 1 and self.field_counts.get_remaining_partner_robots() > 0:
+        elif robot_type is PartnerRobot:
             robot = PartnerRobot(self.__get_alliance_color(random_color), pose)
             self.field_counts.partner_robots += 1
-        elif robot_num == 2 and self.field_counts.get_remaining_opposing_robots() > 0:
+        else:
             robot = OpposingRobot(self.__get_alliance_color(random_color, False), pose)
             self.field_counts.opposing_robots += 1
-        else:
-            getLogger(REPRESENTATION_LOGGER_NAME).error(
-                f"Attempting to spawn robot of number {robot_num} when all robots are spawned"
+
+        _log.debug(
+            "Spawned %s of color %s at (%s,%s,%s)",
+            type(robot).__name__,
+            robot.color,
+            robot.pose.x,
+            robot.pose.y,
+            robot.pose.angle,
+        )
+
+        if rng.random() < SPAWN_GOAL_IN_ROBOT:
+            robot.goals = robot.goals + self.__generate_goal_list(
+                rng, pose, SPAWN_GOAL_IN_ROBOT, ADDITIONAL_GOAL_IN_ROBOT_DISCOUNT_FACTOR
             )
 
-        if robot is not None:
-            getLogger(REPRESENTATION_LOGGER_NAME).info(
-                f"Spawned {type(robot).__name__} of color {robot.color} at ({robot.pose.x},{robot.pose.y},{robot.pose.angle})"
+        if rng.random() < SPAWN_RING_IN_ROBOT:
+            robot.rings = robot.rings + self.__generate_ring_list(
+                rng, pose, SPAWN_RING_IN_ROBOT, ADDITIONAL_RING_IN_ROBOT_DISCOUNT_FACTOR
             )
 
-            if random.random() < SPAWN_GOAL_IN_ROBOT:
+        return robot
+
+    def __generate_robot_list(
+        self,
+        rng: np.random.Generator,
+        random_color: int,
+        pose: Pose2D,
+        percentage: float,
+        discount: float,
+    ) -> list[Robot]:
+        count = sample_chain_length(rng, percentage, discount, self.field_counts.get_remaining_robots())
+
+        robots = []
+        for _ in range(count):
+            robot = self.__generate_robot(rng, random_color, pose)
+            if robot is None:
+                break
+            robots.append(robot)
+        return robots
+
+    def __sample_free_poses(
+        self, placer: SpawnPlacer, radius: float, count: int, num_spawn_draws: int
+    ):
+        """
+        Yields count non-overlapping poses on the field for entities of the given radius, along with num_spawn_draws
+        uniform draws for the spawn decisions of each pose. Angles and spawn draws are drawn in bulk.
+        """
+        angles = placer.rng.uniform(-math.pi, math.pi, size=count)
+        spawn_draws = placer.rng.random((count, num_spawn_draws))
+
+        for angle, draws in zip(angles.tolist(), spawn_draws):
+            grid_x, y = placer.sample_and_place(radius)
+            yield Pose2D(grid_x - int(FIELD_WIDTH_IN / 2), y, angle), draws
+
+    def __spawn_field_robots(
+        self, placer: SpawnPlacer, robot_type: type, color: Color, count: int
+    ) -> None:
+        rng = placer.rng
+        for pose, draws in self.__sample_free_poses(placer, ROBOT_RADIUS, count, 2):
+            robot = robot_type(color, pose)
+
+            if draws[0] < SPAWN_GOAL_IN_ROBOT:
                 robot.goals = robot.goals + self.__generate_goal_list(
-                    pose, SPAWN_GOAL_IN_ROBOT, ADDITIONAL_GOAL_IN_ROBOT_DISCOUNT_FACTOR
+                    rng,
+                    pose,
+                    SPAWN_GOAL_IN_ROBOT,
+                    ADDITIONAL_GOAL_IN_ROBOT_DISCOUNT_FACTOR,
                 )
 
-            if random.random() < SPAWN_RING_IN_ROBOT:
+            if draws[1] < SPAWN_RING_IN_ROBOT:
                 robot.rings = robot.rings + self.__generate_ring_list(
-                    pose, SPAWN_RING_IN_ROBOT, ADDITIONAL_RING_IN_ROBOT_DISCOUNT_FACTOR
+                    rng,
+                    pose,
+                    SPAWN_RING_IN_ROBOT,
+                    ADDITIONAL_RING_IN_ROBOT_DISCOUNT_FACTOR,
                 )
 
-            if (
-                percentage < (percentage * ((current_iter + 1) * discount))
-                and self.field_counts.get_remaining_robots() > 1
-            ):
-                return [robot] + self.__generate_robot_list(
-                    random_color, pose, percentage, discount, current_iter + 1
-                )
-            else:
-                return [robot]
-        return []
+            self.robots.append(robot)
+
+            _log.debug("Spawned %s at (%s,%s,%s)", type(robot).__name__, pose.x, pose.y, pose.angle)
+
+    def __spawn_field_goals(self, placer: SpawnPlacer, goal_type: type, count: int) -> None:
+        rng = placer.rng
+        for pose, draws in self.__sample_free_poses(placer, GOAL_RADIUS, count, 1):
+            goal = goal_type(pose)
+
+            if draws[0] < SPAWN_RING_ON_GOAL:
+                self.__add_rings_to_goal(rng, goal)
+
+            self.goals.append(goal)
+
+            _log.debug("Spawned %s at (%s,%s,%s)", type(goal).__name__, pose.x, pose.y, pose.angle)
+
+    def randomize(self, rng: np.random.Generator = None, field_counts: FieldCounts = None) -> None:
+        """
+        Replaces the field with a random layout. The same generator state always produces the same layout. Entities
+        spawned on the field never overlap, raising a ValueError when they do not fit.
+
+        @param rng: Generator to draw the layout from. When None, a generator is seeded from the random module, so
+            random.seed still makes layouts repeatable
+        @param field_counts: Starting counts and maximum number of each entity, defaults to the game's maximums
+        """
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
 
-    def randomize(self) -> None:
         # Reset field
         self.red_platform.state = PlatformState.LEVEL
         self.red_platform.robots = []
@@ -320,28 +474,20 @@ class FieldRepresentation(ISerializable):
         self.goals = []
         self.rings = []
 
-        self.field_counts = FieldCounts()
+        self.field_counts = FieldCounts() if field_counts is None else copy.copy(field_counts)
+        self._owned_entities = None
 
-        # Randomize field
-        field_map = np.zeros((FIELD_WIDTH_IN + 1, FIELD_WIDTH_IN + 1))
+        # Randomize field, nothing spawns on the field under the ramps
+        placer = SpawnPlacer(rng)
 
-        # Prevent things from spawning in on the ramp
-        mid_field = int(FIELD_WIDTH_IN / 2)
-        for x in range(
-            mid_field - int(PLATFORM_LENGTH_IN / 2),
-            mid_field + int(PLATFORM_LENGTH_IN / 2),
-        ):
-            for y in range(0, PLATFORM_WIDTH_IN + 1):
-                field_map[y][x] = 1  # Block off area for ramp
+        current_color = rng.integers(0, 1, endpoint=True)
 
-            for y in range(FIELD_WIDTH_IN - PLATFORM_WIDTH_IN, FIELD_WIDTH_IN + 1):
-                field_map[y][x] = 1  # Block off area for ramp
-
-        current_color = random.randint(0, 1)
+        # Robot, goal and ring spawn chances and the tilt of each ramp
+        ramp_draws = rng.random((2, 4))
 
         # TODO fix when entities are stacked
 
-        for ramp_color in [Color.RED, Color.BLUE]:
+        for ramp_color, draws in zip([Color.RED, Color.BLUE], ramp_draws):
             x_pos = (0 - (PLATFORM_LENGTH_IN / 2)) + 5
             y_pos = (
                 (PLATFORM_WIDTH_IN / 3)
@@ -353,10 +499,11 @@ class FieldRepresentation(ISerializable):
             # TODO add logging to ramp generated elements
 
             robots = []
-            if random.random() < SPAWN_ROBOT_ON_RAMP:
+            if draws[0] < SPAWN_ROBOT_ON_RAMP:
                 pose = Pose2D(x_pos, y_pos, angle)
                 x_pos += 10
                 robots = self.__generate_robot_list(
+                    rng,
                     current_color,
                     pose,
                     SPAWN_ROBOT_ON_RAMP,
@@ -364,22 +511,22 @@ class FieldRepresentation(ISerializable):
                 )
 
             goals = []
-            if random.random() < SPAWN_GOAL_ON_RAMP:
+            if draws[1] < SPAWN_GOAL_ON_RAMP:
                 pose = Pose2D(x_pos, y_pos, angle)
                 x_pos += 10
                 goals = self.__generate_goal_list(
-                    pose, SPAWN_GOAL_ON_RAMP, ADDITIONAL_GOAL_ON_RAMP_DISCOUNT_FACTOR
+                    rng, pose, SPAWN_GOAL_ON_RAMP, ADDITIONAL_GOAL_ON_RAMP_DISCOUNT_FACTOR
                 )
 
             rings = []
-            if random.random() < SPAWN_RING_ON_RAMP:
+            if draws[2] < SPAWN_RING_ON_RAMP:
                 pose = Pose2D(x_pos, y_pos, angle)
                 x_pos += 10
                 rings = self.__generate_ring_list(
-                    pose, SPAWN_RING_ON_RAMP, ADDITIONAL_RING_ON_RAMP_DISCOUNT_FACTOR
+                    rng, pose, SPAWN_RING_ON_RAMP, ADDITIONAL_RING_ON_RAMP_DISCOUNT_FACTOR
                 )
 
-            statePercent = random.random()
+            statePercent = draws[3]
             if statePercent < 0.33:
                 state = PlatformState.LEFT
             elif statePercent <= 0.66:
@@ -396,211 +543,620 @@ class FieldRepresentation(ISerializable):
                     state, robots=robots, goals=goals, rings=rings
                 )
 
-        while self.field_counts.get_remaining_host_robots() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
-
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
-
-                robot = HostRobot(
-                    self.__get_alliance_color(current_color), pose
-                )
-
-                if random.random() < SPAWN_GOAL_IN_ROBOT:
-                    robot.goals = robot.goals + self.__generate_goal_list(
-                        pose,
-                        SPAWN_GOAL_IN_ROBOT,
-                        ADDITIONAL_GOAL_IN_ROBOT_DISCOUNT_FACTOR,
-                    )
-
-                if random.random() < SPAWN_RING_IN_ROBOT:
-                    robot.rings = robot.rings + self.__generate_ring_list(
-                        pose,
-                        SPAWN_RING_IN_ROBOT,
-                        ADDITIONAL_RING_IN_ROBOT_DISCOUNT_FACTOR,
-                    )
-
-                self.robots.append(robot)
-                self.field_counts.host_robots += 1
-
-                getLogger(REPRESENTATION_LOGGER_NAME).info(
-                    f"Spawned Host Robot at ({x},{y},{angle})"
-                )
+        # Each category is placed in one pass, its remaining count only changes as it is placed
+        counts = self.field_counts
+        host_color = self.__get_alliance_color(current_color)
+        opposing_color = self.__get_alliance_color(current_color, False)
+
+        num_robots = counts.get_remaining_host_robots()
+        self.__spawn_field_robots(placer, HostRobot, host_color, num_robots)
+        counts.host_robots += num_robots
+
+        num_robots = counts.get_remaining_partner_robots()
+        self.__spawn_field_robots(placer, PartnerRobot, host_color, num_robots)
+        counts.partner_robots += num_robots
+
+        num_robots = counts.get_remaining_opposing_robots()
+        self.__spawn_field_robots(placer, OpposingRobot, opposing_color, num_robots)
+        counts.opposing_robots += num_robots
+
+        num_goals = counts.get_remaining_red_goals()
+        self.__spawn_field_goals(placer, RedGoal, num_goals)
+        counts.red_goals += num_goals
+
+        num_goals = counts.get_remaining_blue_goals()
+        self.__spawn_field_goals(placer, BlueGoal, num_goals)
+        counts.blue_goals += num_goals
+
+        num_goals = counts.get_remaining_low_neutral_goals()
+        self.__spawn_field_goals(placer, LowNeutralGoal, num_goals)
+        counts.low_neutral_goals += num_goals
+
+        num_goals = counts.get_remaining_high_neutral_goals()
+        self.__spawn_field_goals(placer, HighNeutralGoal, num_goals)
+        counts.high_neutral_goals += num_goals
+
+        num_rings = counts.get_remaining_rings()
+        for pose, _ in self.__sample_free_poses(placer, RING_RADIUS, num_rings, 0):
+            self.rings.append(Ring(pose))
+
+            _log.debug("Spawned Ring at (%s,%s,%s)", pose.x, pose.y, pose.angle)
+        counts.rings += num_rings
+
+        self.register_entities()
+
+        # One record per reset rather than one per spawn, its counts only gathered when it is logged
+        if _log.is_enabled(logging.INFO):
+            log_spawn_summary(_log, self.__count_spawns())
+
+    def __count_spawns(self) -> Counter:
+        spawns = Counter()
+        for location, container in [
+            ("field", self),
+            ("red_platform", self.red_platform),
+            ("blue_platform", self.blue_platform),
+        ]:
+            for ent in [*container.robots, *container.goals, *container.rings]:
+                spawns[f"{type(ent).__name__}@{location}"] += 1
+
+                if isinstance(ent, Robot):
+                    for held in [*ent.goals, *ent.rings]:
+                        spawns[f"{type(held).__name__}@robot"] += 1
+                        if isinstance(held, Goal):
+                            spawns["Ring@goal"] += held.get_total_rings()
+                elif isinstance(ent, Goal):
+                    spawns["Ring@goal"] += ent.get_total_rings()
+
+        # Goals without rings on them leave a zero count behind
+        return +spawns
+
+    def __get_all_entities(self) -> list:
+        entities = []
+        for ent in [
+            *self.robots,
+            *self.goals,
+            *self.rings,
+            *self.red_platform.robots,
+            *self.red_platform.goals,
+            *self.red_platform.rings,
+            *self.blue_platform.robots,
+            *self.blue_platform.goals,
+            *self.blue_platform.rings,
+        ]:
+            entities.append(ent)
 
-        while self.field_counts.get_remaining_partner_robots() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
-
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
-
-                robot = PartnerRobot(self.__get_alliance_color(current_color), pose)
-
-                if random.random() < SPAWN_GOAL_IN_ROBOT:
-                    robot.goals = robot.goals + self.__generate_goal_list(
-                        pose,
-                        SPAWN_GOAL_IN_ROBOT,
-                        ADDITIONAL_GOAL_IN_ROBOT_DISCOUNT_FACTOR,
-                    )
-
-                if random.random() < SPAWN_RING_IN_ROBOT:
-                    robot.rings = robot.rings + self.__generate_ring_list(
-                        pose,
-                        SPAWN_RING_IN_ROBOT,
-                        ADDITIONAL_RING_IN_ROBOT_DISCOUNT_FACTOR,
-                    )
-
-                self.robots.append(robot)
-                self.field_counts.partner_robots += 1
-
-                getLogger(REPRESENTATION_LOGGER_NAME).info(
-                    f"Spawned Partner Robot at ({x},{y},{angle})"
-                )
-
-        while self.field_counts.get_remaining_opposing_robots() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
-
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
-
-                robot = OpposingRobot(
-                    self.__get_alliance_color(current_color, False), pose
-                )
-
-                if random.random() < SPAWN_GOAL_IN_ROBOT:
-                    robot.goals = robot.goals + self.__generate_goal_list(
-                        pose,
-                        SPAWN_GOAL_IN_ROBOT,
-                        ADDITIONAL_GOAL_IN_ROBOT_DISCOUNT_FACTOR,
-                    )
-
-                if random.random() < SPAWN_RING_IN_ROBOT:
-                    robot.rings = robot.rings + self.__generate_ring_list(
-                        pose,
-                        SPAWN_RING_IN_ROBOT,
-                        ADDITIONAL_RING_IN_ROBOT_DISCOUNT_FACTOR,
-                    )
-
-                self.robots.append(robot)
-                self.field_counts.opposing_robots += 1
-
-                getLogger(REPRESENTATION_LOGGER_NAME).info(
-                    f"Spawned Opposing Robot at ({x},{y},{angle})"
-                )
-
-        while self.field_counts.get_remaining_red_goals() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
-
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
-
-                goal = RedGoal(pose)
-
-                if random.random() < SPAWN_RING_ON_GOAL:
-                    self.__add_rings_to_goal(goal)
-
-                self.goals.append(goal)
-                self.field_counts.red_goals += 1
-
-                getLogger(REPRESENTATION_LOGGER_NAME).info(
-                    f"Spawned Red Goal at ({x},{y},{angle})"
-                )
-
-        while self.field_counts.get_remaining_blue_goals() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
-
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
-
-                goal = BlueGoal(pose)
-
-                if random.random() < SPAWN_RING_ON_GOAL:
-                    self.__add_rings_to_goal(goal)
-
-                self.goals.append(goal)
-                self.field_counts.blue_goals += 1
-
-                getLogger(REPRESENTATION_LOGGER_NAME).info(
-                    f"Spawned Blue Goal at ({x},{y},{angle})"
-                )
-
-        while self.field_counts.get_remaining_low_neutral_goals() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
-
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
-
-                goal = LowNeutralGoal(pose)
-
-                if random.random() < SPAWN_RING_ON_GOAL:
-                    self.__add_rings_to_goal(goal)
-
-                self.goals.append(goal)
-                self.field_counts.low_neutral_goals += 1
-
-                getLogger(REPRESENTATION_LOGGER_NAME).info(
-                    f"Spawned Low Neutral Goal at ({x},{y},{angle})"
-                )
-
-        while self.field_counts.get_remaining_high_neutral_goals() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
-
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
-
-                goal = HighNeutralGoal(pose)
-
-                if random.random() < SPAWN_RING_ON_GOAL:
-                    self.__add_rings_to_goal(goal)
-
-                self.goals.append(goal)
-                self.field_counts.high_neutral_goals += 1
-
-                getLogger(REPRESENTATION_LOGGER_NAME).info(
-                    f"Spawned High Neutral Goal at ({x},{y},{angle})"
-                )
+            if isinstance(ent, Robot):
+                entities += ent.goals + ent.rings
+
+        for goal in [ent for ent in entities if isinstance(ent, Goal)]:
+            for container in goal.ring_containers.values():
+                entities += container.rings
+
+        return entities
+
+    def __get_field_list(self, ent) -> list:
+        if isinstance(ent, Goal):
+            return self.goals
+        elif isinstance(ent, Ring):
+            return self.rings
+        elif isinstance(ent, Robot):
+            return self.robots
+        raise TypeError(f"{type(ent).__name__} is not a field entity")
+
+    def register_entities(self) -> None:
+        """
+        Rebuilds the entity registry from every entity on the field, on the platforms, held by robots or scored in
+        goals, and recomputes the state hash and scores. Called after the entity lists are replaced wholesale, such as
+        by randomize.
+        """
+        self._registry = EntityRegistry()
+        for ent in self.__get_all_entities():
+            self._registry.register(ent)
+        self._state_hash = self.compute_state_hash()
+        self._scores = self.compute_scores()
+        if self._changed_entities is not None:
+            self._changed_entities = {}
+
+    def get_entity_id(self, ent) -> int:
+        """
+        Stable id of an entity, unchanged as it is picked up, released or scored until the field is randomized
+        """
+        return self._registry.get_id(ent)
+
+    def get_entity(self, entity_id: int):
+        return self._registry.get(entity_id)
+
+    def add_to_field(self, ent) -> int:
+        """
+        Adds an entity to the end of its field list, registering it if it is new to the field
+
+        @param ent: Goal, ring or robot to add
+        @return: The id of the entity
+        """
+        is_new = ent not in self._registry
+        self.__get_field_list(ent).append(ent)
+        ent_id = self._registry.register(ent)
+
+        if is_new:
+            self.__toggle_state(ent)
+        self.__toggle_location(ent, self.__get_field_location(ent))
+        if isinstance(ent, Goal):
+            self._scores.add_goal(ent_id, FIELD_HOLDER, ent)
+        return ent_id
+
+    def remove_from_field(self, *ents) -> None:
+        """
+        Removes entities from their field lists by identity, keeping their ids so they can be returned to the field
+        later. The lists keep their order, so each list is compacted in at most a single pass.
+
+        @param ents: Goals, rings or robots currently on the field
+        """
+        removed = {}
+        for ent in ents:
+            ent_lst = self.__get_field_list(ent)
+            removed.setdefault(id(ent_lst), (ent_lst, set()))[1].add(id(ent))
+
+        for ent_lst, ids in removed.values():
+            if len(ids) == 1:
+                ent_id = next(iter(ids))
+                idx = next((idx for idx, en in enumerate(ent_lst) if id(en) == ent_id), None)
+                if idx is None:
+                    raise ValueError("Entity is not on the field")
+                del ent_lst[idx]
+            else:
+                remaining = [en for en in ent_lst if id(en) not in ids]
+                if len(ent_lst) - len(remaining) != len(ids):
+                    raise ValueError("Entity is not on the field")
+                ent_lst[:] = remaining
 
-        while self.field_counts.get_remaining_rings() > 0:
-            grid_x = random.randint(0, FIELD_WIDTH_IN)
-            x = grid_x - int(FIELD_WIDTH_IN / 2)
-            y = random.randint(0, FIELD_WIDTH_IN)
-            angle = (random.random() * 2 * math.pi) - math.pi
-            pose = Pose2D(x, y, angle)
+        for ent in ents:
+            self.__toggle_location(ent, self.__get_field_location(ent))
+            if isinstance(ent, Goal):
+                self._scores.remove_goal(self._registry.get_id(ent))
+
+    def __get_platform_index(self, platform: Platform) -> int:
+        return 0 if platform is self.red_platform else 1
+
+    def add_to_platform(self, platform: Platform, ent) -> int:
+        """
+        Adds an entity to the end of its list on a platform, registering it if it is new to the field. The points of
+        the platform are kept, along with the state hash.
+
+        @param platform: Red or blue platform of this field
+        @param ent: Goal, ring or robot to add
+        @return: The id of the entity
+        """
+        is_new = ent not in self._registry
+        field_location = self.__get_field_location(ent)
+        getattr(platform, ENTITY_LISTS[field_location]).append(ent)
+        ent_id = self._registry.register(ent)
+
+        platform_idx = self.__get_platform_index(platform)
+        if is_new:
+            self.__toggle_state(ent)
+        self.__toggle_location(ent, (platform_idx + 1) * len(ENTITY_LISTS) + field_location)
+        self._scores.platform_points[platform_idx] += platform.get_level_points(ent)
+        return ent_id
+
+    def remove_from_platform(self, platform: Platform, ent) -> None:
+        """
+        Removes an entity from its list on a platform by identity, keeping its id so it can be added elsewhere
+
+        @param platform: Red or blue platform of this field
+        @param ent: Goal, ring or robot on the platform
+        """
+        field_location = self.__get_field_location(ent)
+        ent_lst = getattr(platform, ENTITY_LISTS[field_location])
+        idx = self.__find(ent_lst, ent)
+        if idx is None:
+            raise ValueError("Entity is not on the platform")
+        del ent_lst[idx]
+
+        platform_idx = self.__get_platform_index(platform)
+        self.__toggle_location(ent, (platform_idx + 1) * len(ENTITY_LISTS) + field_location)
+        self._scores.platform_points[platform_idx] -= platform.get_level_points(ent)
+
+    def __get_field_location(self, ent) -> int:
+        if isinstance(ent, Goal):
+            return ENTITY_LISTS.index("goals")
+        elif isinstance(ent, Ring):
+            return ENTITY_LISTS.index("rings")
+        return ENTITY_LISTS.index("robots")
+
+    def __toggle_state(self, ent) -> None:
+        ent_id = self._registry.get_id(ent)
+        self._state_hash ^= get_state_key(get_entity_record(ent, 0, NO_PARENT, ent_id))
+        if self._changed_entities is not None:
+            self._changed_entities.setdefault(ent_id, False)
+
+    def __toggle_location(self, ent, location: int, parent: int = NO_PARENT) -> None:
+        ent_id = self._registry.get_id(ent)
+        self._state_hash ^= get_location_key(ent_id, location, parent)
+        if self._changed_entities is not None:
+            self._changed_entities[ent_id] = True
+
+    def set_pose(self, ent, pose: Pose2D) -> None:
+        """
+        Moves an entity, keeping the state hash and scores. Like the methods below, ent must be writable, see
+        get_writable.
+        """
+        self.__toggle_state(ent)
+        ent.pose = pose
+        self.__toggle_state(ent)
+        if isinstance(ent, Goal):
+            self._scores.update_goal(self._registry.get_id(ent), ent)
+
+    def capture(self, robot: Robot, *ents) -> None:
+        """
+        Takes goals and rings off the field into a robot, in order
+
+        @param robot: Writable robot taking the entities
+        @param ents: Goals and rings on the field
+        """
+        self.remove_from_field(*ents)
+
+        robot_id = self.get_entity_id(robot)
+        for ent in ents:
+            if isinstance(ent, Goal):
+                robot.goals.append(ent)
+                self.__toggle_location(ent, ROBOT_GOALS, robot_id)
+                self._scores.add_goal(self._registry.get_id(ent), robot_id, ent)
+            else:
+                robot.rings.append(ent)
+                self.__toggle_location(ent, ROBOT_RINGS, robot_id)
+
+    def __take_from_robot(self, robot: Robot, ent) -> None:
+        held = robot.goals if isinstance(ent, Goal) else robot.rings
+        # Entities are usually taken from the end
+        idx = next(idx for idx in range(len(held) - 1, -1, -1) if held[idx] is ent)
+        del held[idx]
+        self.__toggle_location(
+            ent, ROBOT_GOALS if isinstance(ent, Goal) else ROBOT_RINGS, self.get_entity_id(robot)
+        )
+        if isinstance(ent, Goal):
+            self._scores.remove_goal(self._registry.get_id(ent))
+
+    def release(self, robot: Robot, ent, pose: Pose2D) -> None:
+        """
+        Returns a goal or ring held by a robot to the field at the given pose
+
+        @param robot: Writable robot holding the entity
+        @param ent: Writable goal or ring
+        """
+        self.__take_from_robot(robot, ent)
+        self.set_pose(ent, pose)
+        self.add_to_field(ent)
+
+    def place_ring(self, robot: Robot, ring: Ring, goal: Goal, level: GoalLevel) -> bool:
+        """
+        Scores a ring held by a robot on a level of a goal. The ring leaves the robot even when the level is full, in
+        which case it leaves the field.
+
+        @param robot: Writable robot holding the ring
+        @param goal: Writable goal
+        @return: Whether the ring was scored
+        """
+        self.__take_from_robot(robot, ring)
+        if not goal.add_ring(ring, level):
+            self.__toggle_state(ring)
+            return False
+
+        goal_id = self.get_entity_id(goal)
+        self.__toggle_location(ring, GOAL_RINGS + LEVELS.index(level), goal_id)
+        self._scores.update_goal(goal_id, goal)
+        return True
+
+    def set_platform_state(self, platform: Platform, state: PlatformState) -> None:
+        platform_idx = self.__get_platform_index(platform)
+        self._state_hash ^= get_platform_key(platform_idx, platform.state)
+        platform.state = state
+        self._state_hash ^= get_platform_key(platform_idx, platform.state)
+
+    def __get_entity_lists(self) -> list:
+        return [
+            getattr(container, name)
+            for container in [self, self.red_platform, self.blue_platform]
+            for name in ENTITY_LISTS
+        ]
+
+    def compute_state_hash(self) -> int:
+        """
+        Computes the state hash from scratch, see get_state_hash
+        """
+        return get_field_hash(
+            (self.red_platform.state, self.blue_platform.state),
+            get_entity_records(self.__get_entity_lists(), self._registry),
+        )
 
-            if field_map[y][grid_x] == 0:
-                field_map[y][grid_x] = 1
+    def track_changes(self, enabled: bool = True) -> None:
+        """
+        Starts or stops collecting the entities changed by the methods keeping the state hash, see
+        pop_changed_records. Randomizing the field clears the entities collected so far.
+        """
+        self._changed_entities = {} if enabled else None
+
+    def pop_changed_records(self) -> list:
+        """
+        Records of the entities changed since tracking started or since the last call, following SNAPSHOT_RECORD, in
+        the order they were first changed. Entities that left the field have the REMOVED location, and entities that
+        changed location are preceded by a REMOVED record, as they were appended to the end of their list even when
+        returning to the same one. Replaying the records on a copy of the field with apply_records brings it to the
+        state of this field.
+        """
+        changed, self._changed_entities = self._changed_entities, {}
+        records = []
+        for ent_id, moved in changed.items():
+            ent = self._registry.get(ent_id)
+            location, parent = self.__locate(ent) or (REMOVED, NO_PARENT)
+            if moved and location != REMOVED:
+                records.append(get_entity_record(ent, REMOVED, NO_PARENT, ent_id))
+            records.append(get_entity_record(ent, location, parent, ent_id))
+        return records
+
+    def __locate(self, ent) -> Optional[Tuple[int, int]]:
+        field_location = self.__get_field_location(ent)
+        for location, ent_lst in enumerate(self.__get_entity_lists()):
+            if location % len(ENTITY_LISTS) == field_location and self.__find(ent_lst, ent) is not None:
+                return location, NO_PARENT
+
+        # Robots are never held
+        if isinstance(ent, Robot):
+            return None
+
+        robots = [*self.robots, *self.red_platform.robots, *self.blue_platform.robots]
+        for robot in robots:
+            for location, held in [(ROBOT_GOALS, robot.goals), (ROBOT_RINGS, robot.rings)]:
+                if self.__find(held, ent) is not None:
+                    return location, self._registry.get_id(robot)
+
+        if isinstance(ent, Ring):
+            goals = [*self.goals, *self.red_platform.goals, *self.blue_platform.goals]
+            goals += [goal for robot in robots for goal in robot.goals]
+            for goal in goals:
+                for ldx, level in enumerate(LEVELS):
+                    container = goal.ring_containers.get(level)
+                    if container is not None and self.__find(container.rings, ent) is not None:
+                        return GOAL_RINGS + ldx, self._registry.get_id(goal)
+        return None
+
+    def __get_location_list(self, location: int, parent: int) -> list:
+        if location < NUM_ENTITY_LISTS:
+            return self.__get_entity_lists()[location]
+
+        holder = self.get_writable(self._registry.get(parent))
+        if location == ROBOT_GOALS:
+            return holder.goals
+        elif location == ROBOT_RINGS:
+            return holder.rings
+        return holder.ring_containers[LEVELS[location - GOAL_RINGS]].rings
+
+    def apply_records(self, records) -> None:
+        """
+        Brings entities to the pose, state and location of their records, as returned by pop_changed_records.
+        Entities changing location are appended to their new list, as the methods keeping the state hash do, so a
+        field replaying the records of another keeps its list order. The state hash and scores are recomputed.
+        Entities added to the other field since this one was copied from it are not supported.
+
+        @param records: Records following SNAPSHOT_RECORD of entities registered on this field
+        """
+        for ent_id, _, location, parent, _, tipped, capacity, x, y, angle in records:
+            ent = self.get_writable(self._registry.get(ent_id))
+            ent.pose = Pose2D(x, y, angle)
+            if hasattr(ent, "tipped"):
+                ent.tipped = bool(tipped)
+            if isinstance(ent, Goal):
+                for level, max_storage in zip(LEVELS, capacity):
+                    if level in ent.ring_containers:
+                        ent.ring_containers[level].max_storage = max_storage
+
+            current = self.__locate(ent)
+            if current == (location, parent):
+                continue
+            if current is not None:
+                ent_lst = self.__get_location_list(*current)
+                del ent_lst[self.__find(ent_lst, ent)]
+            if location != REMOVED:
+                self.__get_location_list(location, parent).append(ent)
+
+        self._state_hash = self.compute_state_hash()
+        self._scores = self.compute_scores()
+
+    def get_state_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the platform states and of the id, pose, state and location of every entity, equal for
+        fields in the same state up to the order of the entity lists. Ids are part of the state, so only fields sharing
+        an origin, such as forks and snapshots, compare.
+
+        The hash is kept up to date in constant time by set_pose, capture, release, place_ring, set_platform_state,
+        add_to_field, remove_from_field, add_to_platform and remove_from_platform. Other changes need
+        register_entities to be called.
+        """
+        return self._state_hash
+
+    def compute_scores(self) -> ScoreBoard:
+        """
+        Builds the score board from scratch, tracking the goals on the field and those held by robots
+        """
+        scores = ScoreBoard()
+        for goal in self.goals:
+            scores.add_goal(self._registry.get_id(goal), FIELD_HOLDER, goal)
+
+        for robot in [*self.robots, *self.red_platform.robots, *self.blue_platform.robots]:
+            robot_id = self._registry.get_id(robot)
+            for goal in robot.goals:
+                scores.add_goal(self._registry.get_id(goal), robot_id, goal)
+
+        scores.platform_points = [self.red_platform.get_level_score(), self.blue_platform.get_level_score()]
+        return scores
+
+    def get_goal_score(self, color: Color) -> int:
+        """
+        Score of an alliance from the goals on the field, kept current by the same methods as get_state_hash
+        """
+        return self._scores.get_total(FIELD_HOLDER, color)
+
+    def get_held_goal_score(self, robot: Robot, color: Color) -> int:
+        """
+        Score of an alliance from the goals a robot holds
+        """
+        return self._scores.get_total(self._registry.get_id(robot), color)
+
+    def get_platform_score(self, color: Color) -> int:
+        """
+        Score of an alliance from its own platform, matching Platform.get_current_score. The points of the platform
+        are kept by add_to_platform and remove_from_platform, its state is read as is.
+        """
+        platform = self.red_platform if color == Color.RED else self.blue_platform
+        if platform.state != PlatformState.LEVEL:
+            return 0
+        return self._scores.platform_points[color]
+
+    def snapshot(self) -> FieldSnapshot:
+        """
+        Saves the field, to be restored later or forked. Only the entity lists are copied, the entities are shared
+        with the snapshot and copied by get_writable before they next change.
+        """
+        self._owned_entities = set()
+        return FieldSnapshot(
+            (self.red_platform.state, self.blue_platform.state),
+            tuple(tuple(ent_lst) for ent_lst in self.__get_entity_lists()),
+            self.__get_field_count_values(),
+            copy.copy(self._registry),
+            self._state_hash,
+            copy.copy(self._scores),
+        )
 
-                self.rings.append(Ring(pose))
-                self.field_counts.rings += 1
+    def __get_field_count_values(self) -> tuple:
+        return tuple(getattr(self.field_counts, count.name) for count in fields(FieldCounts))
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the field compactly, as FieldSnapshot.to_bytes does, to be decoded by from_bytes. Unlike encoding a
+        snapshot, the field keeps its entities to itself, so later changes do not copy them.
+        """
+        return encode_field(
+            (self.red_platform.state, self.blue_platform.state),
+            self.__get_entity_lists(),
+            self.__get_field_count_values(),
+            self._registry,
+            self._state_hash,
+        )
 
-                getLogger(REPRESENTATION_LOGGER_NAME).info(f"Spawned Ring at ({x},{y},{angle})")
+    @classmethod
+    def from_bytes(cls, data: bytes) -> FieldRepresentation:
+        """
+        Decodes a field encoded by to_bytes or FieldSnapshot.to_bytes, with the same entities, ids and state hash
+
+        @raise ValueError: When the data is not an encoded field of the supported version
+        """
+        rep = cls.from_snapshot(FieldSnapshot.from_bytes(data))
+        # The decoded entities belong to this field alone
+        rep._owned_entities = None
+        return rep
+
+    def restore(self, snapshot: FieldSnapshot) -> None:
+        """
+        Returns the field to a saved state, sharing the snapshot's entities until they change
+
+        @param snapshot: Snapshot of this or any other field
+        """
+        entity_lists = iter(snapshot.entity_lists)
+        for container in [self, self.red_platform, self.blue_platform]:
+            for name in ENTITY_LISTS:
+                setattr(container, name, list(next(entity_lists)))
+
+        self.red_platform.state, self.blue_platform.state = snapshot.platform_states
+        self.field_counts = FieldCounts(*snapshot.field_counts)
+        self._registry = copy.copy(snapshot.registry)
+        self._owned_entities = set()
+        self._state_hash = snapshot.state_hash
+        if self._state_hash is None:
+            self._state_hash = self.compute_state_hash()
+        self._scores = copy.copy(snapshot.scores) if snapshot.scores is not None else self.compute_scores()
+
+    @classmethod
+    def from_snapshot(cls, snapshot: FieldSnapshot) -> FieldRepresentation:
+        rep = cls.__new__(cls)
+        rep._changed_entities = None
+        rep.red_platform = RedPlatform(PlatformState.LEVEL)
+        rep.blue_platform = BluePlatform(PlatformState.LEVEL)
+        rep.restore(snapshot)
+        return rep
+
+    def fork(self) -> FieldRepresentation:
+        """
+        Copy-on-write copy of the field for lookahead. The fork and this field share every entity until either changes
+        it through get_writable, so a fork costs a copy of the entity lists rather than of every entity.
+        """
+        rep = copy.copy(self)
+        # Platforms are cheaper to copy than to construct, restore replaces their lists
+        rep.red_platform = copy.copy(self.red_platform)
+        rep.blue_platform = copy.copy(self.blue_platform)
+        # Changes to the fork are its own
+        rep._changed_entities = None
+        rep.restore(self.snapshot())
+        return rep
+
+    def __copy_entity(self, ent):
+        ent_copy = copy.copy(ent)
+        if isinstance(ent, Robot):
+            ent_copy.goals = list(ent.goals)
+            ent_copy.rings = list(ent.rings)
+        elif isinstance(ent, Goal):
+            ent_copy.ring_containers = {
+                level: RingContainer(container.max_storage, list(container.rings))
+                for level, container in ent.ring_containers.items()
+            }
+        return ent_copy
+
+    @staticmethod
+    def __find(ent_lst: list, ent) -> Optional[int]:
+        return next((idx for idx, en in enumerate(ent_lst) if en is ent), None)
+
+    def __replace_entity(self, old, new) -> None:
+        for ent_lst in self.__get_entity_lists():
+            idx = self.__find(ent_lst, old)
+            if idx is not None:
+                ent_lst[idx] = new
+                return
+
+        # Held and scored entities are replaced within a writable copy of their holder
+        robots = [*self.robots, *self.red_platform.robots, *self.blue_platform.robots]
+        for robot in robots:
+            for name in ["goals", "rings"]:
+                idx = self.__find(getattr(robot, name), old)
+                if idx is not None:
+                    getattr(self.get_writable(robot), name)[idx] = new
+                    return
+
+        goals = [*self.goals, *self.red_platform.goals, *self.blue_platform.goals]
+        goals += [goal for robot in robots for goal in robot.goals]
+        for goal in goals:
+            for level, container in goal.ring_containers.items():
+                idx = self.__find(container.rings, old)
+                if idx is not None:
+                    self.get_writable(goal).ring_containers[level].rings[idx] = new
+                    return
+
+        raise ValueError("Entity is not part of the field")
+
+    def get_writable(self, ent):
+        """
+        Returns the entity to change in place of ent. Entities shared with a snapshot or fork are first replaced by a
+        copy holding the same id, which is returned, so every change to a forked field must go through this method.
+        The holder of a held or scored entity is made writable along with it.
+
+        @param ent: Entity of this field
+        @return: ent, or the copy that replaced it
+        """
+        if self._owned_entities is None or id(ent) in self._owned_entities:
+            return ent
+
+        ent_copy = self.__copy_entity(ent)
+        self.__replace_entity(ent, ent_copy)
+        self._registry.replace(ent, ent_copy)
+        self._owned_entities.add(id(ent_copy))
+        return ent_copy
 
     def __draw_robot(self, ax: Axes, pose: Pose2D, color: str, is_host: bool=False, is_clip_on: bool=True):
         plot_args = {
@@ -783,8 +1339,8 @@ class FieldRepresentation(ISerializable):
 
         # Draw robots
         if np.any(host_robot_arr):
-            robot_pose = Pose2D(host_robot_arr[:, 0], host_robot_arr[:, 1], host_robot_arr[:, 2])
-            legend_pose = Pose2D(legend_x, legend_y, host_robot_arr[:, 2])
+            robot_pose = Pose2DArray(host_robot_arr[:, 0], host_robot_arr[:, 1], host_robot_arr[:, 2])
+            legend_pose = Pose2DArray(legend_x, legend_y, host_robot_arr[:, 2])
             legend_y -= legend_y_spacing
             
             # Draw on field
@@ -796,8 +1352,8 @@ class FieldRepresentation(ISerializable):
 
 
         if np.any(partner_robot_arr):
-            robot_pose = Pose2D(partner_robot_arr[:, 0], partner_robot_arr[:, 1], partner_robot_arr[:, 2])
-            legend_pose = Pose2D(np.full(partner_robot_arr[:, 2].shape, legend_x), np.full(partner_robot_arr[:, 2].shape, legend_y), partner_robot_arr[:, 2])
+            robot_pose = Pose2DArray(partner_robot_arr[:, 0], partner_robot_arr[:, 1], partner_robot_arr[:, 2])
+            legend_pose = Pose2DArray(legend_x, legend_y, partner_robot_arr[:, 2])
             legend_y -= legend_y_spacing
 
             # Draw on field
@@ -841,7 +1397,7 @@ class FieldRepresentation(ISerializable):
 
         # Draw rings
         if np.any(ring_arr):
-            ring_poses = Pose2D(ring_arr[:, 0], ring_arr[:, 1], 0)
+            ring_poses = Pose2DArray(ring_arr[:, 0], ring_arr[:, 1], 0)
             self.__draw_ring(ax, ring_poses)
 
         ax.set_xlim([-72, 72])
@@ -849,12 +1405,70 @@ class FieldRepresentation(ISerializable):
 
         return ax
 
-    def export_to_dict(self) -> dict:
-        loc = np.zeros((145, 145, 100))
-        pos = np.zeros((100, 3, 2))
-        col = np.zeros((100))
-        val = np.zeros((100))
-        opp = np.zeros((100))
+    def __get_host_color(self) -> Color:
+        hosts = [
+            robot
+            for robot in (
+                self.robots + self.red_platform.robots + self.blue_platform.robots
+            )
+            if type(robot) is HostRobot
+        ]
+        if not hosts:
+            raise ValueError("Field has no host robot")
+        return hosts[0].color
+
+    def __get_entity_type(self, ent) -> int:
+        val = 2
+        if isinstance(ent, HighNeutralGoal):
+            val = 0
+        elif isinstance(ent, Goal):
+            val = 1
+        elif isinstance(ent, Ring):
+            val = 2
+        elif isinstance(ent, Robot):
+            val = 3
+        return val
+
+    def __get_entity_value(self, ent, host_col: Color) -> int:
+        val = 0
+        if isinstance(ent, HighNeutralGoal):
+            val = 0
+        elif isinstance(ent, Goal):
+            val = self._scores.get_goal_score(self._registry.get_id(ent), host_col)
+        elif isinstance(ent, Ring):
+            val = 1
+        elif isinstance(ent, Robot):
+            val = self.get_held_goal_score(ent, host_col) + len(ent.rings)
+        return val
+
+    def __set_entity_possession(self, ent, pos: np.ndarray) -> None:
+        if isinstance(ent, Goal):
+            for level, cont in ent.ring_containers.items():
+                ldx = 0
+                if level == GoalLevel.BASE:
+                    ldx = 0
+                elif level == GoalLevel.LOW:
+                    ldx = 1
+                elif level == GoalLevel.HIGH:
+                    ldx = 2
+                pos[ldx][0] = cont.get_utilization()
+        if isinstance(ent, Robot):
+            pos[0][1] = len(ent.rings)
+            pos[0][0] = len(ent.goals)
+
+    def export_to_dict(
+        self, buffers: ObservationBuffers = None, copy: bool = True
+    ) -> dict:
+        """
+        Exports the field as the dense observation dictionary. When buffers are given the observation is written in
+        place, and either views of the buffers (copy=False) or copies of them (copy=True) are returned. Without
+        buffers a new set is allocated for this call.
+        """
+        if buffers is None:
+            buffers = ObservationBuffers()
+            copy = False
+        else:
+            buffers.clear()
 
         # TODO: add platforms
         ent_lst = [*self.rings, *self.goals, *self.robots]
@@ -862,70 +1476,103 @@ class FieldRepresentation(ISerializable):
             max(min(round(en.pose.x), 144), 0),
             max(min(round(en.pose.y), 144), 0),
         )
+        host_col = self.__get_host_color() if ent_lst else None
 
-        def type_map(ent):
-            val = 2
-            if isinstance(ent, HighNeutralGoal):
-                val = 0
-            elif isinstance(ent, Goal):
-                val = 1
-            elif isinstance(ent, Ring):
-                val = 2
-            elif isinstance(ent, Robot):
-                val = 3
-            return val
-
-        def point_map(ent):
-            val = 0
-            # TODO: compress util funcs into field rep class
-            host_col = [robot for robot in (self.robots + self.red_platform.robots + self.blue_platform.robots) if type(robot) is HostRobot][
-                0
-            ].color
-            if isinstance(ent, HighNeutralGoal):
-                val = 0
-            elif isinstance(ent, Goal):
-                val = ent.get_current_score(host_col)
-            elif isinstance(ent, Ring):
-                val = 1
-            elif isinstance(ent, Robot):
-                val = sum([goal.get_current_score(host_col) for goal in ent.goals])
-                val += len(ent.rings)
-            return val
-
+        xs, ys, types = [], [], []
         for i, ent in enumerate(ent_lst):
             # id = i
             # location
             x, y = pose_lam(ent)
-            loc[x][y][i] = type_map(ent)
+            xs.append(x)
+            ys.append(y)
+            types.append(self.__get_entity_type(ent))
 
             # possesion and opposing
-            if isinstance(ent, Goal):
-                for level, cont in ent.ring_containers.items():
-                    ldx = 0
-                    if level == GoalLevel.BASE:
-                        ldx = 0
-                    elif level == GoalLevel.LOW:
-                        ldx = 1
-                    elif level == GoalLevel.HIGH:
-                        ldx = 2
-                    pos[i][ldx][0] = cont.get_utilization()
+            self.__set_entity_possession(ent, buffers.possesion[i])
             if isinstance(ent, Robot):
-                pos[i][0][1] = len(ent.rings)
-                pos[i][0][0] = len(ent.goals)
-
-                opp[i] = ent.id
+                buffers.is_opposing[i] = ent.id
 
             # color
             if not isinstance(ent, Ring):
-                col[i] = ent.color.value
+                buffers.color[i] = ent.color.value
 
             # value
-            val[i] = point_map(ent)
+            buffers.value[i] = self.__get_entity_value(ent, host_col)
+
+        buffers.set_locations(xs, ys, types)
+
+        return buffers.as_dict(copy)
+
+    def export_to_entity_list(self, out: np.ndarray = None) -> np.ndarray:
+        """
+        Exports the field as a compact (MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature)) float32 array, with one row per
+        entity in the same order as export_to_dict. Unused rows are left as zeros (ID of 0). When out is given it is
+        overwritten in place and returned.
+        """
+        if out is None:
+            entities = np.zeros(
+                (MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature)), dtype=np.float32
+            )
+        else:
+            entities = out
+            entities.fill(0)
+
+        # TODO: add platforms
+        ent_lst = [*self.rings, *self.goals, *self.robots]
+        host_col = self.__get_host_color() if ent_lst else None
+
+        for i, ent in enumerate(ent_lst):
+            row = entities[i]
+            row[EntityFeature.ID] = i + 1
+            row[EntityFeature.TYPE] = self.__get_entity_type(ent)
+            row[EntityFeature.X] = ent.pose.x
+            row[EntityFeature.Y] = ent.pose.y
+            row[EntityFeature.ANGLE] = ent.pose.angle
+
+            if not isinstance(ent, Ring):
+                row[EntityFeature.COLOR] = ent.color.value
+
+            row[EntityFeature.VALUE] = self.__get_entity_value(ent, host_col)
+
+            if isinstance(ent, Robot):
+                row[EntityFeature.IS_OPPOSING] = ent.id
+
+            self.__set_entity_possession(
+                ent, row[EntityFeature.BASE_GOALS :].reshape(3, 2)
+            )
 
-        return dict(location=loc, possesion=pos, color=col, value=val, is_opposing=opp)
+        return entities
 
     def as_json(self) -> str:
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+        return json.dumps(self, default=serializable_fields, sort_keys=True, indent=4)
+
+
+def entity_list_to_dict(
+    entities: np.ndarray, buffers: ObservationBuffers = None, copy: bool = True
+) -> dict:
+    """
+    Converts an entity list observation (see FieldRepresentation.export_to_entity_list) back into the dense dictionary
+    layout produced by FieldRepresentation.export_to_dict, for use with models trained on dense observations
+    """
+    if buffers is None:
+        buffers = ObservationBuffers()
+        copy = False
+    else:
+        buffers.clear()
+
+    ids = np.flatnonzero(entities[:, EntityFeature.ID])
+    x = np.clip(np.round(entities[ids, EntityFeature.X]), 0, 144).astype(int)
+    y = np.clip(np.round(entities[ids, EntityFeature.Y]), 0, 144).astype(int)
+
+    buffers.set_locations(x, y, entities[ids, EntityFeature.TYPE], ids)
+    buffers.possesion[ids] = entities[ids, EntityFeature.BASE_GOALS :].reshape(
+        -1, 3, 2
+    )
+    buffers.color[ids] = entities[ids, EntityFeature.COLOR]
+    buffers.value[ids] = entities[ids, EntityFeature.VALUE]
+    buffers.is_opposing[ids] = entities[ids, EntityFeature.IS_OPPOSING]
+
+    return buffers.as_dict(copy)
 
 
 class FieldState(ISerializable):
@@ -0,0 +1,280 @@
+from __future__ import annotations
+import struct
+from typing import Optional, Tuple
+import numpy as np
+from .entityRegistry import EntityRegistry
+from .enumerations import Color, EntityKind, GoalLevel
+from .mathUtils import Pose2D
+from .platforms import PlatformState
+from .robots import HostRobot, OpposingRobot, PartnerRobot, Robot
+from .scoreBoard import ScoreBoard
+from .stateHash import get_field_hash
+from .scoring_elements import (
+    BlueGoal,
+    Goal,
+    HighNeutralGoal,
+    LowNeutralGoal,
+    RedGoal,
+    Ring,
+)
+
+OBJECT_KINDS = [
+    (HighNeutralGoal, EntityKind.HIGH_NEUTRAL_GOAL),
+    (LowNeutralGoal, EntityKind.LOW_NEUTRAL_GOAL),
+    (RedGoal, EntityKind.RED_GOAL),
+    (BlueGoal, EntityKind.BLUE_GOAL),
+    (HostRobot, EntityKind.HOST_ROBOT),
+    (PartnerRobot, EntityKind.PARTNER_ROBOT),
+    (OpposingRobot, EntityKind.OPPOSING_ROBOT),
+    (Ring, EntityKind.RING),
+]
+KIND_CLASSES = {kind: cls for cls, kind in OBJECT_KINDS}
+CLASS_KINDS = {cls: kind for cls, kind in OBJECT_KINDS}
+GOAL_KINDS = frozenset(kind for cls, kind in OBJECT_KINDS if issubclass(cls, Goal))
+ROBOT_KINDS = frozenset(kind for cls, kind in OBJECT_KINDS if issubclass(cls, Robot))
+
+# Order of the entity lists of a snapshot, the field's lists followed by the red then blue platform's lists
+ENTITY_LISTS = ("rings", "goals", "robots")
+NUM_ENTITY_LISTS = 3 * len(ENTITY_LISTS)
+
+# Goal levels in ring container order
+LEVELS = (GoalLevel.BASE, GoalLevel.LOW, GoalLevel.HIGH)
+NO_CAPACITY = (0,) * len(LEVELS)
+
+# Locations of an encoded entity past the entity lists, held by a robot or scored on a goal level
+ROBOT_GOALS = NUM_ENTITY_LISTS
+ROBOT_RINGS = NUM_ENTITY_LISTS + 1
+GOAL_RINGS = NUM_ENTITY_LISTS + 2
+NO_PARENT = 0xFFFFFFFF
+
+# Location of an entity that left the field, such as a ring placed on a full goal, in change records
+REMOVED = 0xFF
+
+SNAPSHOT_MAGIC = b"TPFS"
+SNAPSHOT_VERSION = 2
+
+# Magic, version, red and blue platform states, next entity id, number of records, state hash and the field counts
+SNAPSHOT_HEADER = struct.Struct("<4sBBBIIQ16i")
+
+# One record per entity, a parent always precedes the entities it holds
+SNAPSHOT_RECORD = np.dtype(
+    [
+        ("id", "<u4"),
+        ("kind", "u1"),
+        ("location", "u1"),
+        ("parent", "<u4"),
+        ("color", "u1"),
+        ("tipped", "u1"),
+        ("capacity", "u1", (len(LEVELS),)),
+        ("x", "<f8"),
+        ("y", "<f8"),
+        ("angle", "<f8"),
+    ]
+)
+
+# SNAPSHOT_RECORD as a struct, packing a record tuple with its capacity flattened
+RECORD_STRUCT = struct.Struct(f"<IBBIBB{len(LEVELS)}B3d")
+assert RECORD_STRUCT.size == SNAPSHOT_RECORD.itemsize
+
+
+def get_entity_kind(ent) -> EntityKind:
+    kind = CLASS_KINDS.get(type(ent))
+    if kind is not None:
+        return kind
+
+    for cls, kind in OBJECT_KINDS:
+        if isinstance(ent, cls):
+            return kind
+    raise TypeError(f"No entity kind for {type(ent).__name__}")
+
+
+def get_entity_record(ent, location: int, parent: int, ent_id: int) -> tuple:
+    """
+    Record of an entity following SNAPSHOT_RECORD, holding plain numbers so its hash is the same in every process
+    """
+    kind = get_entity_kind(ent)
+    capacity = NO_CAPACITY
+    # Kinds are looked up by type, which is much cheaper than isinstance checks against the abstract entity classes
+    if kind in GOAL_KINDS:
+        containers = ent.ring_containers
+        capacity = tuple(containers[level].max_storage if level in containers else 0 for level in LEVELS)
+
+    return (
+        ent_id,
+        int(kind),
+        location,
+        parent,
+        int(getattr(ent, "color", Color.NEUTRAL)),
+        int(getattr(ent, "tipped", False)),
+        capacity,
+        ent.pose.x,
+        ent.pose.y,
+        ent.pose.angle,
+    )
+
+
+def _append_goal_records(records: list, goal, location: int, parent: int, registry: EntityRegistry) -> None:
+    goal_id = registry.get_id(goal)
+    records.append(get_entity_record(goal, location, parent, goal_id))
+    for ldx, level in enumerate(LEVELS):
+        container = goal.ring_containers.get(level)
+        if container is not None:
+            for ring in container.rings:
+                records.append(get_entity_record(ring, GOAL_RINGS + ldx, goal_id, registry.get_id(ring)))
+
+
+def get_entity_records(entity_lists, registry: EntityRegistry) -> list:
+    """
+    Record of every entity in the lists, following SNAPSHOT_RECORD, with each entity followed by the entities it holds
+    """
+    records = []
+    for location, ent_lst in enumerate(entity_lists):
+        for ent in ent_lst:
+            kind = get_entity_kind(ent)
+            if kind in GOAL_KINDS:
+                _append_goal_records(records, ent, location, NO_PARENT, registry)
+                continue
+
+            ent_id = registry.get_id(ent)
+            records.append(get_entity_record(ent, location, NO_PARENT, ent_id))
+            if kind in ROBOT_KINDS:
+                for goal in ent.goals:
+                    _append_goal_records(records, goal, ROBOT_GOALS, ent_id, registry)
+                for ring in ent.rings:
+                    records.append(get_entity_record(ring, ROBOT_RINGS, ent_id, registry.get_id(ring)))
+    return records
+
+
+def encode_field(
+    platform_states: Tuple[PlatformState, PlatformState],
+    entity_lists,
+    field_counts: tuple,
+    registry: EntityRegistry,
+    state_hash: Optional[int] = None,
+) -> bytes:
+    """
+    Encodes a field as a header followed by a fixed size record per entity, see FieldSnapshot.to_bytes
+
+    @param state_hash: State hash of the field, computed from the records when None
+    """
+    records = get_entity_records(entity_lists, registry)
+    if state_hash is None:
+        state_hash = get_field_hash(platform_states, records)
+
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        *platform_states,
+        registry.next_id,
+        len(records),
+        state_hash,
+        *field_counts,
+    )
+    pack = RECORD_STRUCT.pack
+    return header + b"".join(
+        [pack(*record[:6], *record[6], *record[7:]) for record in records]
+    )
+
+
+class FieldSnapshot:
+    """
+    Saved state of a FieldRepresentation, see FieldRepresentation.snapshot. The snapshot shares its entities with the
+    field it was taken from, which copies them before changing them, so taking a snapshot only copies the entity
+    lists. Entities keep their ids when restored.
+
+    @param platform_states: States of the red and blue platforms
+    @param entity_lists: Entities in each list, ordered as in ENTITY_LISTS for the field and then each platform
+    @param field_counts: Values of the field counts, in field order
+    @param registry: Registry of every entity in the snapshot, not shared with any field
+    @param state_hash: State hash of the field, see FieldRepresentation.get_state_hash, computed on restore when None
+    @param scores: Score board of the field, not shared with any field, computed on restore when None
+    """
+
+    def __init__(
+        self,
+        platform_states: Tuple[PlatformState, PlatformState],
+        entity_lists: Tuple[tuple, ...],
+        field_counts: tuple,
+        registry: EntityRegistry,
+        state_hash: Optional[int] = None,
+        scores: Optional[ScoreBoard] = None,
+    ):
+        self.platform_states = platform_states
+        self.entity_lists = entity_lists
+        self.field_counts = field_counts
+        self.registry = registry
+        self.state_hash = state_hash
+        self.scores = scores
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the snapshot as a header followed by a fixed size record per entity, holding its id, kind, location,
+        pose and state. Restoring the decoded snapshot gives the same field, with the same entity ids and state hash.
+        """
+        return encode_field(
+            self.platform_states, self.entity_lists, self.field_counts, self.registry, self.state_hash
+        )
+
+    @staticmethod
+    def __decode_entity(record: tuple):
+        # Records are unpacked by RECORD_STRUCT, with the capacity flattened
+        kind, color, tipped = record[1], record[4], record[5]
+        cls = KIND_CLASSES[kind]
+        pose = Pose2D(*record[-3:])
+
+        if kind == EntityKind.RING:
+            return Ring(pose)
+        if kind in ROBOT_KINDS:
+            return cls(Color(color), pose, tipped=bool(tipped))
+
+        goal = cls(pose, tipped=bool(tipped))
+        for level, max_storage in zip(LEVELS, record[6 : 6 + len(LEVELS)]):
+            if level in goal.ring_containers:
+                goal.ring_containers[level].max_storage = max_storage
+        return goal
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> FieldSnapshot:
+        """
+        Decodes a snapshot encoded by to_bytes
+
+        @raise ValueError: When the data is not an encoded snapshot of this version
+        """
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError("Data is too short to be a field snapshot")
+
+        magic, version, red_state, blue_state, next_id, num_records, state_hash, *field_counts = (
+            SNAPSHOT_HEADER.unpack_from(data)
+        )
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Data is not a field snapshot of a supported version")
+
+        end = SNAPSHOT_HEADER.size + num_records * RECORD_STRUCT.size
+        if len(data) < end:
+            raise ValueError("Data is too short for the records of the field snapshot")
+        # Unpacking straight to tuples is cheaper than through a structured array
+        records = RECORD_STRUCT.iter_unpack(memoryview(data)[SNAPSHOT_HEADER.size : end])
+
+        entities = {}
+        entity_lists = [[] for _ in range(NUM_ENTITY_LISTS)]
+        for record in records:
+            ent_id, _, location, parent = record[:4]
+            ent = cls.__decode_entity(record)
+            entities[ent_id] = ent
+
+            if location < NUM_ENTITY_LISTS:
+                entity_lists[location].append(ent)
+            elif location == ROBOT_GOALS:
+                entities[parent].goals.append(ent)
+            elif location == ROBOT_RINGS:
+                entities[parent].rings.append(ent)
+            else:
+                entities[parent].ring_containers[LEVELS[location - GOAL_RINGS]].rings.append(ent)
+
+        return cls(
+            (PlatformState(red_state), PlatformState(blue_state)),
+            tuple(tuple(ent_lst) for ent_lst in entity_lists),
+            tuple(field_counts),
+            EntityRegistry.from_entities(entities, next_id),
+            state_hash,
+        )
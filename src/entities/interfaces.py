@@ -15,6 +15,13 @@ class IScorable(ABC):
         pass
 
 
+def serializable_fields(obj) -> dict:
+    """
+    JSON default hook serializing an object's public attributes, skipping bookkeeping such as entity registries
+    """
+    return {key: value for key, value in obj.__dict__.items() if not key.startswith("_")}
+
+
 class ISerializable:
     def to_json(self):
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+        return json.dumps(self, default=serializable_fields, sort_keys=True, indent=4)
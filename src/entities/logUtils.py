@@ -0,0 +1,111 @@
+import json
+import logging
+from collections import Counter
+from typing import Dict, List, TextIO
+
+# Attribute of the summary record logged after each reset, holding the counts of spawned entities
+SPAWN_SUMMARY_ATTR = "spawns"
+
+
+class LazyLogger:
+    """
+    Handle of a named logger that only builds records for enabled levels. Messages are %-style format strings, so their
+    arguments are only formatted when a handler emits the record, and a disabled call costs a level check. Handles are
+    shared through get_lazy_logger, rather than looking the logger up on every call.
+    """
+
+    __slots__ = ("logger",)
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def is_enabled(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(level):
+            # Records name the line calling this handle, rather than this module
+            self.logger.log(level, msg, *args, stacklevel=2, **kwargs)
+
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.log(logging.DEBUG, msg, *args, stacklevel=2, **kwargs)
+
+    def info(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.log(logging.INFO, msg, *args, stacklevel=2, **kwargs)
+
+    def warning(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.log(logging.WARNING, msg, *args, stacklevel=2, **kwargs)
+
+    def error(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.log(logging.ERROR, msg, *args, stacklevel=2, **kwargs)
+
+
+_lazy_loggers: Dict[str, LazyLogger] = {}
+
+
+def get_lazy_logger(name: str) -> LazyLogger:
+    logger = _lazy_loggers.get(name)
+    if logger is None:
+        logger = _lazy_loggers[name] = LazyLogger(name)
+    return logger
+
+
+def log_spawn_summary(logger: LazyLogger, spawns: Counter) -> None:
+    """
+    Logs the entities spawned by a reset as a single INFO record, with the counts attached to the record as the
+    attribute named by SPAWN_SUMMARY_ATTR for SpawnSummaryHandler
+
+    @param spawns: Number of entities spawned by type and location, keyed "<type>@<location>"
+    """
+    if logger.is_enabled(logging.INFO):
+        logger.info(
+            "Reset spawned %d entities (%s)",
+            sum(spawns.values()),
+            ", ".join(f"{count} {key}" for key, count in sorted(spawns.items())),
+            extra={SPAWN_SUMMARY_ATTR: dict(spawns)},
+        )
+
+
+class SpawnSummaryHandler(logging.Handler):
+    """
+    Handler of the spawn summaries of resets, writing them as JSON Lines in batches, so training runs keep a summary of
+    every reset without a write per reset. Records without a spawn summary are ignored.
+
+    @param stream: Stream the summaries are written to
+    @param batch_size: Summaries buffered before they are written
+    """
+
+    def __init__(self, stream: TextIO, batch_size: int = 100):
+        super().__init__(logging.INFO)
+        self.stream = stream
+        self.batch_size = batch_size
+        self.resets = 0
+        self.__buffer: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        spawns = getattr(record, SPAWN_SUMMARY_ATTR, None)
+        if spawns is None:
+            return
+
+        self.__buffer.append(json.dumps({"reset": self.resets, "time": record.created, SPAWN_SUMMARY_ATTR: spawns}))
+        self.resets += 1
+        if len(self.__buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.__buffer:
+                self.stream.write("\n".join(self.__buffer) + "\n")
+                self.stream.flush()
+                self.__buffer.clear()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import math
+import numpy as np
 
 from .classUtils import nested_dataclass
 from .interfaces import ISerializable
@@ -24,6 +25,48 @@ class Pose2D(ISerializable):
         return math.sqrt(x_dist + y_dist)
 
 
+class Pose2DArray:
+    """
+    A batch of positions within a 2D coordinate frame, stored as parallel NumPy arrays. Indexing returns a Pose2D for a
+    single position or a Pose2DArray otherwise, and operations broadcast like NumPy, so poses[:, None].distTo(others)
+    gives an N x M distance matrix.
+
+    @param x: X-Coordinates of the positions
+    @param y: Y-Coordinates of the positions
+    @param angle: Angles of the positions, in radians, mapping to a unit circle
+    """
+    def __init__(self, x, y, angle=0):
+        self.x, self.y, self.angle = (
+            np.array(arr, dtype=float) for arr in np.broadcast_arrays(x, y, angle)
+        )
+
+    @classmethod
+    def from_poses(cls, poses: list[Pose2D]) -> Pose2DArray:
+        return cls(
+            [pose.x for pose in poses],
+            [pose.y for pose in poses],
+            [pose.angle for pose in poses],
+        )
+
+    @property
+    def shape(self) -> tuple:
+        return self.x.shape
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, idx) -> Pose2D | Pose2DArray:
+        x, y, angle = self.x[idx], self.y[idx], self.angle[idx]
+        if np.ndim(x) == 0:
+            return Pose2D(float(x), float(y), float(angle))
+        return Pose2DArray(x, y, angle)
+
+    def distTo(self, pose: Pose2D | Pose2DArray) -> np.ndarray:
+        x_dist = (pose.x - self.x) ** 2
+        y_dist = (pose.y - self.y) ** 2
+        return np.sqrt(x_dist + y_dist)
+
+
 class ICollisionsEnabled:
     """
     Due to bad inheritance logic, classes that implement this interface require their own instances of pose and radius to be instantiated (with the same names) for this to work.
@@ -68,3 +111,97 @@ def distance_between_entities(ent1: "ICollisionsEnabled", ent2: "ICollisionsEnab
     if dist < 0:
         dist = 0
     return dist
+
+
+def get_colliding_indices(
+    pose: Pose2D, radius: float, xs: np.ndarray, ys: np.ndarray, radii: np.ndarray
+) -> np.ndarray:
+    """
+    Batched ICollisionsEnabled.is_colliding of a circle at pose against entity circles given as center and radius
+    arrays, returning the indices of the colliding entities
+    """
+    dist = np.sqrt(((xs - pose.x) ** 2) + ((ys - pose.y) ** 2))
+    return np.flatnonzero(dist <= np.maximum(radii, radius))
+
+
+def get_entity_arrays(entities: list["ICollisionsEnabled"]) -> tuple[Pose2DArray, np.ndarray]:
+    """
+    Poses and radii of a list of entities, for the batched functions below
+    """
+    return (
+        Pose2DArray.from_poses([ent.pose for ent in entities]),
+        np.array([ent.radius for ent in entities], dtype=float),
+    )
+
+
+def distance_between_entity_arrays(
+    poses1: Pose2DArray, radii1: np.ndarray, poses2: Pose2DArray, radii2: np.ndarray
+) -> np.ndarray:
+    """
+    Batched distance_between_entities, broadcasting the first set of entities against the second
+    """
+    return np.maximum(poses1.distTo(poses2) - (radii1 + radii2), 0)
+
+
+def get_pairwise_distances(poses1: Pose2DArray, poses2: Pose2DArray = None) -> np.ndarray:
+    """
+    N x M matrix of distances between every pose in poses1 and every pose in poses2, or between every pair of poses in
+    poses1 when poses2 is omitted
+    """
+    if poses2 is None:
+        poses2 = poses1
+    return poses1[:, None].distTo(poses2[None, :])
+
+
+def get_pairwise_entity_distances(
+    poses1: Pose2DArray,
+    radii1: np.ndarray,
+    poses2: Pose2DArray = None,
+    radii2: np.ndarray = None,
+) -> np.ndarray:
+    """
+    N x M matrix of distance_between_entities for every pair of entities, or between every pair of entities in the
+    first set when the second is omitted
+    """
+    if poses2 is None:
+        poses2, radii2 = poses1, radii1
+    return distance_between_entity_arrays(
+        poses1[:, None], np.asarray(radii1)[:, None], poses2[None, :], np.asarray(radii2)[None, :]
+    )
+
+
+def get_front_points(poses: Pose2DArray, radii: np.ndarray) -> Pose2DArray:
+    """
+    Batched contact points used by ICollisionsEnabled.is_colliding_front
+    """
+    new_x = ((poses.x + radii) * np.cos(poses.angle)) - (poses.y * np.sin(poses.angle))
+    new_y = ((poses.x + radii) * np.sin(poses.angle)) - (poses.y * np.cos(poses.angle))
+    return Pose2DArray(new_x, new_y, poses.angle)
+
+
+def get_rear_points(poses: Pose2DArray, radii: np.ndarray) -> Pose2DArray:
+    """
+    Batched contact points used by ICollisionsEnabled.is_colliding_rear
+    """
+    rear_angle = poses.angle + math.pi
+    new_x = ((poses.x + radii) * np.cos(rear_angle)) - (poses.y * np.sin(rear_angle))
+    new_y = ((poses.x + radii) * np.sin(rear_angle)) - (poses.y * np.cos(rear_angle))
+    return Pose2DArray(new_x, new_y, poses.angle)
+
+
+def is_colliding_front_array(
+    poses: Pose2DArray, radii: np.ndarray, other_poses: Pose2DArray, collision_radius: float = 0.1
+) -> np.ndarray:
+    """
+    Batched ICollisionsEnabled.is_colliding_front, broadcasting the entities against the other poses
+    """
+    return other_poses.distTo(get_front_points(poses, radii)) <= collision_radius
+
+
+def is_colliding_rear_array(
+    poses: Pose2DArray, radii: np.ndarray, other_poses: Pose2DArray, collision_radius: float = 0.1
+) -> np.ndarray:
+    """
+    Batched ICollisionsEnabled.is_colliding_rear, broadcasting the entities against the other poses
+    """
+    return other_poses.distTo(get_rear_points(poses, radii)) <= collision_radius
@@ -22,16 +22,25 @@ class Platform(AbstractDataClass, IScorable, ISerializable):
     goals: List[Goal] = field(default_factory=list)
     robots: List[Robot] = field(default_factory=list)
 
-    def __get_current_score(self, color: Color):
+    def get_level_points(self, ent) -> int:
+        """
+        Points a robot or goal on the platform adds to its level score
+        """
+        if isinstance(ent, Robot):
+            return 30 if ent.color == self.color else 0
+        elif isinstance(ent, Goal):
+            return 40 if ent.color == self.color or ent.color == Color.NEUTRAL else 0
+        return 0
+
+    def get_level_score(self) -> int:
+        """
+        Score of the platform's alliance from the robots and goals on the platform, when it is level
+        """
+        return sum(self.get_level_points(ent) for ent in self.robots + self.goals)
+
+    def get_current_score(self) -> int:
         if self.state == PlatformState.LEVEL:
-            robots = list(filter(lambda rob: rob.color == color, self.robots))
-            goals = list(
-                filter(
-                    lambda goal: goal.color == color or goal.color == Color.NEUTRAL,
-                    self.goals,
-                )
-            )
-            return (30 * len(robots)) + (40 * len(goals))
+            return self.get_level_score()
         else:
             return 0
 
@@ -41,14 +50,8 @@ class RedPlatform(Platform, ISerializable):
     def __init__(self, state: PlatformState, **kwargs):
         super().__init__(Color.RED, state, **kwargs)
 
-    def get_current_score(self):
-        return self.__get_current_score(Color.RED)
-
 
 @nested_dataclass
 class BluePlatform(Platform, ISerializable):
     def __init__(self, state: PlatformState, **kwargs):
         super().__init__(Color.BLUE, state, **kwargs)
-
-    def get_current_score(self):
-        return self.__get_current_score(Color.BLUE)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+import math
+from typing import List, Tuple
+import numpy as np
+from .constants import (
+    FIELD_WIDTH_IN,
+    GOAL_RADIUS,
+    PLATFORM_LENGTH_IN,
+    PLATFORM_WIDTH_IN,
+    RING_RADIUS,
+    ROBOT_LENGTH,
+)
+from .enumerations import Color
+from .robots import HostRobot, OpposingRobot, PartnerRobot, Robot
+from .scoring_elements import Goal
+
+# Rotations precomputed for each rotating sprite, a robot's heading snaps to the nearest
+NUM_ROTATIONS = 72
+
+# Width of the legend to the right of the field, listing each robot with the goals and rings it holds
+LEGEND_WIDTH_IN = 64
+LEGEND_ROW_IN = 20
+
+# Colors as RGB, following FieldRepresentation.draw
+BACKGROUND_RGB = (255, 255, 255)
+OUTLINE_RGB = (0, 0, 0)
+RING_RGB = (128, 0, 128)
+ALLIANCE_RGB = {Color.RED: (255, 0, 0), Color.BLUE: (0, 0, 255), Color.NEUTRAL: (255, 255, 0)}
+PLATFORM_ALPHA = 0.2
+
+# Outline of the host robot, in inches
+HOST_OUTLINE_IN = 1.0
+
+# Order of the robots in the legend, as in FieldRepresentation.draw
+ROBOT_ORDER = {HostRobot: 0, PartnerRobot: 1, OpposingRobot: 2}
+
+
+def _polygon_mask(vertices: np.ndarray, scale: float, half_size: int) -> np.ndarray:
+    """
+    Mask of the pixels whose centers are inside a convex polygon, with vertices in inches about the sprite center
+    given counterclockwise in field axes
+    """
+    offsets = (np.arange(-half_size, half_size + 1) + 0.0) / scale
+    x = offsets[None, :]
+    # Image rows grow downwards while field y grows upwards
+    y = -offsets[:, None]
+
+    mask = np.ones((len(offsets), len(offsets)), dtype=bool)
+    for (x0, y0), (x1, y1) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        mask &= (x1 - x0) * (y - y0) - (y1 - y0) * (x - x0) >= 0
+    return mask
+
+
+def _regular_polygon(num_sides: int, radius: float, angle: float) -> np.ndarray:
+    angles = angle + 2 * math.pi * np.arange(num_sides) / num_sides
+    return radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+
+
+class Sprite:
+    """
+    Pixel masks of an entity, one per rotation, each drawn in a single color
+
+    @param masks: Masks of each rotation, square with an odd side so that the entity sits on the center pixel
+    @param period: Angle after which the sprite repeats
+    """
+
+    def __init__(self, masks: List[np.ndarray], period: float = 2 * math.pi):
+        self.masks = masks
+        self.period = period
+        self.half_size = masks[0].shape[0] // 2
+
+    def get_mask(self, angle: float) -> np.ndarray:
+        rotation = round((angle % self.period) / self.period * len(self.masks)) % len(self.masks)
+        return self.masks[rotation]
+
+
+def _rotated_sprite(vertex_fn, half_size: int, scale: float, period: float = 2 * math.pi) -> Sprite:
+    return Sprite(
+        [
+            _polygon_mask(vertex_fn(period * rotation / NUM_ROTATIONS), scale, half_size)
+            for rotation in range(NUM_ROTATIONS)
+        ],
+        period,
+    )
+
+
+class RasterRenderer:
+    """
+    Draws a field straight into a reusable RGB image, as a fast headless alternative to FieldRepresentation.draw for
+    recording episodes. Sprites of every entity are rasterized once, per rotation for rotating entities, and each frame
+    copies a prerendered background before stamping the sprites. The returned frame is overwritten by the next render.
+
+    @param scale: Pixels per inch
+    """
+
+    def __init__(self, scale: float = 4.0):
+        self.scale = scale
+        self.field_size = int(round(FIELD_WIDTH_IN * scale))
+        self.height = self.field_size
+        self.width = self.field_size + int(round(LEGEND_WIDTH_IN * scale))
+        self.frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.background = self.__render_background()
+
+        robot_half = int(math.ceil((ROBOT_LENGTH / math.sqrt(2) + HOST_OUTLINE_IN) * scale))
+        half_length = ROBOT_LENGTH / 2
+        self.robot_sprite = _rotated_sprite(
+            lambda angle: _regular_polygon(4, half_length * math.sqrt(2), angle + math.pi / 4), robot_half, scale
+        )
+        self.host_sprite = _rotated_sprite(
+            lambda angle: _regular_polygon(4, (half_length + HOST_OUTLINE_IN) * math.sqrt(2), angle + math.pi / 4),
+            robot_half,
+            scale,
+        )
+        self.heading_sprite = _rotated_sprite(
+            lambda angle: _regular_polygon(3, half_length / 2, angle), robot_half, scale
+        )
+        # Hexagons repeat every sixth of a turn
+        self.goal_sprite = _rotated_sprite(
+            lambda angle: _regular_polygon(6, GOAL_RADIUS, angle + math.pi / 2),
+            int(math.ceil(GOAL_RADIUS * scale)),
+            scale,
+            math.pi / 3,
+        )
+        ring_half = int(math.ceil(RING_RADIUS * scale))
+        self.ring_sprite = Sprite([_polygon_mask(_regular_polygon(16, RING_RADIUS, 0), scale, ring_half)])
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        """
+        Width and height of the frames in pixels
+        """
+        return self.width, self.height
+
+    def __to_pixel(self, x: float, y: float) -> Tuple[int, int]:
+        return (
+            int(round((x + FIELD_WIDTH_IN / 2) * self.scale)),
+            int(round((FIELD_WIDTH_IN - y) * self.scale)),
+        )
+
+    def __render_background(self) -> np.ndarray:
+        background = np.empty_like(self.frame)
+        background[:] = BACKGROUND_RGB
+
+        for color, y in [(Color.RED, 0), (Color.BLUE, FIELD_WIDTH_IN - PLATFORM_WIDTH_IN)]:
+            left, bottom = self.__to_pixel(-PLATFORM_LENGTH_IN / 2, y)
+            right, top = self.__to_pixel(PLATFORM_LENGTH_IN / 2, y + PLATFORM_WIDTH_IN)
+            region = background[top:bottom, left:right]
+            region[:] = (1 - PLATFORM_ALPHA) * region + PLATFORM_ALPHA * np.array(ALLIANCE_RGB[color])
+
+        # Separates the legend from the field
+        background[:, self.field_size] = OUTLINE_RGB
+        return background
+
+    def __stamp(self, sprite: Sprite, col: int, row: int, angle: float, rgb: Tuple[int, int, int]) -> None:
+        mask = sprite.get_mask(angle)
+        half = sprite.half_size
+
+        # Clip the sprite to the frame
+        top, left = row - half, col - half
+        row0, col0 = max(top, 0), max(left, 0)
+        row1, col1 = min(top + mask.shape[0], self.height), min(left + mask.shape[1], self.width)
+        if row0 >= row1 or col0 >= col1:
+            return
+
+        mask = mask[row0 - top : row1 - top, col0 - left : col1 - left]
+        self.frame[row0:row1, col0:col1][mask] = rgb
+
+    def __draw_robot(self, robot: Robot, col: int, row: int) -> None:
+        if isinstance(robot, HostRobot):
+            self.__stamp(self.host_sprite, col, row, robot.pose.angle, OUTLINE_RGB)
+        self.__stamp(self.robot_sprite, col, row, robot.pose.angle, ALLIANCE_RGB[robot.color])
+        self.__stamp(self.heading_sprite, col, row, robot.pose.angle, OUTLINE_RGB)
+
+    def __draw_goal(self, goal: Goal, col: int, row: int) -> None:
+        self.__stamp(self.goal_sprite, col, row, goal.pose.angle, ALLIANCE_RGB[goal.color])
+
+    def __draw_ring_counter(self, count: int, col: int, row: int) -> None:
+        # One tick per ring, as there is no text
+        tick = max(int(self.scale), 1)
+        for idx in range(count):
+            left = col + 2 * idx * tick
+            if left + tick > self.width:
+                break
+            self.frame[row - tick : row + tick, left : left + tick] = RING_RGB
+
+    def __draw_legend(self, robots: List[Robot]) -> None:
+        left = self.field_size + int(round(2 * self.robot_sprite.half_size))
+        spacing = int(round(LEGEND_ROW_IN * self.scale))
+        goal_spacing = 2 * self.goal_sprite.half_size + 2
+
+        for idx, robot in enumerate(robots):
+            row = spacing // 2 + idx * spacing
+            self.__draw_robot(robot, left, row)
+            # Rings held are ticked off beneath the robot, with its goals to the right
+            self.__draw_ring_counter(
+                len(robot.rings), left - self.robot_sprite.half_size, row + self.robot_sprite.half_size
+            )
+            col = left + self.robot_sprite.half_size + self.goal_sprite.half_size + 2
+            for goal in robot.goals:
+                self.__draw_goal(goal, col, row)
+                col += goal_spacing
+
+    def render(self, rep) -> np.ndarray:
+        """
+        Draws the field, with robots beneath goals beneath rings as in FieldRepresentation.draw
+
+        @param rep: FieldRepresentation to draw
+        @return: The (height, width, 3) uint8 RGB frame, overwritten by the next call
+        """
+        np.copyto(self.frame, self.background)
+
+        robots = sorted(
+            rep.robots + rep.red_platform.robots + rep.blue_platform.robots,
+            key=lambda robot: ROBOT_ORDER.get(type(robot), len(ROBOT_ORDER)),
+        )
+        for robot in robots:
+            self.__draw_robot(robot, *self.__to_pixel(robot.pose.x, robot.pose.y))
+
+        for goal in rep.goals + rep.red_platform.goals + rep.blue_platform.goals:
+            self.__draw_goal(goal, *self.__to_pixel(goal.pose.x, goal.pose.y))
+
+        for ring in rep.rings + rep.red_platform.rings + rep.blue_platform.rings:
+            self.__stamp(self.ring_sprite, *self.__to_pixel(ring.pose.x, ring.pose.y), 0, RING_RGB)
+
+        self.__draw_legend(robots)
+        return self.frame
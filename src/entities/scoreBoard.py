@@ -0,0 +1,74 @@
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+from .enumerations import Color
+from .scoring_elements import Goal
+
+# Holder of the goals on the field, robots hold goals under their entity id
+FIELD_HOLDER = -1
+
+
+def get_goal_scores(goal: Goal) -> Tuple[int, int]:
+    """
+    Score of a goal for the red and the blue alliance
+    """
+    return goal.get_current_score(Color.RED), goal.get_current_score(Color.BLUE)
+
+
+class ScoreBoard:
+    """
+    Running score totals of a field, kept current by FieldRepresentation as goals move, are captured, released or
+    scored on, so that totals are read in constant time instead of walking every goal and ring container. Goals are
+    tracked by entity id with their score for each alliance, summed by what holds them: the field or a robot.
+    Platforms are scored from what they hold when level, see Platform.get_level_score.
+    """
+
+    def __init__(self):
+        # Holder and alliance scores of every tracked goal
+        self.__goals: Dict[int, Tuple[int, Tuple[int, int]]] = {}
+        self.__totals: Dict[int, Tuple[int, int]] = {}
+        self.platform_points = [0, 0]
+
+    def __copy__(self) -> ScoreBoard:
+        board = ScoreBoard()
+        board.__goals = self.__goals.copy()
+        board.__totals = self.__totals.copy()
+        board.platform_points = list(self.platform_points)
+        return board
+
+    def __add_to_total(self, holder: int, scores: Tuple[int, int], sign: int) -> None:
+        red, blue = self.__totals.get(holder, (0, 0))
+        self.__totals[holder] = (red + sign * scores[0], blue + sign * scores[1])
+
+    def add_goal(self, goal_id: int, holder: int, goal: Goal) -> None:
+        """
+        Tracks a goal held by the field (FIELD_HOLDER) or by the robot of the given id
+        """
+        scores = get_goal_scores(goal)
+        self.__goals[goal_id] = (holder, scores)
+        self.__add_to_total(holder, scores, 1)
+
+    def remove_goal(self, goal_id: int) -> None:
+        holder, scores = self.__goals.pop(goal_id)
+        self.__add_to_total(holder, scores, -1)
+
+    def update_goal(self, goal_id: int, goal: Goal) -> None:
+        """
+        Rescores a goal after it moved or was scored on, doing nothing when the goal is not tracked
+        """
+        tracked = self.__goals.get(goal_id)
+        if tracked is not None:
+            self.remove_goal(goal_id)
+            self.add_goal(goal_id, tracked[0], goal)
+
+    def get_goal_score(self, goal_id: int, color: Color) -> Optional[int]:
+        """
+        Score of a tracked goal for an alliance, None when the goal is not tracked
+        """
+        tracked = self.__goals.get(goal_id)
+        return None if tracked is None else tracked[1][color]
+
+    def get_total(self, holder: int, color: Color) -> int:
+        """
+        Summed score of the goals held by the field or a robot for an alliance
+        """
+        return self.__totals.get(holder, (0, 0))[color]
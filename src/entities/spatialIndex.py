@@ -0,0 +1,219 @@
+from __future__ import annotations
+import math
+from collections import Counter, defaultdict
+from typing import Hashable, Iterable, Iterator, List, Optional, Tuple
+from .constants import SPATIAL_GRID_CELL_SIZE
+from .mathUtils import ICollisionsEnabled, Pose2D
+
+
+class SpatialGrid:
+    """
+    Uniform grid bucketing collidable entities by the cell containing their center and an optional tag. Entities are
+    tracked by identity, so callers must call update after changing an entity's pose. Queries restricted to tags only
+    visit those buckets, and only reach as far as the largest radius among them. Query results are returned in
+    insertion order.
+
+    @param cell_size: Width of a grid cell, in inches
+    @param stats: Counter the grid adds its collision_queries, proximity_queries and entities_scanned to, when given.
+        Can be set or cleared at any time, as a profiler does
+    """
+
+    def __init__(self, cell_size: float = SPATIAL_GRID_CELL_SIZE, stats: Counter = None):
+        self.cell_size = cell_size
+        self.stats = stats
+        self.__cells = defaultdict(dict)
+        self.__entries = {}
+        self.__max_radius = {}
+        self.__next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, ent: ICollisionsEnabled) -> bool:
+        return id(ent) in self.__entries
+
+    def __get_cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def __remove_from_bucket(self, key: Tuple[int, int, Hashable], ent: ICollisionsEnabled) -> None:
+        bucket = self.__cells[key]
+        del bucket[id(ent)]
+
+        if not bucket:
+            del self.__cells[key]
+
+    def get_max_radius(self, tags: Iterable[Hashable] = None) -> float:
+        if tags is None:
+            tags = self.__max_radius.keys()
+        return max((self.__max_radius.get(tag, 0.0) for tag in tags), default=0.0)
+
+    def insert(self, ent: ICollisionsEnabled, tag: Hashable = None) -> None:
+        if ent in self:
+            self.remove(ent)
+
+        key = (*self.__get_cell(ent.pose.x, ent.pose.y), tag)
+        entry = (self.__next_seq, ent)
+        self.__next_seq += 1
+
+        self.__cells[key][id(ent)] = entry
+        self.__entries[id(ent)] = (key, entry)
+        self.__max_radius[tag] = max(self.__max_radius.get(tag, 0.0), ent.radius)
+
+    def remove(self, ent: ICollisionsEnabled) -> None:
+        key, _ = self.__entries.pop(id(ent))
+        self.__remove_from_bucket(key, ent)
+
+    def update(self, ent: ICollisionsEnabled) -> None:
+        """
+        Moves an entity to the cell of its current pose, keeping its insertion order
+        """
+        key, entry = self.__entries[id(ent)]
+        new_key = (*self.__get_cell(ent.pose.x, ent.pose.y), key[2])
+
+        if new_key != key:
+            self.__remove_from_bucket(key, ent)
+            self.__cells[new_key][id(ent)] = entry
+            self.__entries[id(ent)] = (new_key, entry)
+
+    def replace(self, old: ICollisionsEnabled, new: ICollisionsEnabled) -> None:
+        """
+        Puts an entity in the place of an indexed one, keeping its cell, tag and insertion order. Used when a copy of
+        an entity takes its place, so new must share the pose of old.
+        """
+        key, (seq, _) = self.__entries.pop(id(old))
+        entry = (seq, new)
+
+        bucket = self.__cells[key]
+        del bucket[id(old)]
+        bucket[id(new)] = entry
+        self.__entries[id(new)] = (key, entry)
+
+    def __get_candidates(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float,
+        tags: Optional[Iterable[Hashable]],
+        exclude: Optional[ICollisionsEnabled],
+    ) -> Iterator[Tuple[int, ICollisionsEnabled]]:
+        min_cx, min_cy = self.__get_cell(min_x, min_y)
+        max_cx, max_cy = self.__get_cell(max_x, max_y)
+        stats = self.stats
+
+        if tags is None:
+            tags = list(self.__max_radius.keys())
+
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for tag in tags:
+                    bucket = self.__cells.get((cx, cy, tag))
+                    if not bucket:
+                        continue
+
+                    if stats is not None:
+                        stats["entities_scanned"] += len(bucket)
+                    for seq, ent in bucket.values():
+                        if ent is not exclude:
+                            yield seq, ent
+
+    def get_within(
+        self,
+        pose: Pose2D,
+        distance: float,
+        radius: float = 0.0,
+        tags: Iterable[Hashable] = None,
+        exclude: ICollisionsEnabled = None,
+    ) -> List[ICollisionsEnabled]:
+        """
+        Entities whose edge is within distance of the edge of a circle at pose, matching distance_between_entities
+        """
+        if self.stats is not None:
+            self.stats["proximity_queries"] += 1
+        reach = distance + radius + self.get_max_radius(tags)
+        found = []
+
+        for seq, ent in self.__get_candidates(
+            pose.x - reach, pose.y - reach, pose.x + reach, pose.y + reach, tags, exclude
+        ):
+            dist = math.sqrt(((ent.pose.x - pose.x) ** 2) + ((ent.pose.y - pose.y) ** 2))
+            if max(dist - (ent.radius + radius), 0) <= distance:
+                found.append((seq, ent))
+
+        return [ent for _, ent in sorted(found, key=lambda item: item[0])]
+
+    def get_colliding(
+        self,
+        pose: Pose2D,
+        radius: float,
+        tags: Iterable[Hashable] = None,
+        exclude: ICollisionsEnabled = None,
+    ) -> List[ICollisionsEnabled]:
+        """
+        Entities colliding with a circle at pose, matching ICollisionsEnabled.is_colliding
+        """
+        if self.stats is not None:
+            self.stats["collision_queries"] += 1
+        reach = max(radius, self.get_max_radius(tags))
+        found = []
+
+        for seq, ent in self.__get_candidates(
+            pose.x - reach, pose.y - reach, pose.x + reach, pose.y + reach, tags, exclude
+        ):
+            dist = math.sqrt(((ent.pose.x - pose.x) ** 2) + ((ent.pose.y - pose.y) ** 2))
+            if dist <= max(ent.radius, radius):
+                found.append((seq, ent))
+
+        return [ent for _, ent in sorted(found, key=lambda item: item[0])]
+
+    def get_first_collider(
+        self,
+        start: Pose2D,
+        end: Pose2D,
+        radius: float,
+        tags: Iterable[Hashable] = None,
+        exclude: ICollisionsEnabled = None,
+    ) -> Tuple[Optional[ICollisionsEnabled], float]:
+        """
+        Sweeps a circle from start to end, returning the first entity it collides with and the fraction of the move
+        completed at contact, or (None, 1.0) when the path is clear. Entities already colliding at start have a
+        fraction of 0.
+        """
+        reach = max(radius, self.get_max_radius(tags))
+        dx = end.x - start.x
+        dy = end.y - start.y
+        a = (dx ** 2) + (dy ** 2)
+
+        first = (None, math.inf, math.inf)
+        for seq, ent in self.__get_candidates(
+            min(start.x, end.x) - reach,
+            min(start.y, end.y) - reach,
+            max(start.x, end.x) + reach,
+            max(start.y, end.y) + reach,
+            tags,
+            exclude,
+        ):
+            # Solve |start + t * (end - start) - center| = collision radius for the earliest t in [0, 1]
+            fx = start.x - ent.pose.x
+            fy = start.y - ent.pose.y
+            c = (fx ** 2) + (fy ** 2) - (max(ent.radius, radius) ** 2)
+
+            if c <= 0:
+                t = 0.0
+            elif a == 0:
+                continue
+            else:
+                b = 2 * ((fx * dx) + (fy * dy))
+                disc = (b ** 2) - (4 * a * c)
+                if disc < 0:
+                    continue
+                t = (-b - math.sqrt(disc)) / (2 * a)
+                if t < 0 or t > 1:
+                    continue
+
+            if (t, seq) < (first[1], first[2]):
+                first = (ent, t, seq)
+
+        if first[0] is None:
+            return None, 1.0
+        return first[0], first[1]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+from functools import lru_cache
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def get_chain_survival(percentage: float, discount: float, limit: int) -> np.ndarray:
+    """
+    Chance of a spawn chain growing past k entities, for k from 1 to limit - 1. The first entity always spawns and
+    each additional entity k spawns with a chance of percentage * discount ** k, so a chain stops at its first miss.
+    """
+    survival = np.cumprod(percentage * (discount ** np.arange(1, max(limit, 1))))
+    survival.flags.writeable = False
+    return survival
+
+
+def get_chain_length_probabilities(percentage: float, discount: float, limit: int) -> np.ndarray:
+    """
+    Chance of a spawn chain having each length from 1 to limit, see get_chain_survival
+    """
+    survival = np.concatenate([[1.0], get_chain_survival(percentage, discount, limit), [0.0]])
+    return survival[:-1] - survival[1:]
+
+
+def sample_chain_length(
+    rng: np.random.Generator, percentage: float, discount: float, limit: int
+) -> int:
+    """
+    Draws the length of a spawn chain with a single uniform draw, by inverting the distribution of
+    get_chain_survival. Chains never exceed limit, and are empty when limit is not positive.
+    """
+    if limit <= 0:
+        return 0
+    return 1 + int(np.count_nonzero(get_chain_survival(percentage, discount, limit) > rng.random()))
@@ -0,0 +1,130 @@
+from __future__ import annotations
+import math
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+from .constants import (
+    FIELD_WIDTH_IN,
+    GOAL_RADIUS,
+    PLATFORM_LENGTH_IN,
+    PLATFORM_WIDTH_IN,
+    RING_RADIUS,
+    ROBOT_RADIUS,
+)
+
+# Number of cached candidate cells tried before the candidates of a radius are rebuilt
+SPAWN_SAMPLE_TRIES = 8
+
+# Number of uniform draws taken from the generator at once
+SPAWN_DRAW_BUFFER = 256
+
+# Largest radius of a spawned entity, bounding how far a placement affects the clearance map
+MAX_SPAWN_RADIUS = max(GOAL_RADIUS, RING_RADIUS, ROBOT_RADIUS)
+
+
+def get_ramp_mask() -> np.ndarray:
+    """
+    Cells of the (y, x) spawn grid under the two ramps, where nothing spawns on the field
+    """
+    mask = np.zeros((FIELD_WIDTH_IN + 1, FIELD_WIDTH_IN + 1), dtype=bool)
+
+    mid_field = int(FIELD_WIDTH_IN / 2)
+    ramp_x = slice(mid_field - int(PLATFORM_LENGTH_IN / 2), mid_field + int(PLATFORM_LENGTH_IN / 2))
+    mask[: PLATFORM_WIDTH_IN + 1, ramp_x] = True
+    mask[FIELD_WIDTH_IN - PLATFORM_WIDTH_IN :, ramp_x] = True
+
+    return mask
+
+
+RAMP_MASK = get_ramp_mask()
+RAMP_MASK.flags.writeable = False
+
+
+@lru_cache(maxsize=None)
+def get_clearance_kernel(radius: float) -> np.ndarray:
+    """
+    Distance from each cell around an entity of the given radius to its edge, as far as the entity can affect the
+    clearance of a spawn. The entity's center is the middle cell.
+    """
+    reach = math.ceil(radius + MAX_SPAWN_RADIUS) + 1
+    offsets = np.arange(-reach, reach + 1)
+    kernel = np.hypot(offsets, offsets[:, None]) - radius
+    kernel.flags.writeable = False
+    return kernel
+
+
+class SpawnPlacer:
+    """
+    Samples spawn cells on the (y, x) spawn grid so that spawned entities never overlap, given their radii. A clearance
+    map holds the distance from every cell to the edge of the nearest placed entity, so a cell is free for an entity
+    when its clearance exceeds the entity's radius. Placing an entity only updates the cells within reach of it.
+
+    Cells are drawn uniformly from a cached list of the cells free for each radius, skipping the ones taken since.
+    When several draws in a row are taken the list is rebuilt, after which every cached cell is free, so sampling
+    takes a bounded number of draws. Uniform draws are taken from the generator in bulk.
+
+    @param rng: Generator to draw cells from
+    @param blocked: Cells where nothing may spawn, defaults to the ramps
+    """
+
+    def __init__(self, rng: np.random.Generator, blocked: np.ndarray = RAMP_MASK):
+        self.rng = rng
+        self.clearance = np.where(blocked, -np.inf, np.inf)
+        self.__candidates = {}
+        self.__draws = []
+
+    def __draw(self) -> float:
+        if not self.__draws:
+            # Popped from the end, so reversed to use the draws in order
+            self.__draws = self.rng.random(SPAWN_DRAW_BUFFER).tolist()[::-1]
+        return self.__draws.pop()
+
+    def __get_candidates(self, radius: float) -> np.ndarray:
+        candidates = self.__candidates.get(radius)
+        if candidates is None:
+            candidates = np.flatnonzero(self.clearance.ravel() > radius)
+            self.__candidates[radius] = candidates
+        return candidates
+
+    def sample(self, radius: float) -> Tuple[int, int]:
+        """
+        Draws a cell free for an entity of the given radius, uniformly among the free cells. Returns the (x, y) cell.
+        """
+        clearance = self.clearance.ravel()
+        for _ in range(2):
+            candidates = self.__get_candidates(radius)
+            if len(candidates) == 0:
+                break
+
+            for _ in range(SPAWN_SAMPLE_TRIES):
+                cell = int(candidates[int(self.__draw() * len(candidates))])
+                if clearance[cell] > radius:
+                    y, x = divmod(cell, self.clearance.shape[1])
+                    return x, y
+
+            # Most cached cells are taken, rebuilding the list makes every cached cell free again
+            del self.__candidates[radius]
+
+        raise ValueError(f"No free cell left to spawn an entity of radius {radius}")
+
+    def place(self, x: int, y: int, radius: float) -> None:
+        """
+        Marks an entity of the given radius centered on the (x, y) cell
+        """
+        kernel = get_clearance_kernel(radius)
+        reach = kernel.shape[0] // 2
+        height, width = self.clearance.shape
+        x0, x1 = max(x - reach, 0), min(x + reach + 1, width)
+        y0, y1 = max(y - reach, 0), min(y + reach + 1, height)
+
+        patch = self.clearance[y0:y1, x0:x1]
+        np.minimum(
+            patch,
+            kernel[y0 - y + reach : y1 - y + reach, x0 - x + reach : x1 - x + reach],
+            out=patch,
+        )
+
+    def sample_and_place(self, radius: float) -> Tuple[int, int]:
+        x, y = self.sample(radius)
+        self.place(x, y, radius)
+        return x, y
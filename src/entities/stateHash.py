@@ -0,0 +1,53 @@
+from __future__ import annotations
+from .platforms import PlatformState
+
+MASK_64 = (1 << 64) - 1
+
+# Tags keeping the keys of each kind of feature apart
+STATE_FEATURE = 0
+LOCATION_FEATURE = 1
+PLATFORM_FEATURE = 2
+
+
+def mix_64(value: int) -> int:
+    """
+    SplitMix64 finalizer, spreading a hash over all 64 bits so that keys can be combined with XOR
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def get_state_key(record: tuple) -> int:
+    """
+    Zobrist key of the pose and state of an entity, given its record (see fieldSnapshot.get_entity_record)
+    """
+    ent_id, kind, _, _, color, tipped, capacity, x, y, angle = record
+    return mix_64(hash((STATE_FEATURE, ent_id, kind, color, tipped, capacity, x, y, angle)))
+
+
+def get_location_key(ent_id: int, location: int, parent: int) -> int:
+    """
+    Zobrist key of where an entity is, in a list of the field or a platform, held by a robot or scored on a goal
+    """
+    return mix_64(hash((LOCATION_FEATURE, ent_id, location, parent)))
+
+
+def get_record_key(record: tuple) -> int:
+    return get_state_key(record) ^ get_location_key(record[0], record[2], record[3])
+
+
+def get_platform_key(platform_idx: int, state: PlatformState) -> int:
+    return mix_64(hash((PLATFORM_FEATURE, platform_idx, int(state))))
+
+
+def get_field_hash(platform_states, records) -> int:
+    """
+    State hash of a field from its platform states and the records of its entities, see
+    FieldRepresentation.get_state_hash
+    """
+    state_hash = get_platform_key(0, platform_states[0]) ^ get_platform_key(1, platform_states[1])
+    for record in records:
+        state_hash ^= get_record_key(record)
+    return state_hash
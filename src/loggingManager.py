@@ -4,23 +4,37 @@ from entities.constants import (
     REPRESENTATION_LOGGER_NAME,
     SIMULATION_LOGGER_NAME,
 )
+from entities.logUtils import SpawnSummaryHandler
 
 
-def configure_loggers() -> None:
+def configure_loggers(level: int = logging.INFO, spawn_summary_path: str = None) -> None:
+    """
+    Logs the parser, representation and simulation loggers to stderr
+
+    @param level: Level of the loggers. Each spawn of a reset is logged at DEBUG, and a summary of the reset at INFO
+    @param spawn_summary_path: JSON Lines file the spawn summary of every reset is appended to in batches, for
+        training runs that log at WARNING or above to stderr
+    """
     formatter = logging.Formatter("[%(created)f] | [%(levelname)s] | %(filename)s:%(lineno)d | %(message)s")
 
     parser_logger = logging.getLogger(PARSER_LOGGER_NAME)
-    parser_logger.setLevel(logging.DEBUG)
+    parser_logger.setLevel(level)
 
     representation_logger = logging.getLogger(REPRESENTATION_LOGGER_NAME)
-    representation_logger.setLevel(logging.DEBUG)
+    representation_logger.setLevel(level)
 
     simulation_logger = logging.getLogger(SIMULATION_LOGGER_NAME)
-    simulation_logger.setLevel(logging.DEBUG)
+    simulation_logger.setLevel(level)
 
     sh = logging.StreamHandler()
     sh.setFormatter(formatter)
 
     parser_logger.addHandler(sh)
     representation_logger.addHandler(sh)
-    simulation_logger.addHandler(sh)
\ No newline at end of file
+    simulation_logger.addHandler(sh)
+
+    if spawn_summary_path is not None:
+        # Summaries reach the file even when stderr only shows records of a higher level
+        sh.setLevel(level)
+        representation_logger.setLevel(min(level, logging.INFO))
+        representation_logger.addHandler(SpawnSummaryHandler(open(spawn_summary_path, "a")))
@@ -1,10 +1,13 @@
-from logging import getLogger
-from typing import List, Tuple
-from ..entities.constants import PARSER_LOGGER_NAME
-from ..entities.enumerations import Color, GoalLevel
+import logging
+from typing import Dict, List, Optional, Tuple, Type
+from ..entities.constants import GOAL_RADIUS, PARSER_LOGGER_NAME, RING_RADIUS, ROBOT_RADIUS
+from ..entities.enumerations import Color, EntityKind, GoalLevel
+from ..entities.fieldArrays import LEVELS, NO_OWNER, NO_PLATFORM, ArrayFieldRepresentation
 from ..entities.fieldRepresentation import FieldCounts, FieldRepresentation
+from ..entities.fieldSnapshot import CLASS_KINDS
+from ..entities.logUtils import get_lazy_logger
 from ..entities.mathUtils import Pose2D
-from ..entities.platforms import BluePlatform, Platform, RedPlatform
+from ..entities.platforms import BluePlatform, Platform, PlatformState, RedPlatform
 from ..entities.robots import HostRobot, OpposingRobot, PartnerRobot, Robot, RobotID
 from ..entities.scoring_elements import (
     BlueGoal,
@@ -16,203 +19,233 @@ from ..entities.scoring_elements import (
     RingContainer,
 )
 
+# Ring containers are keyed by level value, as written by as_json, or by level name
+LEVEL_KEYS = {
+    **{str(level.value): level for level in GoalLevel},
+    **{level.name: level for level in GoalLevel},
+}
 
-class FieldParser:
-    def __init__(self):
-        self.field_counts = FieldCounts()
-
-    def __parse_position(self, position_dict: dict) -> Pose2D:
-        x = position_dict["x"]
-        y = position_dict["y"]
-        angle = position_dict["angle"]
-        return Pose2D(x, y, angle)
+_log = get_lazy_logger(PARSER_LOGGER_NAME)
 
-    def __parse_rings(self, ring_dict: dict) -> List[Ring]:
-        rings = []
-        for ring in ring_dict:
-            pose = self.__parse_position(ring["position"])
-            rings.append(Ring(pose))
-            self.field_counts.rings += 1
+ROBOT_CLASSES = {RobotID.SELF: HostRobot, RobotID.PARTNER: PartnerRobot, RobotID.OPPOSING: OpposingRobot}
 
-        getLogger(PARSER_LOGGER_NAME).info(f"Rings parsed (Total: {len(rings)})")
+# Levels and capacities of the ring containers each goal class starts with, in order
+_goal_layouts: Dict[Type[Goal], List[Tuple[GoalLevel, int]]] = {}
 
-        return rings
 
-    def __parse_ring_container(self, ring_container_dict: dict) -> RingContainer:
-        max_storage = ring_container_dict["max_storage"]
+def _get_goal_layout(cls: Type[Goal]) -> List[Tuple[GoalLevel, int]]:
+    layout = _goal_layouts.get(cls)
+    if layout is None:
+        goal = cls(Pose2D(0, 0))
+        layout = [(level, container.max_storage) for level, container in goal.ring_containers.items()]
+        _goal_layouts[cls] = layout
+    return layout
 
-        rings = self.__parse_rings(ring_container_dict["rings"])
 
-        getLogger(PARSER_LOGGER_NAME).info(
-            f"Ring container parsed (Total: {len(rings)}, Max: {max_storage}"
-        )
+class FieldParser:
+    """
+    Parses fields from the dictionaries of their JSON, in the layout written by FieldRepresentation.as_json. Poses
+    under "position" and ring containers keyed by level name are also accepted. Entities are built in a single pass
+    without logging, with one summary logged per field.
+    """
 
-        return RingContainer(max_storage, rings)
+    def __init__(self):
+        self.field_counts = FieldCounts()
 
-    def __parse_ring_containers(
-        self, ring_containers_dict: dict
-    ) -> dict[GoalLevel, RingContainer]:
-        ring_containers = dict()
+    @staticmethod
+    def __parse_pose(ent_dict: dict) -> Pose2D:
+        pose = ent_dict["pose"] if "pose" in ent_dict else ent_dict["position"]
+        return Pose2D(pose["x"], pose["y"], pose.get("angle", 0))
 
-        base_ring_container = ring_containers_dict.get("BASE")
+    @staticmethod
+    def __get_goal_class(goal_dict: dict) -> Type[Goal]:
+        color = goal_dict["color"]
+        if color == Color.RED:
+            return RedGoal
+        elif color == Color.BLUE:
+            return BlueGoal
+        elif goal_dict.get("level") == GoalLevel.HIGH:
+            return HighNeutralGoal
+        return LowNeutralGoal
+
+    @staticmethod
+    def __iter_containers(goal_dict: dict):
+        for key, container in goal_dict.get("ring_containers", {}).items():
+            yield LEVEL_KEYS[key], container
+
+    @staticmethod
+    def __get_robot_rings(robot_dict: dict) -> list:
+        rings = robot_dict.get("rings", [])
+        # Rings held by robots were once written as ring containers
+        if isinstance(rings, dict):
+            return [ring for container in rings.values() for ring in container["rings"]]
+        return rings
 
-        if base_ring_container:
-            ring_containers[GoalLevel.BASE] = self.__parse_ring_container(
-                base_ring_container
-            )
-            getLogger(PARSER_LOGGER_NAME).info("Ring container at level BASE parsed")
-        else:
-            ring_containers[GoalLevel.BASE] = RingContainer()
-            getLogger(PARSER_LOGGER_NAME).info(
-                "Ring container at level BASE not found, populating empty"
-            )
+    def __parse_rings(self, ring_dicts: list) -> List[Ring]:
+        self.field_counts.rings += len(ring_dicts)
+        return [Ring(self.__parse_pose(ring)) for ring in ring_dicts]
 
-        low_ring_container = ring_containers_dict.get("LOW")
+    def __parse_goal(self, goal_dict: dict) -> Goal:
+        cls = self.__get_goal_class(goal_dict)
+        goal = cls(self.__parse_pose(goal_dict), tipped=goal_dict.get("tipped", False))
 
-        if low_ring_container:
-            ring_containers[GoalLevel.LOW] = self.__parse_ring_container(
-                low_ring_container
-            )
-            getLogger(PARSER_LOGGER_NAME).info("Ring container at level LOW parsed")
-        else:
-            ring_containers[GoalLevel.LOW] = RingContainer()
-            getLogger(PARSER_LOGGER_NAME).info(
-                "Ring container at level LOW not found, populating empty"
+        # Containers missing from the JSON keep the defaults of the goal's class
+        for level, container in self.__iter_containers(goal_dict):
+            goal.ring_containers[level] = RingContainer(
+                container["max_storage"], self.__parse_rings(container["rings"])
             )
 
-        high_ring_container = ring_containers_dict.get("HIGH")
-
-        if high_ring_container:
-            ring_containers[GoalLevel.HIGH] = self.__parse_ring_container(
-                high_ring_container
-            )
-            getLogger(PARSER_LOGGER_NAME).info("Ring container at level HIGH parsed")
+        if cls is RedGoal:
+            self.field_counts.red_goals += 1
+        elif cls is BlueGoal:
+            self.field_counts.blue_goals += 1
+        elif cls is HighNeutralGoal:
+            self.field_counts.high_neutral_goals += 1
         else:
-            ring_containers[GoalLevel.HIGH] = RingContainer()
-            getLogger(PARSER_LOGGER_NAME).info(
-                "Ring container at level HIGH not found, populating empty"
-            )
-
-        return ring_containers
-
-    def __parse_goals(self, goal_dict: dict) -> List[Goal]:
-        goals = []
-
-        for goal in goal_dict:
-            color = goal["color"]
-            level = goal["level"]
-
-            pose = self.__parse_position(goal["position"])
-
-            ring_containers = self.__parse_ring_containers(goal["ring_containers"])
-
-            tipped = goal["tipped"]
-
-            if color == Color.RED:
-                goals.append(
-                    RedGoal(pose, ring_containers=ring_containers, tipped=tipped)
-                )
-                self.field_counts.red_goals += 1
-                getLogger(PARSER_LOGGER_NAME).info(f"Red goal parsed")
-            elif color == Color.BLUE:
-                goals.append(
-                    BlueGoal(pose, ring_containers=ring_containers, tipped=tipped)
-                )
-                self.field_counts.blue_goals += 1
-                getLogger(PARSER_LOGGER_NAME).info(f"Blue goal parsed")
-            elif color == Color.NEUTRAL and level == GoalLevel.LOW:
-                goals.append(
-                    LowNeutralGoal(pose, ring_containers=ring_containers, tipped=tipped)
-                )
-                self.field_counts.low_neutral_goals += 1
-                getLogger(PARSER_LOGGER_NAME).info(f"Low neutral goal parsed")
-            elif color == Color.NEUTRAL and level == GoalLevel.HIGH:
-                goals.append(
-                    HighNeutralGoal(
-                        pose, ring_containers=ring_containers, tipped=tipped
-                    )
-                )
-                self.field_counts.high_neutral_goals += 1
-                getLogger(PARSER_LOGGER_NAME).info(f"High neutral goal parsed")
-
-        getLogger(PARSER_LOGGER_NAME).info(f"Goals parsed (Total: {len(goals)})")
-        return goals
-
-    def __parse_robots(self, robots_dict: dict) -> Robot:
-        robots = []
-        for robot in robots_dict:
-            color = robot["color"]
-
-            id = robot["id"]
-
-            pose = self.__parse_position(robot["position"])
-
-            rings = self.__parse_ring_containers(robot["rings"])
-
-            goals = self.__parse_goals(robot["goals"])
-
-            tipped = robot["tipped"]
-
-            if id == RobotID.SELF:
-                robots.append(
-                    HostRobot(color, pose, rings=rings, goals=goals, tipped=tipped)
-                )
-                self.field_counts.host_robots += 1
-                getLogger(PARSER_LOGGER_NAME).info("Host robot parsed")
-            elif id == RobotID.PARTNER:
-                robots.append(
-                    PartnerRobot(color, pose, rings=rings, goals=goals, tipped=tipped)
-                )
-                self.field_counts.partner_robots += 1
-                getLogger(PARSER_LOGGER_NAME).info("Partner robot parsed")
-            else:
-                robots.append(
-                    OpposingRobot(color, pose, rings=rings, goals=goals, tipped=tipped)
-                )
-                self.field_counts.opposing_robots += 1
-                getLogger(PARSER_LOGGER_NAME).info("Opposing robot parsed")
-
-        getLogger(PARSER_LOGGER_NAME).info(f"Robots parsed (Total: {len(robots)})")
-        return robots
-
-    def __parse_platform(self, platform_dict: dict) -> Platform:
-        color = platform_dict["color"]
-
-        goals = self.__parse_goals(platform_dict["goals"])
-
-        rings = self.__parse_rings(platform_dict["rings"])
-
-        robots = self.__parse_robots(platform_dict["robots"])
-
-        state = platform_dict["state"]
+            self.field_counts.low_neutral_goals += 1
+        return goal
+
+    def __parse_robot(self, robot_dict: dict) -> Robot:
+        cls = ROBOT_CLASSES[RobotID(robot_dict["id"])]
+        robot = cls(
+            Color(robot_dict["color"]),
+            self.__parse_pose(robot_dict),
+            rings=self.__parse_rings(self.__get_robot_rings(robot_dict)),
+            goals=[self.__parse_goal(goal) for goal in robot_dict.get("goals", [])],
+            tipped=robot_dict.get("tipped", False),
+        )
 
-        if color == Color.RED:
-            getLogger(PARSER_LOGGER_NAME).info("Red platform parsed")
-            return RedPlatform(state, rings=rings, goals=goals, robots=robots)
+        if cls is HostRobot:
+            self.field_counts.host_robots += 1
+        elif cls is PartnerRobot:
+            self.field_counts.partner_robots += 1
         else:
-            getLogger(PARSER_LOGGER_NAME).info("Blue platform parsed")
-            return BluePlatform(state, rings=rings, goals=goals, robots=robots)
+            self.field_counts.opposing_robots += 1
+        return robot
+
+    def __parse_platform(self, platform_dict: dict, cls: Type[Platform]) -> Platform:
+        return cls(
+            PlatformState(platform_dict["state"]),
+            rings=self.__parse_rings(platform_dict.get("rings", [])),
+            goals=[self.__parse_goal(goal) for goal in platform_dict.get("goals", [])],
+            robots=[self.__parse_robot(robot) for robot in platform_dict.get("robots", [])],
+        )
 
-    def parse_representation(
-        self, representation: str
-    ) -> Tuple[FieldRepresentation, FieldCounts]:
+    def __get_field_counts(self, representation: dict) -> FieldCounts:
+        # Counts saved with the field take precedence over those of the parsed entities
+        if "field_counts" in representation:
+            return FieldCounts(**representation["field_counts"])
+        return self.field_counts
+
+    def parse_representation(self, representation: dict) -> FieldRepresentation:
+        """
+        @param representation: Dictionary of a field's JSON
+        @return: The field, with its entities registered in the same order as the field that was written
+        """
         self.field_counts = FieldCounts()
 
-        rings = self.__parse_rings(representation["rings"])
+        rep = FieldRepresentation(
+            red_platform=self.__parse_platform(representation["red_platform"], RedPlatform),
+            blue_platform=self.__parse_platform(representation["blue_platform"], BluePlatform),
+            rings=self.__parse_rings(representation.get("rings", [])),
+            goals=[self.__parse_goal(goal) for goal in representation.get("goals", [])],
+            robots=[self.__parse_robot(robot) for robot in representation.get("robots", [])],
+        )
+        rep.field_counts = self.__get_field_counts(representation)
+
+        counts = self.field_counts
+        _log.info(
+            "Field parsed (%d rings, %d goals, %d robots)",
+            counts.rings,
+            counts.red_goals + counts.blue_goals + counts.low_neutral_goals + counts.high_neutral_goals,
+            counts.host_robots + counts.partner_robots + counts.opposing_robots,
+        )
+        return rep
+
+    def __add_array_rings(
+        self, arrays: ArrayFieldRepresentation, ring_dicts: list, owner: int = NO_OWNER, platform: int = NO_PLATFORM
+    ) -> None:
+        for ring in ring_dicts:
+            arrays.add_entity(EntityKind.RING, self.__parse_pose(ring), RING_RADIUS, owner=owner, platform=platform)
+        self.field_counts.rings += len(ring_dicts)
+
+    def __add_array_goal(
+        self, arrays: ArrayFieldRepresentation, goal_dict: dict, owner: int = NO_OWNER, platform: int = NO_PLATFORM
+    ) -> None:
+        cls = self.__get_goal_class(goal_dict)
+        idx = arrays.add_entity(
+            CLASS_KINDS[cls],
+            self.__parse_pose(goal_dict),
+            GOAL_RADIUS,
+            Color(goal_dict["color"]),
+            goal_dict.get("tipped", False),
+            owner,
+            platform,
+        )
 
-        goals = self.__parse_goals(representation["goals"])
+        # Scored rings are counted rather than added, as ArrayFieldRepresentation.from_representation does
+        levels = [level for level, _ in _get_goal_layout(cls)]
+        for level, max_storage in _get_goal_layout(cls):
+            arrays.ring_capacity[idx, LEVELS.index(level)] = max_storage
+        for level, container in self.__iter_containers(goal_dict):
+            ldx = LEVELS.index(level)
+            arrays.ring_capacity[idx, ldx] = container["max_storage"]
+            arrays.ring_counts[idx, ldx] = len(container["rings"])
+            self.field_counts.rings += len(container["rings"])
+            if level not in levels:
+                levels.append(level)
+        arrays.place_level[idx] = LEVELS.index(levels[-1])
+
+    def __add_array_robot(self, arrays: ArrayFieldRepresentation, robot_dict: dict, platform: int = NO_PLATFORM) -> None:
+        cls = ROBOT_CLASSES[RobotID(robot_dict["id"])]
+        idx = arrays.add_entity(
+            CLASS_KINDS[cls],
+            self.__parse_pose(robot_dict),
+            ROBOT_RADIUS,
+            Color(robot_dict["color"]),
+            robot_dict.get("tipped", False),
+            platform=platform,
+        )
 
-        red_platform = self.__parse_platform(representation["red_platform"])
+        self.__add_array_rings(arrays, self.__get_robot_rings(robot_dict), owner=idx)
+        for goal in robot_dict.get("goals", []):
+            self.__add_array_goal(arrays, goal, owner=idx)
 
-        blue_platform = self.__parse_platform(representation["blue_platform"])
+    def __add_array_platform(self, arrays: ArrayFieldRepresentation, platform_dict: dict, color: Color) -> None:
+        arrays.platform_state[color] = PlatformState(platform_dict["state"])
 
-        robots = self.__parse_robots(representation["robots"])
+        self.__add_array_rings(arrays, platform_dict.get("rings", []), platform=color)
+        for goal in platform_dict.get("goals", []):
+            self.__add_array_goal(arrays, goal, platform=color)
+        for robot in platform_dict.get("robots", []):
+            self.__add_array_robot(arrays, robot, color)
 
-        return FieldRepresentation(
-            red_platform=red_platform,
-            blue_platform=blue_platform,
-            rings=rings,
-            goals=goals,
-            robots=robots,
-            field_counts=self.field_counts,
-        )
+    def parse_arrays(self, representation: dict, capacity: Optional[int] = None) -> ArrayFieldRepresentation:
+        """
+        Parses a field straight into the array backed representation, without building its entities. The result
+        matches ArrayFieldRepresentation.from_representation of the parsed field.
+
+        @param representation: Dictionary of a field's JSON
+        @param capacity: Initial number of entity rows, grown as needed
+        """
+        self.field_counts = FieldCounts()
+        arrays = ArrayFieldRepresentation() if capacity is None else ArrayFieldRepresentation(capacity)
+
+        self.__add_array_rings(arrays, representation.get("rings", []))
+        for goal in representation.get("goals", []):
+            self.__add_array_goal(arrays, goal)
+        for robot in representation.get("robots", []):
+            self.__add_array_robot(arrays, robot)
+        self.__add_array_platform(arrays, representation["red_platform"], Color.RED)
+        self.__add_array_platform(arrays, representation["blue_platform"], Color.BLUE)
+        arrays.field_counts = self.__get_field_counts(representation)
+
+        if _log.is_enabled(logging.INFO):
+            kinds = arrays.kind[: arrays.count]
+            _log.info(
+                "Field parsed (%d rings, %d goals, %d robots)",
+                self.field_counts.rings,
+                ((kinds >= EntityKind.RED_GOAL) & (kinds <= EntityKind.HIGH_NEUTRAL_GOAL)).sum(),
+                (kinds >= EntityKind.HOST_ROBOT).sum(),
+            )
+        return arrays
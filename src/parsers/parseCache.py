@@ -0,0 +1,249 @@
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from ..entities.fieldRepresentation import FieldRepresentation
+from .fieldParser import FieldParser
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "parsed")
+
+# Entries kept on disk, the least recently used are removed beyond it
+MAX_ENTRIES = 256
+
+ENTRY_EXTENSION = ".bin"
+STAMP_EXTENSION = ".stamp"
+
+# Magic, payload format, Python version the payload was written by, content hash and seconds the file took to parse
+ENTRY_HEADER = struct.Struct("<4sBBB16sd")
+ENTRY_MAGIC = b"VXPC"
+
+# Configs are stored with marshal, which only round trips within a Python version
+CONFIG_FORMAT = 1
+FIELD_FORMAT = 2
+
+# Size and modification time of a file, and the hash of the content they were last seen with
+Stamp = Tuple[int, int, str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Seconds spent on hits, and spent parsing their files when their entries were stored
+    hit_time: float = 0
+    saved_parse_time: float = 0
+    # Seconds spent parsing files on misses
+    miss_time: float = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    @property
+    def time_saved(self) -> float:
+        return self.saved_parse_time - self.hit_time
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses ({100 * self.hit_rate:.1f}% hit rate), "
+            f"{1000 * self.time_saved:.1f} ms saved ({1000 * self.hit_time:.1f} ms loading entries "
+            f"instead of {1000 * self.saved_parse_time:.1f} ms parsing)"
+        )
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _encode_config(config: Dict) -> bytes:
+    return marshal.dumps(config)
+
+
+def _decode_config(data: bytes) -> Dict:
+    return marshal.loads(data)
+
+
+def _encode_field(rep: FieldRepresentation) -> bytes:
+    return rep.to_bytes()
+
+
+def _decode_field(data: bytes) -> FieldRepresentation:
+    return FieldRepresentation.from_bytes(data)
+
+
+def _parse_field(text: bytes) -> FieldRepresentation:
+    return FieldParser().parse_representation(json.loads(text))
+
+
+class ParseCache:
+    """
+    On disk cache of parsed config and field files, shared by every process using the same directory. Files are found
+    by their path, size and modification time, and entries are stored by the hash of the file's content, so a file
+    that was touched or copied without being changed still hits. Entries are stored in a binary format that is
+    memory mapped to load, configs with marshal and fields with FieldRepresentation.to_bytes.
+
+    @param directory: Directory of the entries, created when missing
+    @param max_entries: Entries kept, the least recently loaded are removed when more are stored
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_entries: int = MAX_ENTRIES):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self.__stamps: Dict[str, Stamp] = {}
+
+    def __get_stamp_path(self, path: str) -> str:
+        return os.path.join(self.directory, _hash_bytes(path.encode()) + STAMP_EXTENSION)
+
+    def __get_entry_path(self, fmt: int, content_hash: str) -> str:
+        return os.path.join(self.directory, f"{fmt}-{content_hash}{ENTRY_EXTENSION}")
+
+    def __read_stamp(self, path: str) -> Optional[Stamp]:
+        stamp = self.__stamps.get(path)
+        if stamp is None:
+            try:
+                with open(self.__get_stamp_path(path)) as file:
+                    size, mtime, content_hash = file.read().split()
+                stamp = (int(size), int(mtime), content_hash)
+            except (OSError, ValueError):
+                return None
+            self.__stamps[path] = stamp
+        return stamp
+
+    def __write_stamp(self, path: str, stamp: Stamp) -> None:
+        self.__stamps[path] = stamp
+        self.__write_atomic(self.__get_stamp_path(path), " ".join(map(str, stamp)).encode())
+
+    @staticmethod
+    def __write_atomic(path: str, data: bytes) -> None:
+        # Written aside and renamed, so other processes never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def __load_entry(self, fmt: int, content_hash: str, decode: Callable[[bytes], object]):
+        entry_path = self.__get_entry_path(fmt, content_hash)
+        try:
+            with open(entry_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, entry_fmt, major, minor, _, parse_time = ENTRY_HEADER.unpack_from(mm)
+                if magic != ENTRY_MAGIC or entry_fmt != fmt or (major, minor) != sys.version_info[:2]:
+                    return None, 0
+                # Sliced out of the map, so no view of it outlives the entry's file
+                value = decode(mm[ENTRY_HEADER.size :])
+        except (OSError, ValueError, EOFError, struct.error):
+            return None, 0
+
+        # The modification time of an entry orders the entries by when they were last loaded
+        os.utime(entry_path)
+        return value, parse_time
+
+    def __store_entry(self, fmt: int, content_hash: str, payload: bytes, parse_time: float) -> None:
+        header = ENTRY_HEADER.pack(
+            ENTRY_MAGIC, fmt, *sys.version_info[:2], bytes.fromhex(content_hash), parse_time
+        )
+        self.__write_atomic(self.__get_entry_path(fmt, content_hash), header + payload)
+        self.__evict()
+
+    def __evict(self) -> None:
+        entries = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(ENTRY_EXTENSION)
+        ]
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=os.path.getmtime)
+        for entry_path in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+
+    def __load(
+        self,
+        path: str,
+        fmt: int,
+        parse: Callable[[bytes], object],
+        encode: Callable[[object], bytes],
+        decode: Callable[[bytes], object],
+    ):
+        start = time.perf_counter()
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+        stamp = self.__read_stamp(path)
+
+        text = None
+        if stamp is None or stamp[:2] != (stat.st_size, stat.st_mtime_ns):
+            # The file changed since it was last seen, or was never seen, so its content decides
+            with open(path, "rb") as file:
+                text = file.read()
+            stamp = (stat.st_size, stat.st_mtime_ns, _hash_bytes(text))
+            self.__write_stamp(path, stamp)
+
+        value, parse_time = self.__load_entry(fmt, stamp[2], decode)
+        if value is not None:
+            self.stats.hits += 1
+            self.stats.hit_time += time.perf_counter() - start
+            self.stats.saved_parse_time += parse_time
+            return value
+
+        if text is None:
+            with open(path, "rb") as file:
+                text = file.read()
+        start = time.perf_counter()
+        value = parse(text)
+        parse_time = time.perf_counter() - start
+
+        self.stats.misses += 1
+        self.stats.miss_time += parse_time
+        self.__store_entry(fmt, stamp[2], encode(value), parse_time)
+        return value
+
+    def load_config(self, path: str) -> Dict:
+        """
+        @return: The JSON of a config file, as dict_config_parser reads it
+        """
+        return self.__load(path, CONFIG_FORMAT, json.loads, _encode_config, _decode_config)
+
+    def load_field(self, path: str) -> FieldRepresentation:
+        """
+        @return: The field of a JSON file parsed by FieldParser, a new field on each call
+        """
+        return self.__load(path, FIELD_FORMAT, _parse_field, _encode_field, _decode_field)
+
+    def invalidate(self, path: str) -> None:
+        """
+        Forgets a file, which is parsed again on its next load. Entries for the same content loaded through other
+        paths are removed as well.
+        """
+        path = os.path.realpath(path)
+        stamp = self.__read_stamp(path)
+        self.__stamps.pop(path, None)
+
+        paths = [self.__get_stamp_path(path)]
+        if stamp is not None:
+            paths += [self.__get_entry_path(fmt, stamp[2]) for fmt in (CONFIG_FORMAT, FIELD_FORMAT)]
+        for cache_path in paths:
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Removes every entry of the cache directory
+        """
+        self.__stamps.clear()
+        for name in os.listdir(self.directory):
+            if name.endswith((ENTRY_EXTENSION, STAMP_EXTENSION)):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,106 @@
+import json
+import os
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, Union
+from ..entities.fieldArrays import ArrayFieldRepresentation
+from ..entities.fieldRepresentation import FieldRepresentation
+from .fieldParser import FieldParser
+
+SCENARIO_EXTENSIONS = (".json", ".jsonl")
+
+# Scenarios handed to a worker at a time
+CHUNK_SIZE = 64
+
+Scenario = Union[FieldRepresentation, ArrayFieldRepresentation]
+
+
+def _iter_file_texts(path: str) -> Iterator[str]:
+    if path.endswith(".jsonl"):
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    yield line
+    else:
+        with open(path) as file:
+            yield file.read()
+
+
+def iter_scenario_texts(source: str) -> Iterator[str]:
+    """
+    Streams the JSON of each scenario of a corpus without parsing it, reading JSON Lines files a line at a time
+
+    @param source: JSON Lines file of one field per line, JSON file of a single field, or directory of such files,
+        read in name order
+    """
+    if not os.path.isdir(source):
+        yield from _iter_file_texts(source)
+        return
+
+    for name in sorted(os.listdir(source)):
+        if name.endswith(SCENARIO_EXTENSIONS):
+            yield from _iter_file_texts(os.path.join(source, name))
+
+
+def parse_scenario(text: str, arrays: bool = False) -> Scenario:
+    """
+    @param text: JSON of a field, as written by FieldRepresentation.as_json
+    @param arrays: Parse into an ArrayFieldRepresentation rather than entities
+    """
+    parser = FieldParser()
+    if arrays:
+        return parser.parse_arrays(json.loads(text))
+    return parser.parse_representation(json.loads(text))
+
+
+def _parse_in_worker(text: str, arrays: bool) -> Union[bytes, ArrayFieldRepresentation]:
+    # Entities are registered by id in their field, so fields cross processes in their binary encoding instead
+    scenario = parse_scenario(text, arrays)
+    return scenario if arrays else scenario.to_bytes()
+
+
+def _iter_chunks(texts: Iterable[str], size: int) -> Iterator[list]:
+    texts = iter(texts)
+    chunk = list(islice(texts, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(texts, size))
+
+
+def load_scenarios(
+    source: str, arrays: bool = False, workers: int = 0, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Scenario]:
+    """
+    Lazily parses the scenarios of a corpus in order, only reading as far ahead as the scenarios being parsed, so
+    corpora larger than memory can be iterated
+
+    @param source: See iter_scenario_texts
+    @param arrays: Yield ArrayFieldRepresentation rather than FieldRepresentation
+    @param workers: Processes parsing scenarios in parallel, or 0 to parse them in this process
+    @param chunk_size: Scenarios read and parsed at a time by the workers
+    """
+    texts = iter_scenario_texts(source)
+    if workers <= 0:
+        for text in texts:
+            yield parse_scenario(text, arrays)
+        return
+
+    with Pool(workers) as pool:
+        for chunk in _iter_chunks(texts, chunk_size * workers):
+            results = pool.starmap(_parse_in_worker, [(text, arrays) for text in chunk], chunk_size)
+            for result in results:
+                yield result if arrays else FieldRepresentation.from_bytes(result)
+
+
+def write_scenarios(path: str, reps: Iterable[FieldRepresentation]) -> int:
+    """
+    Writes fields to a JSON Lines file, read back by load_scenarios
+
+    @return: Number of fields written
+    """
+    count = 0
+    with open(path, "w") as file:
+        for rep in reps:
+            file.write(json.dumps(json.loads(rep.as_json()), separators=(",", ":")) + "\n")
+            count += 1
+    return count
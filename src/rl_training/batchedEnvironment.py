@@ -0,0 +1,269 @@
+import math
+from typing import Any, List, Type
+import gym
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import (
+    VecEnv,
+    VecEnvIndices,
+    VecEnvStepReturn,
+)
+from entities.constants import FIELD_WIDTH_IN
+from entities.enumerations import Color, EntityKind, ObservationMode
+from entities.fieldArrays import KIND_IS_GOAL, NO_OWNER, NO_PLATFORM
+from entities.fieldBatch import FieldBatch
+from entities.fieldRepresentation import FieldRepresentation, ObservationBuffers
+from rl_training.environment import ADJACENT_DISTANCE, TippingPointEnv
+
+# Movement per action, indexed by action number as in TippingPointEnv._map_movement
+MOVE_DX = np.array([0, 0, 0, -1, 1])
+MOVE_DY = np.array([0, 1, -1, 0, 0])
+MOVE_ANGLE = np.array(
+    [0.0] + [math.atan2(dy, dx) for dx, dy in zip(MOVE_DX[1:], MOVE_DY[1:])]
+)
+
+
+class BatchedTippingPointEnv(VecEnv):
+    """
+    Stable-baselines3 VecEnv running num_envs TippingPointEnv games at once. The fields are held in a FieldBatch and
+    every step, reset and observation export is done on all of them together, rather than walking each field's
+    entity objects. Each field follows the rules of TippingPointEnv, and fields whose episode ends are reset
+    automatically with the final observation in the step info, as with DummyVecEnv.
+
+    @param num_envs: Number of fields simulated together
+    @param steps: Number of steps in an episode
+    @param observation_mode: Layout of the returned observations. Defaults to the entity list, as the dense layout
+        needs over 2 MB per field
+    @param copy_observations: Return copies of the persistent observation buffers, see TippingPointEnv
+    @param capacity: Maximum number of entities in a single field
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        steps: int,
+        observation_mode=ObservationMode.ENTITY_LIST,
+        copy_observations: bool = True,
+        capacity: int = 128,
+    ):
+        self.observation_mode = ObservationMode(observation_mode)
+        if self.observation_mode == ObservationMode.ENTITY_LIST:
+            observation_space = TippingPointEnv._entity_list_space()
+            self.entity_buffer = np.zeros(
+                (num_envs, *observation_space["entities"].shape), dtype=np.float32
+            )
+        else:
+            observation_space = TippingPointEnv._dense_space()
+            self.observation_buffers = ObservationBuffers(num_envs)
+
+        super().__init__(num_envs, observation_space, gym.spaces.Discrete(10))
+
+        self.MAX_STEPS = steps
+        self.copy_observations = copy_observations
+        self.fields = FieldBatch(num_envs, capacity)
+        self.current_time = np.full(num_envs, steps)
+        self.actions = np.zeros(num_envs, dtype=np.int64)
+
+        # Generator of each field's layouts, the random module is used until the environment is seeded
+        self._rngs = [None] * num_envs
+
+    def _reset_fields(self, field_ids) -> None:
+        for idx in field_ids:
+            rep = FieldRepresentation()
+            rep.randomize(self._rngs[idx])
+            self.fields.load(idx, rep)
+            self.current_time[idx] = self.MAX_STEPS
+
+    def _export_observation(self, copy=False) -> dict:
+        copy = copy or self.copy_observations
+        if self.observation_mode == ObservationMode.ENTITY_LIST:
+            entities = self.fields.export_to_entity_list(self.entity_buffer)
+            if copy:
+                entities = entities.copy()
+            return dict(entities=entities)
+        return self.fields.export_to_dict(self.observation_buffers, copy)
+
+    def reset(self) -> dict:
+        self._reset_fields(range(self.num_envs))
+        return self._export_observation()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        self._do_actions(self.actions)
+
+        self.current_time -= 1
+        dones = self.current_time == 0
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        infos = [{} for _ in range(self.num_envs)]
+
+        if not dones.any():
+            return self._export_observation(), rewards, dones, infos
+
+        rewards[dones] = self._calculate_scores()[dones]
+
+        # Terminal observations are copied out before the finished fields are reset
+        obs = self._export_observation(copy=True)
+        for idx in np.flatnonzero(dones):
+            infos[idx]["terminal_observation"] = {key: arr[idx] for key, arr in obs.items()}
+
+        self._reset_fields(np.flatnonzero(dones))
+        return self._export_observation(), rewards, dones, infos
+
+    def _calculate_scores(self) -> np.ndarray:
+        # Platforms are left out as in TippingPointEnv._calculate_scores, see its FIXME
+        red_score = self.fields.get_field_goal_score(Color.RED)
+        blue_score = self.fields.get_field_goal_score(Color.BLUE)
+
+        red_reward = np.where(
+            red_score > blue_score, 1, np.where(red_score == blue_score, 1 / 2, -1)
+        )
+        blue_reward = np.where(red_score == blue_score, 1 / 2, -red_reward)
+
+        host_color = self.fields.get_host_color()
+        return np.where(
+            host_color == Color.RED,
+            red_reward,
+            np.where(host_color == Color.BLUE, blue_reward, 0),
+        )
+
+    def _do_actions(self, actions: np.ndarray) -> None:
+        fields = self.fields
+        host_x = fields.get_host_values(fields.x)
+        host_y = fields.get_host_values(fields.y)
+        host_radius = fields.get_host_values(fields.radius)
+
+        move = np.flatnonzero((actions >= 1) & (actions <= 4))
+        if len(move):
+            self._move_collision(move, actions, host_x, host_y, host_radius)
+
+        # Only the remaining actions interact with entities, measured from the host's pose before acting
+        idx = np.flatnonzero(actions >= 5)
+        if len(idx) == 0:
+            return
+
+        actions = actions[idx]
+        host = fields.host[idx]
+        host_x, host_y, host_radius = host_x[idx], host_y[idx], host_radius[idx]
+        kind = fields.kind[idx]
+        order = fields.order[idx]
+
+        on_field = fields.alive[idx] & (fields.owner[idx] == NO_OWNER) & (fields.platform[idx] == NO_PLATFORM)
+        dist = np.sqrt(((fields.x[idx] - host_x[:, None]) ** 2) + ((fields.y[idx] - host_y[:, None]) ** 2))
+        adjacent = np.maximum(dist - (fields.radius[idx] + host_radius[:, None]), 0) <= ADJACENT_DISTANCE
+        adjacent_goals = adjacent & on_field & KIND_IS_GOAL[kind]
+        adjacent_rings = adjacent & on_field & (kind == EntityKind.RING)
+
+        held = fields.alive[idx] & (fields.owner[idx] == host[:, None])
+        held_goals = held & KIND_IS_GOAL[kind]
+        held_rings = held & (kind == EntityKind.RING)
+
+        # Follows the branches of TippingPointEnv._do_action, falling through to ring placement, and shares the
+        # simplifications noted by its FIXMEs
+        capture_goal = (actions == 5) & adjacent_goals.any(axis=1)
+        release_goal = (actions == 6) & held_goals.any(axis=1)
+        capture_rings = (actions == 7) & adjacent_rings.any(axis=1)
+        place_ring = (
+            ~(capture_goal | release_goal | capture_rings)
+            & held_rings.any(axis=1)
+            & adjacent_goals.any(axis=1)
+        )
+
+        # Entities are chosen by their order, which follows the order of the TippingPointEnv entity lists
+        if capture_goal.any():
+            rows = np.flatnonzero(capture_goal)
+            env_ids = idx[rows]
+            goal = np.argmax(np.where(adjacent_goals[rows], order[rows], -1), axis=1)
+
+            fields.owner[env_ids, goal] = host[rows]
+            fields.order[env_ids, goal] = fields.next_order[env_ids]
+            fields.next_order[env_ids] += 1
+
+        if release_goal.any():
+            rows = np.flatnonzero(release_goal)
+            env_ids = idx[rows]
+            goal = np.argmax(np.where(held_goals[rows], order[rows], -1), axis=1)
+            offset = host_y[rows] + host_radius[rows] + fields.radius[env_ids, goal] + 1
+
+            fields.x[env_ids, goal] = host_x[rows]
+            fields.y[env_ids, goal] = np.maximum(np.minimum(offset, FIELD_WIDTH_IN), 0)
+            fields.angle[env_ids, goal] = 0
+            fields.owner[env_ids, goal] = NO_OWNER
+            fields.platform[env_ids, goal] = NO_PLATFORM
+            fields.order[env_ids, goal] = fields.next_order[env_ids]
+            fields.next_order[env_ids] += 1
+
+        if capture_rings.any():
+            rows = np.flatnonzero(capture_rings)
+            captured = adjacent_rings[rows]
+            owner = fields.owner[idx[rows]]
+            owner[captured] = np.broadcast_to(host[rows, None], captured.shape)[captured]
+            fields.owner[idx[rows]] = owner
+
+        if place_ring.any():
+            rows = np.flatnonzero(place_ring)
+            env_ids = idx[rows]
+            goal = np.argmin(
+                np.where(adjacent_goals[rows], order[rows], np.iinfo(np.int64).max), axis=1
+            )
+            ring = np.argmax(np.where(held_rings[rows], order[rows], -1), axis=1)
+            level = fields.place_level[env_ids, goal]
+
+            # The ring leaves the host even when the goal has no room for it
+            fields.alive[env_ids, ring] = False
+            room = fields.ring_counts[env_ids, goal, level] < fields.ring_capacity[env_ids, goal, level]
+            fields.ring_counts[env_ids[room], goal[room], level[room]] += 1
+
+    def _move_collision(self, idx, actions, host_x, host_y, host_radius) -> None:
+        fields = self.fields
+        host = fields.host[idx]
+        new_x = host_x[idx] + MOVE_DX[actions[idx]]
+        new_y = host_y[idx] + MOVE_DY[actions[idx]]
+
+        # Every entity not held by a robot blocks movement, including those on the platforms
+        collidable = fields.alive[idx] & (fields.owner[idx] == NO_OWNER)
+        collidable[np.arange(len(idx)), host] = False
+
+        dist = np.sqrt(
+            ((fields.x[idx] - new_x[:, None]) ** 2) + ((fields.y[idx] - new_y[:, None]) ** 2)
+        )
+        blocked = (
+            collidable & (dist <= np.maximum(fields.radius[idx], host_radius[idx][:, None]))
+        ).any(axis=1)
+
+        free = ~blocked
+        fields.x[idx[free], host[free]] = new_x[free]
+        fields.y[idx[free], host[free]] = new_y[free]
+        fields.angle[idx[free], host[free]] = MOVE_ANGLE[actions[idx[free]]]
+
+    def close(self) -> None:
+        pass
+
+    def _get_indices(self, indices: VecEnvIndices) -> List[int]:
+        if indices is None:
+            return list(range(self.num_envs))
+        elif isinstance(indices, int):
+            return [indices]
+        return list(indices)
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        # The fields share one environment, so attributes are shared too
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> List[Any]:
+        # Called once per index, as the fields share one environment
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
+
+    def seed(self, seed: int = None) -> List[int]:
+        # Field i is seeded with seed + i, as DummyVecEnv seeds its environments
+        if seed is None:
+            seed = np.random.randint(0, 2**32 - 1)
+        self._rngs = [np.random.default_rng(seed + idx) for idx in range(self.num_envs)]
+        return [seed + idx for idx in range(self.num_envs)]
@@ -3,16 +3,26 @@ import gym
 import numpy as np
 import matplotlib.pyplot as plt
 from gym import spaces
-from entities.fieldRepresentation import FieldState
+from entities.fieldRepresentation import FieldState, ObservationBuffers
 from entities.mathUtils import (
     Pose2D,
     distance_between_points,
     distance_between_entities,
 )
-from entities.enumerations import Color
+from entities.enumerations import Color, EntityFeature, ObservationMode, RewardMode
 from entities.robots import HostRobot
 from entities.fieldConfigurations import starting_representation
-from entities.constants import FIELD_WIDTH_IN
+from entities.fieldPlot import LiveFieldPlot
+from entities.rasterRenderer import RasterRenderer
+from entities.spatialIndex import SpatialGrid
+from entities.constants import FIELD_WIDTH_IN, MAX_NUM_OBSERVED_ENTITIES
+from rl_training.episodeLog import KEYFRAME_INTERVAL, EpisodeRecorder
+
+# FIXME find correct action distances
+ADJACENT_DISTANCE = 2
+
+# Score margin mapped to a reward of 1 in the score delta reward mode, about one goal in its zone
+SCORE_DELTA_SCALE = 20
 
 
 class TippingPointEnv(gym.Env):
@@ -49,16 +59,92 @@ class TippingPointEnv(gym.Env):
             1=no
             2=yes
         }
+    - Dict (observation_mode=ObservationMode.ENTITY_LIST)
+        {
+        "entities": Box(100, 14), float32
+            idx[id][feature] = value, with features ordered as in EntityFeature
+            id, type, x, y, angle, color, value, is_opposing,
+            base goals, base rings, low goals, low rings, high goals, high rings
+            Unused rows have an id of 0, see entity_list_to_dict to recover the dense layout
+        }
     """
 
-    metadata = {"render.modes": ["human"]}
-
-    def __init__(self, steps):
+    metadata = {"render.modes": ["human", "rgb_array"]}
+
+    def __init__(
+        self,
+        steps,
+        observation_mode=ObservationMode.DENSE,
+        copy_observations=True,
+        reward_mode=RewardMode.SPARSE,
+        goal_distance_weight=0.0,
+        rings_held_weight=0.0,
+        shaping_gamma=0.99,
+        record_dir=None,
+        keyframe_interval=KEYFRAME_INTERVAL,
+    ):
+        """
+        @param steps: Number of steps in an episode
+        @param observation_mode: Layout of the returned observations
+        @param copy_observations: Return copies of the persistent observation buffers. When False, observations are
+            views that are overwritten by the next step or reset, which is safe when a VecEnv copies them out
+        @param reward_mode: SPARSE rewards only the outcome on the last step. SCORE_DELTA also rewards every step with
+            the change in the host alliance's goal score margin, in units of SCORE_DELTA_SCALE
+        @param goal_distance_weight: Weight of the host's distance to the nearest goal its alliance can score, as a
+            fraction of the field width, in the shaping potential of the SCORE_DELTA mode
+        @param rings_held_weight: Weight of the rings held by the host in the shaping potential of the SCORE_DELTA mode
+        @param shaping_gamma: Discount of the potential based shaping, matching the learner's discount keeps the
+            optimal policy unchanged
+        @param record_dir: When given, every episode is logged to this directory for replay, see EpisodeLog
+        @param keyframe_interval: Steps between the keyframes of the episode logs
+        """
         super(TippingPointEnv, self).__init__()
 
         self.action_space = spaces.Discrete(10)
+        self.observation_mode = ObservationMode(observation_mode)
+        self.copy_observations = copy_observations
 
-        self.observation_space = spaces.Dict(
+        if self.observation_mode == ObservationMode.ENTITY_LIST:
+            self.observation_space = self._entity_list_space()
+            self.entity_buffer = np.zeros(
+                self.observation_space["entities"].shape, dtype=np.float32
+            )
+        else:
+            self.observation_space = self._dense_space()
+            self.observation_buffers = ObservationBuffers()
+
+        # TODO: Calculate time
+        self.field_state = FieldState(starting_representation(), steps)
+        self.MAX_STEPS = steps
+
+        # Grid of every collidable entity, kept up to date by _do_action and rebuilt on reset
+        self._spatial_index = None
+        self._spatial_index_rep = None
+        # Counter given to the spatial index to count its queries, set by StepProfiler
+        self.spatial_stats = None
+
+        # Generator of the field layouts, the random module is used until the environment is seeded
+        self._rng = None
+
+        self.reward_mode = RewardMode(reward_mode)
+        self.goal_distance_weight = goal_distance_weight
+        self.rings_held_weight = rings_held_weight
+        self.shaping_gamma = shaping_gamma
+        # Score margin and shaping potential after the last step, and the field they were taken on
+        self._reward_state = None
+        self._reward_rep = None
+
+        # Created on the first render of each mode
+        self._renderer = None
+        self._live_plot = None
+
+        self._recorder = None
+        if record_dir is not None:
+            self._recorder = EpisodeRecorder(record_dir, keyframe_interval)
+
+    @staticmethod
+    def _dense_space():
+        return spaces.Dict(
             {
                 "location": spaces.Box(
                     low=0, high=4, shape=(145, 145, 100), dtype=np.uint8
@@ -72,9 +158,36 @@ class TippingPointEnv(gym.Env):
             }
         )
 
-        # TODO: Calculate time
-        self.field_state = FieldState(starting_representation(), steps)
-        self.MAX_STEPS = steps
+    @staticmethod
+    def _entity_list_space():
+        shape = (MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature))
+        low = np.zeros(shape, dtype=np.float32)
+        high = np.full(shape, 255, dtype=np.float32)
+
+        high[:, EntityFeature.ID] = MAX_NUM_OBSERVED_ENTITIES
+        high[:, EntityFeature.TYPE] = 4
+        high[:, EntityFeature.COLOR] = 2
+        high[:, EntityFeature.IS_OPPOSING] = 2
+        high[:, EntityFeature.BASE_GOALS :] = 100
+
+        # Robots are not bounded to the field while moving
+        low[:, [EntityFeature.X, EntityFeature.Y]] = -np.inf
+        high[:, [EntityFeature.X, EntityFeature.Y]] = np.inf
+        low[:, EntityFeature.ANGLE] = -math.pi
+        high[:, EntityFeature.ANGLE] = math.pi
+
+        return spaces.Dict(
+            {"entities": spaces.Box(low=low, high=high, dtype=np.float32)}
+        )
+
+    def _export_observation(self, rep, copy=False):
+        copy = copy or self.copy_observations
+        if self.observation_mode == ObservationMode.ENTITY_LIST:
+            entities = rep.export_to_entity_list(self.entity_buffer)
+            if copy:
+                entities = entities.copy()
+            return dict(entities=entities)
+        return rep.export_to_dict(self.observation_buffers, copy)
 
     def step(self, action):
         # Execute one time step within the environment
@@ -88,25 +201,83 @@ class TippingPointEnv(gym.Env):
             if type(robot) is HostRobot
         ][0]
 
-        adjacent_entities = self._detect_adjacents(host, rep)
-        self._do_action(action, host, adjacent_entities, rep)
+        if self.reward_mode == RewardMode.SCORE_DELTA:
+            margin, potential = self._get_reward_state(host, rep)
+
+        host = self.act(host, action)
 
         self.field_state.current_time -= 1
         done = self.field_state.current_time == 0
-        obs = rep.export_to_dict()
-
+        # Terminal observations outlive the following reset, so never hand out a view of the buffers
+        obs = self._export_observation(rep, copy=done)
+
+        if self.reward_mode == RewardMode.SCORE_DELTA:
+            next_margin = self._get_score_margin(host, rep)
+            # The potential of the terminal state is zero, so shaping sums to the starting potential
+            next_potential = 0.0 if done else self._get_potential(host, rep)
+            reward = (next_margin - margin) / SCORE_DELTA_SCALE
+            reward += self.shaping_gamma * next_potential - potential
+            self._reward_state = (next_margin, next_potential)
+
+        info = {}
         if done:
-            reward = self._calculate_scores(host, rep)
-
-        return obs, reward, done, {}
+            reward += self._calculate_scores(host, rep)
+            info["score_margin"] = self._get_score_margin(host, rep)
+
+        if self._recorder is not None:
+            self._recorder.record(rep, action, reward, done, host)
+
+        return obs, reward, done, info
+
+    def _get_score_margin(self, host, field_rep):
+        other_color = Color.BLUE if host.color == Color.RED else Color.RED
+        return field_rep.get_goal_score(host.color) - field_rep.get_goal_score(other_color)
+
+    def _get_potential(self, host, field_rep):
+        potential = self.rings_held_weight * len(host.rings)
+        if self.goal_distance_weight:
+            distances = [
+                distance_between_entities(host, goal)
+                for goal in field_rep.goals
+                if goal.color == host.color or goal.color == Color.NEUTRAL
+            ]
+            if distances:
+                potential -= self.goal_distance_weight * min(distances) / FIELD_WIDTH_IN
+        return potential
+
+    def _get_reward_state(self, host, field_rep):
+        # Fields handed to the environment without a reset start from their own margin and potential
+        if self._reward_rep is not field_rep or self._reward_state is None:
+            self._reward_state = (
+                self._get_score_margin(host, field_rep),
+                self._get_potential(host, field_rep),
+            )
+            self._reward_rep = field_rep
+        return self._reward_state
+
+    def act(self, robot, action):
+        """
+        Applies an action of the action space to any robot on the field without advancing time, as step does for the
+        host robot
+
+        @param robot: Robot on the field to act with
+        @param action: Action of the action space
+        @return: The robot, or the copy that took its place when the field is a fork sharing it
+        """
+        rep = self.field_state.get_current_representation()
+        # Only goal and ring actions interact with adjacent entities
+        adjacent_entities = ([], [])
+        if action >= 5:
+            adjacent_entities = self._detect_adjacents(robot, rep)
+        if action > 0:
+            robot = self._get_writable(robot, rep)
+        self._do_action(action, robot, adjacent_entities, rep)
+        return robot
 
     def _calculate_scores(self, agent, field_rep):
         # FIXME: add platforms to scoring
-        red_score = 0
-        blue_score = 0
-        for goal in field_rep.goals:
-            red_score += goal.get_current_score(Color.RED)
-            blue_score += goal.get_current_score(Color.BLUE)
+        red_score = field_rep.get_goal_score(Color.RED)
+        blue_score = field_rep.get_goal_score(Color.BLUE)
 
         if red_score > blue_score:
             red_score = 1
@@ -126,20 +297,54 @@ class TippingPointEnv(gym.Env):
 
         return reward
 
+    def _get_spatial_index(self, field_rep):
+        if self._spatial_index is None or self._spatial_index_rep is not field_rep:
+            index = SpatialGrid(stats=self.spatial_stats)
+            for tag, ent_lst in [
+                ("robot", field_rep.robots),
+                ("goal", field_rep.goals),
+                ("ring", field_rep.rings),
+                ("platform", field_rep.red_platform.robots),
+                ("platform", field_rep.red_platform.goals),
+                ("platform", field_rep.red_platform.rings),
+                ("platform", field_rep.blue_platform.robots),
+                ("platform", field_rep.blue_platform.goals),
+                ("platform", field_rep.blue_platform.rings),
+            ]:
+                for en in ent_lst:
+                    index.insert(en, tag)
+
+            self._spatial_index = index
+            self._spatial_index_rep = field_rep
+        return self._spatial_index
+
+    def _get_writable(self, ent, field_rep):
+        # Forked fields copy shared entities before they change, the copy takes the entity's place in the index
+        writable = field_rep.get_writable(ent)
+        index = self._get_spatial_index(field_rep)
+        if writable is not ent and ent in index:
+            index.replace(ent, writable)
+        return writable
+
     def _detect_adjacents(self, agent, field_rep):
-        # FIXME find correct action distances
-        adjacent_distance = 2
+        adjacent_distance = ADJACENT_DISTANCE
+        index = self._get_spatial_index(field_rep)
+
+        # Compare by identity, dataclass equality deep compares every field
+        held = {id(en) for en in (*agent.goals, *agent.rings)}
         adjacent_goals = [
             goal
-            for goal in field_rep.goals
-            if distance_between_entities(goal, agent) <= adjacent_distance
-            and goal not in agent.goals
+            for goal in index.get_within(
+                agent.pose, adjacent_distance, agent.radius, tags=("goal",)
+            )
+            if id(goal) not in held
         ]
         adjacent_rings = [
             ring
-            for ring in field_rep.rings
-            if distance_between_entities(ring, agent) <= adjacent_distance
-            and ring not in agent.rings
+            for ring in index.get_within(
+                agent.pose, adjacent_distance, agent.radius, tags=("ring",)
+            )
+            if id(ring) not in held
         ]
         return adjacent_goals, adjacent_rings
 
@@ -154,45 +359,31 @@ class TippingPointEnv(gym.Env):
             elif action == 5 and len(adjacent_goals) > 0:
                 goal = adjacent_goals.pop()
 
-                # Remove goals from the field
-                goal_idx = -1
-                for idx, rep_goal in enumerate(rep.goals):
-                    if goal.pose == rep_goal.pose:
-                        goal_idx = idx
-
-                rep.goals.pop(goal_idx)
-
-                host.goals.append(goal)
+                # Remove by identity, stacked goals share a pose
+                rep.capture(host, goal)
+                self._get_spatial_index(rep).remove(goal)
             # goal release
             elif action == 6 and len(host.goals) > 0:
                 # FIXME: be released according to orientation
                 # FIXME: scale by distance from boundary, other robots etc.
                 # FIXME: need zone boundaries to determine discount
                 # FIXME: prevent goal-entity collision
-                goal = host.goals.pop()
+                goal = self._get_writable(host.goals[-1], rep)
                 offset = max(
                     min(host.pose.y + host.radius + goal.radius + 1, FIELD_WIDTH_IN), 0
                 )
-                goal.pose = Pose2D(host.pose.x, offset)
 
                 # Add the goal back to the rep
-                rep.goals.append(goal)
+                rep.release(host, goal, Pose2D(host.pose.x, offset))
+                self._get_spatial_index(rep).insert(goal, "goal")
             # ring capture
             elif action == 7 and len(adjacent_rings) > 0:
                 # FIXME: number of rings picked up in a step
-                host.rings += adjacent_rings
+                rep.capture(host, *adjacent_rings)
 
-                ring_poses = []
+                index = self._get_spatial_index(rep)
                 for ring in adjacent_rings:
-                    ring_poses.append(ring.pose)
-
-                # Remove rings from the field
-                remaining_rings = []
-                for idx, rep_ring in enumerate(rep.rings):
-                    if rep_ring.pose not in ring_poses:
-                        remaining_rings.append(rep_ring)
-
-                rep.rings = remaining_rings
+                    index.remove(ring)
             # # ring release
             # elif action == 8 and len(host.rings) > 0:
             #     # FIXME: is this action necessary?
@@ -206,26 +397,22 @@ class TippingPointEnv(gym.Env):
                 #      : encode selection in action space
                 #      : survey adjacent goals for vacancy
                 # FIXME: account for level difficulty
-                ring = host.rings.pop()
-
-                selected_goal = adjacent_goals[0]
+                selected_goal = self._get_writable(adjacent_goals[0], rep)
                 goal_levels = list(selected_goal.ring_containers.keys())
-                selected_goal.add_ring(ring, goal_levels[-1])
+                rep.place_ring(host, host.rings[-1], selected_goal, goal_levels[-1])
 
     def _move_collision(self, host, direction, field_rep):
-        # FIXME: add platforms to collision
-        ent_lst = [*field_rep.robots, *field_rep.goals, *field_rep.rings]
         org_pos = host.pose
-        coords = np.array([org_pos.x, org_pos.y])
-        coords += direction
-        new_pos = Pose2D(coords[0], coords[1], math.atan2(direction[1], direction[0]))
-        host.pose = new_pos
-        colliding_ens = [
-            en for en in ent_lst if en.is_colliding(host) and en is not host
-        ]
+        new_pos = Pose2D(
+            org_pos.x + direction[0],
+            org_pos.y + direction[1],
+            math.atan2(direction[1], direction[0]),
+        )
 
-        if len(colliding_ens) != 0:
-            host.pose = org_pos
+        index = self._get_spatial_index(field_rep)
+        if not index.get_colliding(new_pos, host.radius, exclude=host):
+            field_rep.set_pose(host, new_pos)
+            index.update(host)
 
     def _map_movement(self, action):
         dirs = {
@@ -236,17 +423,52 @@ class TippingPointEnv(gym.Env):
         }
         return dirs[action]
 
-    def reset(self):
+    def seed(self, seed=None):
+        """
+        Seeds the generator of the field layouts. Environments given the same seed produce the same episodes.
+
+        @param seed: Seed of the generator. When None, the generator is seeded from system entropy
+        @return: The seed used, in a list as expected by gym
+        """
+        seed_seq = np.random.SeedSequence(seed)
+        self._rng = np.random.default_rng(seed_seq)
+        return [seed_seq.entropy]
+
+    def reset(self, seed=None):
         # Reset the state of the environment to an initial state
+        if seed is not None:
+            self.seed(seed)
+
         rep = self.field_state.get_current_representation()
-        rep.randomize()
+        rep.randomize(self._rng)
+        self.field_state.current_time = self.MAX_STEPS
+        self._spatial_index = None
+        self._reward_state = None
+        if self._live_plot is not None:
+            self._live_plot.start(rep)
+        if self._recorder is not None:
+            self._recorder.start(rep)
 
-        return rep.export_to_dict()
+        return self._export_observation(rep)
 
     def render(self, mode="human", close=False):
         # Render the environment to the screen
-        # FIXME: add live plotting
-        return self.field_state.get_current_representation().draw()
-        # if(self.field_state.current_time == self.MAX_STEPS-1):
-        #     ax.redraw_in_frame()
-        # plt.pause(0.001)
+        rep = self.field_state.get_current_representation()
+        if mode == "rgb_array":
+            # Headless frame for recording, overwritten by the next render
+            if self._renderer is None:
+                self._renderer = RasterRenderer()
+            return self._renderer.render(rep)
+
+        # The figure is kept between renders, with its artists updated in place
+        if self._live_plot is None:
+            self._live_plot = LiveFieldPlot()
+        return self._live_plot.update(rep)
+
+    def close(self):
+        # Unfinished episodes are still logged
+        if self._recorder is not None:
+            self._recorder.finish()
+        if self._live_plot is not None:
+            self._live_plot.close()
+            self._live_plot = None
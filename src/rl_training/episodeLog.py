@@ -0,0 +1,209 @@
+import glob
+import os
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+from entities.constants import MAX_NUM_OBSERVED_ENTITIES
+from entities.enumerations import EntityFeature
+from entities.fieldRepresentation import FieldRepresentation
+from entities.fieldSnapshot import SNAPSHOT_RECORD
+from entities.platforms import PlatformState
+from entities.rasterRenderer import RasterRenderer
+from rl_training.videoWriter import VideoWriter
+
+# Steps between the keyframes of an episode log, a step is rebuilt from the last keyframe at or before it
+KEYFRAME_INTERVAL = 50
+
+EPISODE_FILE = "episode_{:05d}.npz"
+
+
+class EpisodeRecorder:
+    """
+    Records every step of an environment's episodes into a log per episode, read back by EpisodeLog. Each step appends
+    its action, reward, host pose and platform states to columns, and the records of the entities it changed, as
+    tracked by the field, to a table of deltas. The field is also saved as a keyframe every keyframe_interval steps.
+    Logs are written once their episode ends, so earlier logs are never rewritten.
+
+    @param directory: Directory of the logs, created when missing. Numbering continues after the logs already in it
+    @param keyframe_interval: Steps between keyframes, trading the size of a log for the time to seek a step
+    """
+
+    def __init__(self, directory: str, keyframe_interval: int = KEYFRAME_INTERVAL):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.keyframe_interval = keyframe_interval
+        self.episodes = len(glob.glob(os.path.join(directory, EPISODE_FILE.replace("{:05d}", "*"))))
+        self.rep = None
+
+    def start(self, rep: FieldRepresentation) -> None:
+        """
+        Starts the log of an episode, writing the log of the current episode first when it is unfinished
+
+        @param rep: Field at the start of the episode, tracking its changes until the episode is finished
+        """
+        self.finish()
+        self.rep = rep
+        rep.track_changes()
+
+        self.__actions = []
+        self.__rewards = []
+        self.__dones = []
+        self.__host_poses = []
+        self.__platform_states = []
+        self.__deltas = []
+        self.__delta_ends = []
+        self.__keyframes = [rep.to_bytes()]
+        self.__keyframe_steps = [0]
+
+    def record(self, rep: FieldRepresentation, action: int, reward: float, done: bool, host) -> None:
+        """
+        Appends a step, finishing the log when the episode is done
+
+        @param rep: Field after the step. A field that is not the one being logged, such as one handed to the
+            environment without a reset, starts a new log from its state after the step
+        @param host: Host robot after the step
+        """
+        if rep is not self.rep:
+            self.start(rep)
+            return
+
+        self.__actions.append(action)
+        self.__rewards.append(reward)
+        self.__dones.append(done)
+        self.__host_poses.append((host.pose.x, host.pose.y, host.pose.angle))
+        self.__platform_states.append((rep.red_platform.state, rep.blue_platform.state))
+        self.__deltas += rep.pop_changed_records()
+        self.__delta_ends.append(len(self.__deltas))
+
+        if len(self.__actions) % self.keyframe_interval == 0:
+            self.__keyframes.append(rep.to_bytes())
+            self.__keyframe_steps.append(len(self.__actions))
+
+        if done:
+            self.finish()
+
+    def finish(self) -> Optional[str]:
+        """
+        Writes the log of the current episode, if any
+
+        @return: Path of the log, or None when no episode was being logged
+        """
+        if self.rep is None:
+            return None
+
+        self.rep.track_changes(False)
+        self.rep = None
+        path = os.path.join(self.directory, EPISODE_FILE.format(self.episodes))
+        self.episodes += 1
+
+        np.savez(
+            path,
+            actions=np.array(self.__actions, dtype=np.uint8),
+            rewards=np.array(self.__rewards, dtype=np.float32),
+            dones=np.array(self.__dones, dtype=bool),
+            host_poses=np.array(self.__host_poses, dtype=np.float64).reshape(-1, 3),
+            platform_states=np.array(self.__platform_states, dtype=np.uint8).reshape(-1, 2),
+            deltas=np.array(self.__deltas, dtype=SNAPSHOT_RECORD),
+            delta_offsets=np.array([0] + self.__delta_ends, dtype=np.int64),
+            keyframes=np.frombuffer(b"".join(self.__keyframes), dtype=np.uint8),
+            keyframe_offsets=np.cumsum([0] + [len(keyframe) for keyframe in self.__keyframes]),
+            keyframe_steps=np.array(self.__keyframe_steps, dtype=np.int64),
+        )
+        return path
+
+
+class EpisodeLog:
+    """
+    Episode written by EpisodeRecorder. Step 0 is the field after the reset and step t the field after the t-th
+    action, rebuilt by restoring the last keyframe at or before it and applying the deltas of the steps since.
+
+    @param path: Log of the episode
+    """
+
+    def __init__(self, path: str):
+        with np.load(path) as data:
+            self.actions = data["actions"]
+            self.rewards = data["rewards"]
+            self.dones = data["dones"]
+            self.host_poses = data["host_poses"]
+            self.platform_states = data["platform_states"]
+            self.__deltas = data["deltas"]
+            self.__delta_offsets = data["delta_offsets"]
+            self.__keyframes = data["keyframes"]
+            self.__keyframe_offsets = data["keyframe_offsets"]
+            self.__keyframe_steps = data["keyframe_steps"]
+
+        self.num_steps = len(self.actions)
+
+    def __restore_keyframe(self, idx: int) -> FieldRepresentation:
+        start, end = self.__keyframe_offsets[idx : idx + 2]
+        return FieldRepresentation.from_bytes(self.__keyframes[start:end].tobytes())
+
+    def __apply_steps(self, rep: FieldRepresentation, first_step: int, last_step: int) -> None:
+        # Deltas of consecutive steps are applied at once, the records of later steps following those of earlier ones
+        for platform, state in zip([rep.red_platform, rep.blue_platform], self.platform_states[last_step - 1]):
+            if platform.state != state:
+                rep.set_platform_state(platform, PlatformState(state))
+
+        start, end = self.__delta_offsets[first_step - 1], self.__delta_offsets[last_step]
+        rep.apply_records(self.__deltas[start:end].tolist())
+
+    def get_representation(self, step: int) -> FieldRepresentation:
+        """
+        Rebuilds the field at a step
+
+        @raise IndexError: When the step is not between 0 and num_steps
+        """
+        if not 0 <= step <= self.num_steps:
+            raise IndexError(f"Step {step} is not in the log of {self.num_steps} steps")
+
+        idx = int(np.searchsorted(self.__keyframe_steps, step, side="right")) - 1
+        rep = self.__restore_keyframe(idx)
+        if step > self.__keyframe_steps[idx]:
+            self.__apply_steps(rep, int(self.__keyframe_steps[idx]) + 1, step)
+        return rep
+
+    def iter_representations(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, FieldRepresentation]]:
+        """
+        Steps from start up to, not including, stop, with the field at each. The field is sought once and then
+        changed in place by each step.
+        """
+        stop = self.num_steps + 1 if stop is None else min(stop, self.num_steps + 1)
+        rep = self.get_representation(start)
+        yield start, rep
+
+        for step in range(start + 1, stop):
+            self.__apply_steps(rep, step, step)
+            yield step, rep
+
+    def render(self, path: str, start: int = 0, stop: Optional[int] = None, fps: float = 30) -> int:
+        """
+        Writes a video of a range of steps, drawn by RasterRenderer
+
+        @return: Number of frames written
+        """
+        renderer = RasterRenderer()
+        with VideoWriter(path, renderer.frame_size, fps) as video:
+            for _, rep in self.iter_representations(start, stop):
+                video.write(renderer.render(rep))
+        return video.frames
+
+    def get_dataset(self) -> Dict[str, np.ndarray]:
+        """
+        Transitions of the episode for offline RL, one per step, with observations exported as the ENTITY_LIST
+        observation mode does
+
+        @return: observations, actions, rewards, next_observations and terminals arrays
+        """
+        states = np.zeros((self.num_steps + 1, MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature)), dtype=np.float32)
+        for step, rep in self.iter_representations():
+            rep.export_to_entity_list(states[step])
+
+        return dict(
+            observations=states[:-1],
+            actions=self.actions,
+            rewards=self.rewards,
+            next_observations=states[1:],
+            terminals=self.dones,
+        )
@@ -0,0 +1,349 @@
+import math
+import multiprocessing as mp
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from entities.enumerations import Color, ObservationMode
+from entities.fieldRepresentation import FieldRepresentation, FieldState
+from entities.robots import HostRobot, OpposingRobot, Robot
+from rl_training.environment import TippingPointEnv
+
+# Size of TippingPointEnv's action space
+NUM_ACTIONS = 10
+
+# Score margin, about one goal in its zone, mapped to a value of tanh(1) by score_margin_value
+SCORE_MARGIN_SCALE = 20
+
+# Virtual loss added to every edge of a path while its rollout is pending, steering the rest of a batch elsewhere
+VIRTUAL_LOSS = 1.0
+
+# Chooses the action of a robot given the field, the robot and a generator
+Policy = Callable[[FieldRepresentation, Robot, np.random.Generator], int]
+
+# Values the field for the host robot, higher is better
+Evaluation = Callable[[FieldRepresentation, Robot], float]
+
+
+def idle_policy(rep: FieldRepresentation, robot: Robot, rng: np.random.Generator) -> int:
+    """
+    Never acts, like the opposing robots of TippingPointEnv
+    """
+    return 0
+
+
+def random_policy(rep: FieldRepresentation, robot: Robot, rng: np.random.Generator) -> int:
+    return int(rng.integers(NUM_ACTIONS))
+
+
+def score_margin_value(rep: FieldRepresentation, host: Robot) -> float:
+    """
+    Margin of the host alliance over the other alliance in the goal score of TippingPointEnv, squashed into (-1, 1)
+    """
+    red_score = sum(goal.get_current_score(Color.RED) for goal in rep.goals)
+    blue_score = sum(goal.get_current_score(Color.BLUE) for goal in rep.goals)
+    margin = red_score - blue_score if host.color == Color.RED else blue_score - red_score
+    return math.tanh(margin / SCORE_MARGIN_SCALE)
+
+
+def get_host_id(rep: FieldRepresentation) -> int:
+    robots = rep.robots + rep.red_platform.robots + rep.blue_platform.robots
+    return rep.get_entity_id(next(robot for robot in robots if type(robot) is HostRobot))
+
+
+class FieldSimulator:
+    """
+    Advances fields in place by an action of the host robot and of every opposing robot, following the dynamics of
+    TippingPointEnv. Fields handed in must be owned by the caller, such as a fork, as they are changed.
+
+    @param opposing_policy: Policy of the opposing robots
+    """
+
+    def __init__(self, opposing_policy: Policy = idle_policy):
+        self.opposing_policy = opposing_policy
+        self.env = TippingPointEnv(1, ObservationMode.ENTITY_LIST)
+
+    def advance(
+        self,
+        rep: FieldRepresentation,
+        time_left: int,
+        host_id: int,
+        action: int,
+        rng: np.random.Generator,
+    ) -> None:
+        # The environment keeps its spatial index while it is handed the same field
+        self.env.field_state = FieldState(rep, time_left)
+
+        robots = rep.robots + rep.red_platform.robots + rep.blue_platform.robots
+        opposing_ids = [rep.get_entity_id(robot) for robot in robots if isinstance(robot, OpposingRobot)]
+
+        self.env.act(rep.get_entity(host_id), action)
+        for robot_id in opposing_ids:
+            robot = rep.get_entity(robot_id)
+            self.env.act(robot, self.opposing_policy(rep, robot, rng))
+
+    def rollout(
+        self,
+        rep: FieldRepresentation,
+        time_left: int,
+        host_id: int,
+        depth: int,
+        evaluate: Evaluation,
+        rng: np.random.Generator,
+    ) -> float:
+        """
+        Plays uniformly random host actions for up to depth steps, or until time runs out, and evaluates the field
+        """
+        for _ in range(min(depth, time_left)):
+            self.advance(rep, time_left, host_id, int(rng.integers(NUM_ACTIONS)), rng)
+            time_left -= 1
+        return evaluate(rep, rep.get_entity(host_id))
+
+
+# Simulator and settings of a rollout worker process, set by _init_rollout_worker
+_worker = None
+
+
+def _init_rollout_worker(opposing_policy: Policy, evaluate: Evaluation, depth: int) -> None:
+    global _worker
+    _worker = (FieldSimulator(opposing_policy), evaluate, depth)
+
+
+def _rollout_worker(job: Tuple[bytes, int, int, int]) -> float:
+    data, time_left, host_id, seed = job
+    simulator, evaluate, depth = _worker
+    rep = FieldRepresentation.from_bytes(data)
+    return simulator.rollout(rep, time_left, host_id, depth, evaluate, np.random.default_rng(seed))
+
+
+class SearchNode:
+    """
+    Field state in the search graph, with the visits and summed values of each host action taken from it. Nodes
+    keep a fork of their field that is never changed, transitions act on a fork of it.
+
+    @param rep: Field of the node
+    @param time_left: Steps left in the match
+    """
+
+    def __init__(self, rep: FieldRepresentation, time_left: int):
+        self.field_representation = rep
+        self.time_left = time_left
+        self.visits = 0
+        self.action_visits = np.zeros(NUM_ACTIONS)
+        self.action_values = np.zeros(NUM_ACTIONS)
+
+    def is_terminal(self) -> bool:
+        return self.time_left <= 0
+
+    def get_untried_actions(self) -> np.ndarray:
+        return np.flatnonzero(self.action_visits == 0)
+
+    def select_action(self, exploration: float) -> int:
+        """
+        Action with the highest upper confidence bound, trying every action once first
+        """
+        untried = self.get_untried_actions()
+        if len(untried):
+            return int(untried[0])
+
+        means = self.action_values / self.action_visits
+        bonus = exploration * np.sqrt(math.log(max(self.visits, 1)) / self.action_visits)
+        return int(np.argmax(means + bonus))
+
+    def get_best_action(self) -> int:
+        """
+        Most visited action, ties going to the highest mean value
+        """
+        means = np.divide(
+            self.action_values,
+            self.action_visits,
+            out=np.full(NUM_ACTIONS, -np.inf),
+            where=self.action_visits > 0,
+        )
+        return int(np.lexsort((means, self.action_visits))[-1])
+
+
+class MCTSPlanner:
+    """
+    Monte Carlo Tree Search over the host robot's actions in TippingPointEnv, with the opposing robots following a
+    policy. Every simulation descends by upper confidence bound, adding at most one node, then evaluates a random
+    rollout from it. Nodes are kept in a transposition table keyed by the field's state hash and time left, so states
+    reached by several paths share statistics, and the table carries over between decisions so the subtree of the
+    state actually reached is reused.
+
+    With several workers, simulations run in batches: the paths of a batch are chosen with a virtual loss on each
+    edge and their rollouts are run by a process pool.
+
+    @param node_budget: Simulations per decision, at least one
+    @param time_limit: Seconds a decision may take, stopping the search early when exceeded
+    @param opposing_policy: Policy of the opposing robots, a picklable function when using workers
+    @param evaluate: Value of a field for the host robot, a picklable function when using workers
+    @param rollout_depth: Most random steps played by a rollout before evaluating
+    @param exploration: Weight of the exploration bonus of the upper confidence bound
+    @param num_workers: Processes running rollouts, rollouts run in process when 1
+    @param seed: Seed of the search's generator
+    @param start_method: Method used to start the workers, defaults to forkserver when available
+    """
+
+    def __init__(
+        self,
+        node_budget: int = 200,
+        time_limit: float = 1.0,
+        opposing_policy: Policy = idle_policy,
+        evaluate: Evaluation = score_margin_value,
+        rollout_depth: int = 20,
+        exploration: float = math.sqrt(2),
+        num_workers: int = 1,
+        seed: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        if node_budget < 1:
+            raise ValueError(f"node_budget must be at least 1, got {node_budget}")
+        self.node_budget = node_budget
+        self.time_limit = time_limit
+        self.evaluate = evaluate
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.num_workers = num_workers
+        self.rng = np.random.default_rng(seed)
+        self.simulator = FieldSimulator(opposing_policy)
+        self.table: Dict[Tuple[int, int], SearchNode] = {}
+
+        # Statistics of the last decision
+        self.simulations = 0
+        self.elapsed = 0.0
+
+        self.pool = None
+        if num_workers > 1:
+            if start_method is None:
+                forkserver_available = "forkserver" in mp.get_all_start_methods()
+                start_method = "forkserver" if forkserver_available else "spawn"
+            self.pool = mp.get_context(start_method).Pool(
+                num_workers,
+                initializer=_init_rollout_worker,
+                initargs=(opposing_policy, evaluate, rollout_depth),
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def __get_node(self, rep: FieldRepresentation, time_left: int) -> SearchNode:
+        key = (rep.get_state_hash(), time_left)
+        node = self.table.get(key)
+        if node is None:
+            node = SearchNode(rep, time_left)
+            self.table[key] = node
+        return node
+
+    def __transition(self, node: SearchNode, action: int, host_id: int) -> Tuple[SearchNode, bool]:
+        rep = node.field_representation.fork()
+        self.simulator.advance(rep, node.time_left, host_id, action, self.rng)
+
+        num_nodes = len(self.table)
+        child = self.__get_node(rep, node.time_left - 1)
+        return child, len(self.table) > num_nodes
+
+    def __select_path(self, root: SearchNode, host_id: int) -> Tuple[List[Tuple[SearchNode, int]], SearchNode]:
+        path = []
+        node = root
+        while not node.is_terminal():
+            action = node.select_action(self.exploration)
+            path.append((node, action))
+            node, added = self.__transition(node, action, host_id)
+            if added:
+                break
+        return path, node
+
+    def __apply_virtual_loss(self, path: List[Tuple[SearchNode, int]], sign: int) -> None:
+        for node, action in path:
+            node.visits += sign
+            node.action_visits[action] += sign
+            node.action_values[action] -= sign * VIRTUAL_LOSS
+
+    def __evaluate_leaves(self, leaves: List[SearchNode], host_id: int) -> List[float]:
+        values = [None] * len(leaves)
+        jobs = []
+        for idx, leaf in enumerate(leaves):
+            if leaf.is_terminal():
+                rep = leaf.field_representation
+                values[idx] = self.evaluate(rep, rep.get_entity(host_id))
+            else:
+                jobs.append(idx)
+
+        seeds = self.rng.integers(2 ** 63, size=len(jobs))
+        if self.pool is not None:
+            results = self.pool.map(
+                _rollout_worker,
+                [
+                    (leaves[idx].field_representation.to_bytes(), leaves[idx].time_left, host_id, seed)
+                    for idx, seed in zip(jobs, seeds)
+                ],
+            )
+        else:
+            results = [
+                self.simulator.rollout(
+                    leaves[idx].field_representation.fork(),
+                    leaves[idx].time_left,
+                    host_id,
+                    self.rollout_depth,
+                    self.evaluate,
+                    np.random.default_rng(seed),
+                )
+                for idx, seed in zip(jobs, seeds)
+            ]
+
+        for idx, value in zip(jobs, results):
+            values[idx] = value
+        return values
+
+    def plan(self, field_state: FieldState) -> int:
+        """
+        Searches from the field state and returns the host action to take. Stops after node_budget simulations or
+        once time_limit has passed, whichever comes first, and always runs at least one simulation.
+        """
+        start = time.perf_counter()
+        rep = field_state.get_current_representation()
+        time_left = field_state.get_current_time()
+        host_id = get_host_id(rep)
+
+        # States of earlier decisions can no longer be reached
+        self.table = {key: node for key, node in self.table.items() if key[1] <= time_left}
+        root = self.table.get((rep.get_state_hash(), time_left))
+        if root is None:
+            # The live field keeps changing, the search holds a fork of it
+            root = self.__get_node(rep.fork(), time_left)
+        if root.is_terminal():
+            return 0
+
+        batch_size = max(self.num_workers, 1)
+        self.simulations = 0
+        while self.simulations < self.node_budget:
+            paths, leaves = [], []
+            for _ in range(min(batch_size, self.node_budget - self.simulations)):
+                path, leaf = self.__select_path(root, host_id)
+                self.__apply_virtual_loss(path, 1)
+                paths.append(path)
+                leaves.append(leaf)
+
+            values = self.__evaluate_leaves(leaves, host_id)
+            for path, value in zip(paths, values):
+                self.__apply_virtual_loss(path, -1)
+                for node, action in path:
+                    node.visits += 1
+                    node.action_visits[action] += 1
+                    node.action_values[action] += value
+
+            self.simulations += len(leaves)
+            if time.perf_counter() - start >= self.time_limit:
+                break
+
+        self.elapsed = time.perf_counter() - start
+        return root.get_best_action()
@@ -0,0 +1,84 @@
+"""
+Runs episodes of random actions in TippingPointEnv with a StepProfiler attached, and prints where the time of a step
+goes. Optionally writes the running breakdown after every episode to a TensorBoard log, such as the logs/tensorboard
+directory of train_model, and a cProfile dump of the whole run, readable by pstats, snakeviz or gprof2dot.
+
+Run from the src directory:
+    python -m rl_training.profileSteps --episodes 5 --steps 1000
+    python -m rl_training.profileSteps --episodes 5 --tensorboard logs/tensorboard --cprofile steps.prof
+"""
+import argparse
+import cProfile
+import pstats
+from stable_baselines3.common.logger import configure
+from entities.enumerations import ObservationMode, RewardMode
+from rl_training.environment import TippingPointEnv
+from rl_training.stepProfiler import StepProfiler
+
+
+def run_episodes(
+    env: TippingPointEnv, episodes: int, seed: int = None, logger=None, profiler: StepProfiler = None
+) -> None:
+    """
+    @param logger: stable-baselines3 logger the profiler's breakdown is recorded to and dumped after each episode
+    """
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+
+    steps = 0
+    for _ in range(episodes):
+        done = False
+        while not done:
+            _, _, done, _ = env.step(env.action_space.sample())
+            steps += 1
+
+        if logger is not None:
+            profiler.record(logger)
+            logger.dump(steps)
+        env.reset()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=1000, help="Steps per episode")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--observation-mode", choices=[mode.name for mode in ObservationMode], default=ObservationMode.DENSE.name
+    )
+    parser.add_argument("--reward-mode", choices=[mode.name for mode in RewardMode], default=RewardMode.SPARSE.name)
+    parser.add_argument("--tensorboard", help="Directory of the TensorBoard log the breakdowns are written to")
+    parser.add_argument("--cprofile", help="File the cProfile stats of the run are dumped to")
+    parser.add_argument(
+        "--allocations", action="store_true", help="Count the memory blocks allocated by each phase, slowing them"
+    )
+    args = parser.parse_args()
+
+    env = TippingPointEnv(
+        args.steps,
+        observation_mode=ObservationMode[args.observation_mode],
+        reward_mode=RewardMode[args.reward_mode],
+    )
+    profiler = StepProfiler(args.allocations)
+    profiler.attach(env)
+    logger = None if args.tensorboard is None else configure(args.tensorboard, ["tensorboard"])
+
+    if args.cprofile is None:
+        run_episodes(env, args.episodes, args.seed, logger, profiler)
+    else:
+        with cProfile.Profile() as profile:
+            run_episodes(env, args.episodes, args.seed, logger, profiler)
+        profile.dump_stats(args.cprofile)
+
+    print(profiler.format_breakdown())
+    if args.cprofile is not None:
+        print(f"\ncProfile stats written to {args.cprofile}, top functions by own time:")
+        pstats.Stats(args.cprofile).sort_stats("tottime").print_stats(10)
+
+    env.close()
+    if logger is not None:
+        logger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Replays episode logs recorded by TippingPointEnv(record_dir=...) without running the policy again: renders a range of
+steps of an episode to a video, or exports the transitions of any number of episodes as an offline RL dataset.
+
+Run from the src directory:
+    python -m rl_training.replay logs/episodes/episode_00000.npz --render episode.mp4 --start 0 --stop 300
+    python -m rl_training.replay logs/episodes/*.npz --dataset dataset.npz
+"""
+import argparse
+import numpy as np
+from rl_training.episodeLog import EpisodeLog
+
+
+def export_dataset(paths, out: str) -> int:
+    """
+    Concatenates the transitions of episode logs, see EpisodeLog.get_dataset, into a single npz file
+
+    @return: Number of transitions written
+    """
+    datasets = [EpisodeLog(path).get_dataset() for path in paths]
+    np.savez(out, **{key: np.concatenate([dataset[key] for dataset in datasets]) for key in datasets[0]})
+    return sum(len(dataset["actions"]) for dataset in datasets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("logs", nargs="+", help="Episode logs")
+    parser.add_argument("--render", help="Video of the steps of a single log")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--stop", type=int, default=None, help="Step to stop before, the end of the episode by default")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--dataset", help="npz file of the transitions of every log")
+    args = parser.parse_args()
+
+    if args.render is not None and len(args.logs) != 1:
+        parser.error("--render takes a single log")
+
+    for path in args.logs:
+        log = EpisodeLog(path)
+        print(f"{path}: {log.num_steps} steps, reward {log.rewards.sum():.3f}")
+
+    if args.render is not None:
+        frames = EpisodeLog(args.logs[0]).render(args.render, args.start, args.stop, args.fps)
+        print(f"Rendered {frames} frames to {args.render}")
+
+    if args.dataset is not None:
+        transitions = export_dataset(args.logs, args.dataset)
+        print(f"Exported {transitions} transitions to {args.dataset}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import multiprocessing as mp
+import random
+from typing import Callable, Dict, List, Optional, Union
+import gym
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import (
+    CloudpickleWrapper,
+    VecEnv,
+    VecEnvObs,
+    VecEnvStepReturn,
+)
+from stable_baselines3.common.vec_env.subproc_vec_env import SubprocVecEnv
+from stable_baselines3.common.vec_env.util import dict_to_obs, obs_space_info
+
+# Seconds to wait for a worker to exit before it is terminated
+WORKER_JOIN_TIMEOUT = 5
+
+
+def _get_buffer_views(buffers: Dict, shapes: Dict, dtypes: Dict) -> Dict[str, np.ndarray]:
+    return {
+        key: np.frombuffer(buffers[key], dtype=dtypes[key]).reshape(shapes[key])
+        for key in buffers
+    }
+
+
+def _seed_worker(env: gym.Env, seed: Optional[int]):
+    # Forked workers would otherwise share the state of the process wide generators
+    if seed is None:
+        return None
+    random.seed(seed)
+    np.random.seed(seed)
+    return env.seed(seed)
+
+
+def _write_observation(views: Dict[str, np.ndarray], idx: int, obs: VecEnvObs) -> None:
+    for key, view in views.items():
+        view[idx] = obs if key is None else obs[key]
+
+
+def _shared_memory_worker(
+    remote: mp.connection.Connection,
+    parent_remote: mp.connection.Connection,
+    env_fn_wrapper: CloudpickleWrapper,
+    idx: int,
+    buffers: Dict,
+    shapes: Dict,
+    dtypes: Dict,
+    seed: Optional[int],
+) -> None:
+    # Import here to avoid a circular import
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    env = env_fn_wrapper.var()
+    _seed_worker(env, seed)
+    views = _get_buffer_views(buffers, shapes, dtypes)
+
+    while True:
+        try:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                observation, reward, done, info = env.step(data)
+                if done:
+                    # The terminal observation is only needed once per episode, so it is pickled with the info
+                    info["terminal_observation"] = observation
+                    observation = env.reset()
+                _write_observation(views, idx, observation)
+                remote.send((reward, done, info))
+            elif cmd == "reset":
+                _write_observation(views, idx, env.reset())
+                remote.send(None)
+            elif cmd == "seed":
+                remote.send(_seed_worker(env, data))
+            elif cmd == "render":
+                remote.send(env.render(data))
+            elif cmd == "close":
+                env.close()
+                remote.close()
+                break
+            elif cmd == "env_method":
+                method = getattr(env, data[0])
+                remote.send(method(*data[1], **data[2]))
+            elif cmd == "get_attr":
+                remote.send(getattr(env, data))
+            elif cmd == "set_attr":
+                remote.send(setattr(env, data[0], data[1]))
+            elif cmd == "is_wrapped":
+                remote.send(is_wrapped(env, data))
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+        except (EOFError, KeyboardInterrupt):
+            # The parent has exited, or an interrupt reached the whole process group and the parent will close
+            break
+
+
+class SharedMemoryVecEnv(SubprocVecEnv):
+    """
+    SubprocVecEnv whose workers write observations into shared memory buffers, one (num_envs, *shape) array per
+    observation key, instead of pickling them through the pipes. Only rewards, dones and infos are sent back each
+    step, which matters for the 145x145x100 dense observation of TippingPointEnv. Each worker seeds its process wide
+    random generators and environment with seed + its index.
+
+    @param env_fns: Functions creating the environment of each worker
+    @param seed: Base seed of the workers. When None, a base seed is drawn from numpy's global generator so forked
+        workers do not share random state
+    @param start_method: Method used to start the workers, see SubprocVecEnv
+    @param copy_observations: Return copies of the shared buffers. When False, observations are views that are
+        overwritten by the next step or reset, so they must not be kept, as learners such as PPO do
+    """
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        seed: Optional[int] = None,
+        start_method: Optional[str] = None,
+        copy_observations: bool = True,
+    ):
+        self.waiting = False
+        self.closed = False
+        self.copy_observations = copy_observations
+        n_envs = len(env_fns)
+
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        ctx = mp.get_context(start_method)
+
+        # The buffers are sized from the spaces before the workers start, as they can only be shared on creation
+        env = env_fns[0]()
+        observation_space, action_space = env.observation_space, env.action_space
+        env.close()
+
+        self.keys, shapes, dtypes = obs_space_info(observation_space)
+        shapes = {key: (n_envs, *shapes[key]) for key in self.keys}
+        buffers = {
+            key: ctx.RawArray("b", int(np.prod(shapes[key])) * np.dtype(dtypes[key]).itemsize)
+            for key in self.keys
+        }
+        self.buf_obs = _get_buffer_views(buffers, shapes, dtypes)
+
+        if seed is None:
+            seed = int(np.random.randint(0, 2**31 - n_envs))
+
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(n_envs)])
+        self.processes = []
+        for idx, (work_remote, remote, env_fn) in enumerate(
+            zip(self.work_remotes, self.remotes, env_fns)
+        ):
+            args = (
+                work_remote,
+                remote,
+                CloudpickleWrapper(env_fn),
+                idx,
+                buffers,
+                shapes,
+                dtypes,
+                seed + idx,
+            )
+            # daemon=True: if the main process crashes, the workers should not keep it from exiting
+            process = ctx.Process(target=_shared_memory_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        VecEnv.__init__(self, n_envs, observation_space, action_space)
+
+    def _obs_from_buf(self) -> VecEnvObs:
+        if self.copy_observations:
+            return dict_to_obs(
+                self.observation_space, {key: view.copy() for key, view in self.buf_obs.items()}
+            )
+        return dict_to_obs(self.observation_space, self.buf_obs)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        rews, dones, infos = zip(*results)
+        return self._obs_from_buf(), np.stack(rews), np.stack(dones), infos
+
+    def seed(self, seed: Optional[int] = None) -> List[Union[None, int]]:
+        if seed is None:
+            seed = int(np.random.randint(0, 2**31 - self.num_envs))
+        return super().seed(seed)
+
+    def reset(self) -> VecEnvObs:
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        for remote in self.remotes:
+            remote.recv()
+        return self._obs_from_buf()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            if self.waiting:
+                for remote in self.remotes:
+                    remote.recv()
+            for remote in self.remotes:
+                remote.send(("close", None))
+        except (BrokenPipeError, EOFError):
+            # A worker already exited, the rest are still joined below
+            pass
+
+        for process in self.processes:
+            process.join(WORKER_JOIN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for remote in self.remotes:
+            remote.close()
+        self.closed = True
@@ -0,0 +1,220 @@
+import functools
+import gc
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.logger import Logger
+
+# Phases of an environment and the methods timed as each, methods of a phase called within each other count once
+ENV_PHASES = {
+    "step": ["step"],
+    "reset": ["reset"],
+    "adjacency": ["_detect_adjacents"],
+    "action": ["_do_action"],
+    "collision": ["_move_collision"],
+    "copy_on_write": ["_get_writable"],
+    "observation": ["_export_observation"],
+    "scoring": ["_get_score_margin", "_get_potential", "_calculate_scores"],
+}
+
+# Phases not nested within a step, reported apart from its breakdown
+TOP_LEVEL_PHASES = ("step", "reset")
+
+
+class PhaseStats:
+    __slots__ = ("calls", "total", "own", "blocks")
+
+    def __init__(self):
+        self.calls = 0
+        # Seconds within the phase, and within it but outside the phases it called
+        self.total = 0.0
+        self.own = 0.0
+        # Net memory blocks allocated outside the phases it called
+        self.blocks = 0
+
+
+class StepProfiler:
+    """
+    Opt in instrumentation of TippingPointEnv. Attaching wraps the methods of each phase of an environment on that
+    instance alone, so environments without a profiler run unchanged code. Each phase is timed with the time spent in
+    the phases it called excluded, so the time of a step splits into its phases and the remainder of step itself.
+    Counters tally garbage collections, and the spatial queries and the entities they scanned through the stats of the
+    environment's spatial index.
+
+    @param track_allocations: Also count the net memory blocks allocated by each phase. Counting the blocks takes time
+        in proportion to the memory in use, inflating the times of the phases
+    """
+
+    def __init__(self, track_allocations: bool = False):
+        self.track_allocations = track_allocations
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters = Counter()
+        # Time and allocated blocks of the phases called by each phase being timed
+        self.__stack: List[list] = []
+        self.__envs = []
+
+    def __time_phase(self, phase: str, func):
+        stats = self.phases.setdefault(phase, PhaseStats())
+        step_stats = self.phases.setdefault("step", PhaseStats())
+        nested = phase not in TOP_LEVEL_PHASES
+        stack = self.__stack
+        get_blocks = sys.getallocatedblocks if self.track_allocations else int
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            # Phases are only timed within a step, and reentrant calls by their outermost call
+            if (nested and (not stack or stack[0][2] is not step_stats)) or (stack and stack[-1][2] is stats):
+                return func(*args, **kwargs)
+
+            frame = [0.0, 0, stats]
+            stack.append(frame)
+            blocks = get_blocks()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                allocated = get_blocks() - blocks
+                stack.pop()
+
+                stats.calls += 1
+                stats.total += elapsed
+                stats.own += elapsed - frame[0]
+                stats.blocks += allocated - frame[1]
+                if stack:
+                    stack[-1][0] += elapsed
+                    stack[-1][1] += allocated
+
+        return timed
+
+    @staticmethod
+    def __set_spatial_stats(env, stats) -> None:
+        env.spatial_stats = stats
+        if env._spatial_index is not None:
+            env._spatial_index.stats = stats
+
+    def __count_collection(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self.counters["gc_collections"] += 1
+
+    def attach(self, env) -> None:
+        """
+        Instruments an environment until detached
+        """
+        for phase, names in ENV_PHASES.items():
+            for name in names:
+                setattr(env, name, self.__time_phase(phase, getattr(env, name)))
+        self.__set_spatial_stats(env, self.counters)
+
+        if not self.__envs:
+            gc.callbacks.append(self.__count_collection)
+        self.__envs.append(env)
+
+    def detach(self, env) -> None:
+        """
+        Restores the methods of an environment
+        """
+        for names in ENV_PHASES.values():
+            for name in names:
+                env.__dict__.pop(name, None)
+        self.__set_spatial_stats(env, None)
+
+        self.__envs.remove(env)
+        if not self.__envs:
+            gc.callbacks.remove(self.__count_collection)
+
+    def reset_stats(self) -> None:
+        # Cleared in place, as the wrappers hold the stats of their phase
+        for stats in self.phases.values():
+            stats.__init__()
+        self.counters.clear()
+
+    def get_breakdown(self) -> List[Tuple[str, int, float, float, float]]:
+        """
+        Phases of a step by their time outside the phases they called, the remainder of step itself as "step (other)"
+
+        @return: Rows of phase, calls, microseconds per step, percent of step time and net blocks allocated per step
+        """
+        step = self.phases.get("step")
+        if step is None or not step.calls:
+            return []
+
+        rows = []
+        for phase, stats in self.phases.items():
+            if phase in TOP_LEVEL_PHASES and phase != "step":
+                continue
+            name = "step (other)" if phase == "step" else phase
+            rows.append(
+                (
+                    name,
+                    stats.calls,
+                    1e6 * stats.own / step.calls,
+                    100 * stats.own / step.total if step.total else 0.0,
+                    stats.blocks / step.calls,
+                )
+            )
+        return sorted(rows, key=lambda row: -row[2])
+
+    def format_breakdown(self) -> str:
+        step = self.phases.get("step")
+        if step is None or not step.calls:
+            return "No steps profiled"
+
+        header = f"{'phase':<14} {'calls':>9} {'us/step':>9} {'% step':>7}"
+        lines = [header + (" blocks/step" if self.track_allocations else "")]
+        for phase, calls, us, percent, blocks in self.get_breakdown():
+            line = f"{phase:<14} {calls:>9} {us:>9.1f} {percent:>6.1f}%"
+            lines.append(line + (f" {blocks:>11.1f}" if self.track_allocations else ""))
+
+        lines.append(
+            f"\n{step.calls} steps, {1e6 * step.total / step.calls:.1f} us/step, {step.calls / step.total:.1f} steps/sec"
+        )
+        reset = self.phases.get("reset")
+        if reset is not None and reset.calls:
+            lines.append(f"{reset.calls} resets, {1e3 * reset.total / reset.calls:.2f} ms/reset")
+
+        counts = ", ".join(f"{name} {count / step.calls:.1f}" for name, count in sorted(self.counters.items()))
+        if counts:
+            lines.append(f"per step: {counts}")
+        return "\n".join(lines)
+
+    def record(self, logger: Logger) -> None:
+        """
+        Records the breakdown and counters under "profile/" in a stable-baselines3 logger, such as the one writing
+        the TensorBoard log of a model, to be written on its next dump
+        """
+        step = self.phases.get("step")
+        if step is None or not step.calls:
+            return
+
+        for phase, _, us, percent, blocks in self.get_breakdown():
+            key = phase.replace(" ", "_").replace("(", "").replace(")", "")
+            logger.record(f"profile/{key}_us", us)
+            logger.record(f"profile/{key}_percent", percent)
+            if self.track_allocations:
+                logger.record(f"profile/{key}_blocks", blocks)
+        logger.record("profile/steps_per_sec", step.calls / step.total)
+        for name, count in self.counters.items():
+            logger.record(f"profile/{name}_per_step", count / step.calls)
+
+
+class StepProfilerCallback(BaseCallback):
+    """
+    Records the breakdown of a profiler into the model's logger, and so its TensorBoard log, after every rollout,
+    then starts the next breakdown afresh
+
+    @param profiler: Profiler attached to the environments being trained on, in this process
+    """
+
+    def __init__(self, profiler: StepProfiler, verbose: int = 0):
+        super().__init__(verbose)
+        self.profiler = profiler
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self) -> None:
+        self.profiler.record(self.logger)
+        self.profiler.reset_stats()
@@ -0,0 +1,43 @@
+from typing import Tuple
+import cv2
+import numpy as np
+
+
+class VideoWriter:
+    """
+    Streams RGB frames into a video file as they are produced, so recording an episode keeps a single frame in memory
+    however long it runs
+
+    @param path: Video file to write
+    @param frame_size: Width and height of the frames in pixels, see RasterRenderer.frame_size
+    @param fps: Frames per second of the video
+    @param fourcc: Codec of the video
+    """
+
+    def __init__(self, path: str, frame_size: Tuple[int, int], fps: float = 30, fourcc: str = "mp4v"):
+        self.frame_size = frame_size
+        self.frames = 0
+        self.__writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, frame_size)
+        if not self.__writer.isOpened():
+            raise IOError(f"Could not open {path} for writing")
+
+        # OpenCV expects BGR frames, converted into a reused buffer
+        width, height = frame_size
+        self.__bgr = np.empty((height, width, 3), dtype=np.uint8)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        @param frame: (height, width, 3) uint8 RGB frame
+        """
+        cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=self.__bgr)
+        self.__writer.write(self.__bgr)
+        self.frames += 1
+
+    def close(self) -> None:
+        self.__writer.release()
@@ -1,17 +1,11 @@
 from cmath import log
+import argparse
 import os
 import gym
-import matplotlib.pyplot as plt
-import io
 import os
-import cv2
 import gym
-import matplotlib
-from matplotlib.transforms import Bbox
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 from stable_baselines3.common.vec_env.dummy_vec_env import DummyVecEnv
 from stable_baselines3.common.vec_env.vec_transpose import VecTransposeImage
 from stable_baselines3.common.env_checker import check_env
@@ -19,24 +13,52 @@ from stable_baselines3.ppo import PPO
 from stable_baselines3.common.callbacks import CheckpointCallback
 from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env.vec_monitor import VecMonitor
 from rl_training.environment import TippingPointEnv
+from rl_training.sharedMemoryVecEnv import SharedMemoryVecEnv
+from rl_training.stepProfiler import StepProfiler, StepProfilerCallback
+from rl_training.videoWriter import VideoWriter
 from entities.fieldConfigurations import starting_representation
 
 
-def train_model(train=True, model_path=None, render=False):
+def train_model(train=True, model_path=None, render=False, num_workers=1, seed=None, profile=False):
+    """
+    @param num_workers: Number of environment processes used for training. A single worker runs in process
+    @param seed: Base seed of the training environments, each worker uses seed + its index
+    @param profile: Time the phases of the environment's steps, recorded to the TensorBoard log under "profile/" after
+        every rollout. Only an environment in process can be profiled, so this requires a single worker
+    """
     # Logging
     log_dir = "logs/"
     os.makedirs(log_dir, exist_ok=True)
 
     # Environment
     steps = 1000
-    env = TippingPointEnv(steps)
-    # check_env(env)
     model = None
 
+    if profile and num_workers > 1:
+        raise ValueError("Profiling requires a single worker, as workers step their environments in other processes")
+    profiler = StepProfiler() if profile else None
+
     if train:
-        env = Monitor(env)
-        env = DummyVecEnv([lambda: env])
+        if num_workers > 1:
+            # Observations come back through shared memory. They are copied out of it, as PPO only stores the
+            # observation of a step in its rollout buffer after taking the next one
+            env = SharedMemoryVecEnv(
+                [lambda: TippingPointEnv(steps, copy_observations=False)] * num_workers,
+                seed=seed,
+            )
+            env = VecMonitor(env)
+        else:
+            # The VecEnv copies observations out of the environment buffers on every step
+            env = TippingPointEnv(steps, copy_observations=False)
+            # check_env(env)
+            if profiler is not None:
+                profiler.attach(env)
+            env = Monitor(env)
+            env = DummyVecEnv([lambda: env])
+            if seed is not None:
+                env.seed(seed)
         # env = VecTransposeImage(env)
 
         # Policy network
@@ -48,48 +70,47 @@ def train_model(train=True, model_path=None, render=False):
         model = PPO(
             "MultiInputPolicy", env, verbose=2, tensorboard_log=log_dir + "/tensorboard"
         )
-        model.learn(total_timesteps=int(timesteps), callback=checkpoint_callback)
+        try:
+            callbacks = [checkpoint_callback]
+            if profiler is not None:
+                callbacks.append(StepProfilerCallback(profiler))
+            model.learn(total_timesteps=int(timesteps), callback=callbacks)
+        finally:
+            if num_workers > 1:
+                # Shut the workers down, rendering steps an environment in process
+                env.close()
+                env = DummyVecEnv([lambda: TippingPointEnv(steps)])
+    else:
+        env = TippingPointEnv(steps, copy_observations=False)
 
     if render or model_path:
-        matplotlib.use("Agg")
-        imgs = []
         # obs = env.reset()
         obs = starting_representation().export_to_dict()
-        fig = plt.figure()
-        canvas = FigureCanvas(fig)
 
         if model_path:
             model = PPO.load(log_dir + model_path)
 
-        for i in range(1000):
-            action, _states = model.predict(obs)
-            # action = env.action_space.sample()
-            obs, rewards, done, info = env.step(action)
-            ax = env.render()
-
-            # ax.axis("off")
-            ax.figure.canvas.draw()
-            # trans = ax.figure.dpi_scale_trans.inverted()
-            # bbox = ax.bbox.transformed(trans)
-            bbox = Bbox([[1.0, 1.0], [15, 10.75]])
-            buff = io.BytesIO()
-            plt.savefig(
-                buff, format="jpg", dpi=ax.figure.dpi, bbox_inches=bbox, pad_inches=2
-            )
-            buff.seek(0)
-            imgs.append(cv2.cvtColor(plt.imread(buff, "jpg"), cv2.COLOR_RGB2BGR))
-            plt.close("all")
-
-        im_height, im_width, im_layers = imgs[0].shape
-        video = cv2.VideoWriter(
-            "training.mp4", cv2.VideoWriter_fourcc(*"mp4v"), 30, (im_width, im_height)
-        )
-
-        for img in imgs:
-            video.write(img)
-
-        video.release()
-
+        # Frames are drawn headless and streamed to the video as they are produced
+        height, width, _ = env.render(mode="rgb_array").shape
+        with VideoWriter("training.mp4", (width, height), 30) as video:
+            for i in range(1000):
+                action, _states = model.predict(obs)
+                # action = env.action_space.sample()
+                obs, rewards, done, info = env.step(action)
+                video.write(env.render(mode="rgb_array"))
 
 if __name__ == "__main__":
-    train_model(train=False, model_path="/cpu/strategyrl_model_40000_steps")
+    parser = argparse.ArgumentParser()
+    # Batch jobs run one worker per allocated CPU
+    parser.add_argument("--num-workers", type=int, default=int(os.environ.get("SLURM_CPUS_PER_TASK", 1)))
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--profile", action="store_true", help="Record the phases of steps, with a single worker")
+    parser.add_argument(
+        "--model-path", help="Render a model saved under logs/, such as /cpu/strategyrl_model_40000_steps, instead"
+    )
+    args = parser.parse_args()
+
+    if args.model_path is None:
+        train_model(num_workers=args.num_workers, seed=args.seed, profile=args.profile)
+    else:
+        train_model(train=False, model_path=args.model_path)
@@ -0,0 +1,120 @@
+import copy
+import json
+import random
+import unittest
+from src.entities.entityRegistry import EntityRegistry
+from src.entities.fieldConfigurations import starting_representation
+from src.entities.fieldRepresentation import FieldRepresentation
+from src.entities.mathUtils import Pose2D
+from src.entities.scoring_elements import LowNeutralGoal, Ring
+
+
+class TestEntityRegistry(unittest.TestCase):
+    def test_ids_are_stable(self):
+        registry = EntityRegistry()
+        ring = Ring(Pose2D(0, 0))
+        goal = LowNeutralGoal(Pose2D(0, 0))
+
+        self.assertEqual(registry.register(ring), 0)
+        self.assertEqual(registry.register(goal), 1)
+        self.assertEqual(registry.register(ring), 0)
+        self.assertIs(registry.get(1), goal)
+        self.assertEqual(len(registry), 2)
+
+    def test_equal_entities_are_distinct(self):
+        registry = EntityRegistry()
+        pose = Pose2D(10, 10)
+        first = LowNeutralGoal(pose)
+        second = LowNeutralGoal(pose)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(registry.register(first), registry.register(second))
+
+    def test_unregister(self):
+        registry = EntityRegistry()
+        ring = Ring(Pose2D(0, 0))
+        ring_id = registry.register(ring)
+
+        self.assertEqual(registry.unregister(ring), ring_id)
+        self.assertNotIn(ring, registry)
+        self.assertRaises(KeyError, registry.get, ring_id)
+
+        # Ids are never reused
+        self.assertNotEqual(registry.register(Ring(Pose2D(0, 0))), ring_id)
+
+    def test_deepcopy_follows_entities(self):
+        rep = starting_representation()
+        rep_copy = copy.deepcopy(rep)
+
+        for ent, ent_copy in zip(rep.goals + rep.rings, rep_copy.goals + rep_copy.rings):
+            self.assertIsNot(ent, ent_copy)
+            self.assertEqual(rep.get_entity_id(ent), rep_copy.get_entity_id(ent_copy))
+
+
+class TestFieldRepresentationIds(unittest.TestCase):
+    def get_entities(self, rep):
+        entities = []
+        for ent in [
+            *rep.robots,
+            *rep.goals,
+            *rep.rings,
+            *rep.red_platform.robots,
+            *rep.red_platform.goals,
+            *rep.red_platform.rings,
+            *rep.blue_platform.robots,
+            *rep.blue_platform.goals,
+            *rep.blue_platform.rings,
+        ]:
+            entities += [ent, *getattr(ent, "goals", []), *getattr(ent, "rings", [])]
+        return entities
+
+    def test_randomize_assigns_unique_ids(self):
+        random.seed(0)
+        found_stacked = False
+
+        for _ in range(20):
+            rep = FieldRepresentation()
+            rep.randomize()
+            entities = self.get_entities(rep)
+
+            poses = [id(ent.pose) for ent in entities]
+            found_stacked = found_stacked or len(set(poses)) < len(poses)
+
+            ids = [rep.get_entity_id(ent) for ent in entities]
+            self.assertEqual(len(set(ids)), len(ids))
+            for ent, ent_id in zip(entities, ids):
+                self.assertIs(rep.get_entity(ent_id), ent)
+
+        # Platforms and robots stack entities on a shared pose
+        self.assertTrue(found_stacked)
+
+    def test_remove_stacked_goal(self):
+        pose = Pose2D(0, 60)
+        goals = [LowNeutralGoal(pose), LowNeutralGoal(pose), LowNeutralGoal(pose)]
+        rep = FieldRepresentation(goals=list(goals))
+        goal_id = rep.get_entity_id(goals[1])
+
+        rep.remove_from_field(goals[1])
+        self.assertEqual([id(goal) for goal in rep.goals], [id(goals[0]), id(goals[2])])
+        self.assertRaises(ValueError, rep.remove_from_field, goals[1])
+
+        self.assertEqual(rep.add_to_field(goals[1]), goal_id)
+        self.assertIs(rep.goals[-1], goals[1])
+
+    def test_remove_stacked_rings(self):
+        pose = Pose2D(0, 60)
+        rings = [Ring(pose) for _ in range(4)]
+        rep = FieldRepresentation(rings=list(rings))
+
+        rep.remove_from_field(rings[0], rings[2])
+        self.assertEqual([id(ring) for ring in rep.rings], [id(rings[1]), id(rings[3])])
+
+    def test_json_excludes_registry(self):
+        rep = starting_representation()
+
+        self.assertNotIn("_registry", json.loads(rep.as_json()))
+        self.assertNotIn("_registry", json.loads(rep.to_json()))
+
+
+if __name__ == "__main__":
+    unittest.main()
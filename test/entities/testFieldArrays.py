@@ -0,0 +1,188 @@
+import json
+import unittest
+import numpy as np
+from src.entities.enumerations import Color
+from src.entities.fieldArrays import ArrayFieldRepresentation
+from src.entities.fieldConfigurations import ending_representation, starting_representation
+from src.entities.fieldRepresentation import FieldRepresentation
+from src.entities.mathUtils import Pose2D, distance_between_entities
+from src.entities.robots import HostRobot, PartnerRobot
+from src.entities.scoring_elements import Ring
+
+
+class ArrayParityTestCase(unittest.TestCase):
+    representations = {
+        "starting": starting_representation,
+        "ending": ending_representation,
+    }
+
+    def assert_dicts_equal(self, expected, actual):
+        self.assertEqual(expected.keys(), actual.keys())
+        for key in expected:
+            np.testing.assert_array_equal(expected[key], actual[key], err_msg=key)
+
+
+class TestArrayConversion(ArrayParityTestCase):
+    def test_round_trip(self):
+        for name, factory in self.representations.items():
+            with self.subTest(name):
+                rep = factory()
+                arrays = ArrayFieldRepresentation.from_representation(rep)
+
+                self.assertEqual(
+                    json.loads(rep.as_json()), json.loads(arrays.to_representation().as_json())
+                )
+
+    def test_view_counts(self):
+        for name, factory in self.representations.items():
+            with self.subTest(name):
+                rep = factory()
+                arrays = ArrayFieldRepresentation.from_representation(rep)
+
+                self.assertEqual(len(rep.rings), len(arrays.rings))
+                self.assertEqual(len(rep.goals), len(arrays.goals))
+                self.assertEqual(len(rep.robots), len(arrays.robots))
+
+                for platform, platform_view in [
+                    (rep.red_platform, arrays.red_platform),
+                    (rep.blue_platform, arrays.blue_platform),
+                ]:
+                    self.assertEqual(platform.state, platform_view.state)
+                    self.assertEqual(len(platform.goals), len(platform_view.goals))
+                    self.assertEqual(len(platform.robots), len(platform_view.robots))
+
+                    for robot, robot_view in zip(platform.robots, platform_view.robots):
+                        self.assertEqual(len(robot.rings), len(robot_view.rings))
+                        self.assertEqual(len(robot.goals), len(robot_view.goals))
+
+
+class TestArrayExport(ArrayParityTestCase):
+    def test_dense_parity(self):
+        for name, factory in self.representations.items():
+            with self.subTest(name):
+                rep = factory()
+                arrays = ArrayFieldRepresentation.from_representation(rep)
+
+                self.assert_dicts_equal(rep.export_to_dict(), arrays.export_to_dict())
+
+    def test_entity_list_parity(self):
+        for name, factory in self.representations.items():
+            with self.subTest(name):
+                rep = factory()
+                arrays = ArrayFieldRepresentation.from_representation(rep)
+
+                np.testing.assert_array_equal(
+                    rep.export_to_entity_list(), arrays.export_to_entity_list()
+                )
+
+    def test_no_host_parity(self):
+        rep = FieldRepresentation(
+            rings=[Ring(Pose2D(10, 10))], robots=[PartnerRobot(Color.RED, Pose2D(30, 30))]
+        )
+        arrays = ArrayFieldRepresentation.from_representation(rep)
+
+        for export in [
+            rep.export_to_dict,
+            rep.export_to_entity_list,
+            arrays.export_to_dict,
+            arrays.export_to_entity_list,
+        ]:
+            with self.subTest(export.__qualname__):
+                with self.assertRaises(ValueError):
+                    export()
+
+
+class TestArrayScoring(ArrayParityTestCase):
+    def test_goal_score_parity(self):
+        for name, factory in self.representations.items():
+            for color in [Color.RED, Color.BLUE]:
+                with self.subTest(name, color=color):
+                    rep = factory()
+                    arrays = ArrayFieldRepresentation.from_representation(rep)
+
+                    expected = sum(goal.get_current_score(color) for goal in rep.goals)
+                    self.assertEqual(expected, arrays.get_field_goal_score(color))
+
+                    for goal, goal_view in zip(rep.goals, arrays.goals):
+                        self.assertEqual(goal.get_current_zone(), goal_view.get_current_zone())
+                        self.assertEqual(goal.get_ring_score(), goal_view.get_ring_score())
+                        self.assertEqual(
+                            goal.get_current_score(color), goal_view.get_current_score(color)
+                        )
+
+    def test_platform_score(self):
+        arrays = ArrayFieldRepresentation.from_representation(ending_representation())
+
+        # One red robot on the red platform, one blue goal and two blue robots on the blue platform
+        self.assertEqual(arrays.red_platform.get_current_score(), 30)
+        self.assertEqual(arrays.blue_platform.get_current_score(), 100)
+
+
+class TestArrayGeometry(ArrayParityTestCase):
+    def test_collision_parity(self):
+        for name, factory in self.representations.items():
+            with self.subTest(name):
+                rep = factory()
+                arrays = ArrayFieldRepresentation.from_representation(rep)
+                entities = [*rep.rings, *rep.goals, *rep.robots]
+                views = [*arrays.rings, *arrays.goals, *arrays.robots]
+
+                for probe in [Ring(Pose2D(x, 72)) for x in range(-72, 73, 6)]:
+                    expected = [i for i, ent in enumerate(entities) if ent.is_colliding(probe)]
+                    colliding = set(arrays.get_colliding(probe.pose, probe.radius))
+                    actual = [i for i, view in enumerate(views) if view.idx in colliding]
+
+                    self.assertEqual(expected, actual)
+
+    def test_adjacency_parity(self):
+        rep = starting_representation()
+        host = rep.robots[0]
+        host.pose = Pose2D(-40, 72, 0)
+        arrays = ArrayFieldRepresentation.from_representation(rep)
+        host_view = arrays.robots[0]
+
+        for distance in [0, 2, 10, 30]:
+            adjacent_goals, adjacent_rings = arrays.get_adjacent(host_view.idx, distance)
+
+            self.assertEqual(
+                [i for i, goal in enumerate(rep.goals) if distance_between_entities(goal, host) <= distance],
+                [i for i, goal in enumerate(arrays.goals) if goal.idx in adjacent_goals],
+            )
+            self.assertEqual(
+                [i for i, ring in enumerate(rep.rings) if distance_between_entities(ring, host) <= distance],
+                [i for i, ring in enumerate(arrays.rings) if ring.idx in adjacent_rings],
+            )
+
+
+class TestArrayMutation(ArrayParityTestCase):
+    def test_pick_up_and_release(self):
+        rep = starting_representation()
+        arrays = ArrayFieldRepresentation.from_representation(rep)
+        host = arrays.robots[0]
+        goal = arrays.goals[0]
+
+        arrays.pick_up(host.idx, goal.idx)
+        self.assertEqual(len(arrays.goals), len(rep.goals) - 1)
+        self.assertEqual(host.goals, [goal])
+
+        arrays.release(goal.idx, Pose2D(0, 30))
+        self.assertEqual(arrays.goals[-1], goal)
+        self.assertEqual(host.goals, [])
+
+        # Released goals are exported after goals that never moved, as in the object model
+        rep.goals.append(rep.goals.pop(0))
+        rep.goals[-1].pose = Pose2D(0, 30)
+        self.assert_dicts_equal(rep.export_to_dict(), arrays.export_to_dict())
+
+    def test_place_ring(self):
+        arrays = ArrayFieldRepresentation.from_representation(starting_representation())
+        goal = arrays.goals[0]
+        ring = arrays.rings[0]
+
+        self.assertTrue(goal.add_ring(ring, goal.level))
+        self.assertEqual(goal.get_total_rings(), 1)
+        self.assertNotIn(ring, arrays.rings)
+
+
+if __name__ == "__main__":
+    unittest.main()
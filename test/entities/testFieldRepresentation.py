@@ -0,0 +1,234 @@
+import logging
+import unittest
+import numpy as np
+from src.entities.constants import MAX_NUM_OBSERVED_ENTITIES, REPRESENTATION_LOGGER_NAME
+from src.entities.enumerations import Color, EntityFeature
+from src.entities.fieldConfigurations import ending_representation, starting_representation
+from src.entities.fieldRepresentation import (
+    FieldRepresentation,
+    ObservationBuffers,
+    entity_list_to_dict,
+)
+from src.entities.fieldSnapshot import REMOVED, FieldSnapshot
+from src.entities.mathUtils import Pose2D
+from src.entities.platforms import PlatformState
+from src.entities.robots import HostRobot
+
+
+class TestEntityListExport(unittest.TestCase):
+    def assert_dense_parity(self, rep):
+        dense = rep.export_to_dict()
+        converted = entity_list_to_dict(rep.export_to_entity_list())
+
+        self.assertEqual(dense.keys(), converted.keys())
+        for key in dense:
+            np.testing.assert_array_equal(dense[key], converted[key], err_msg=key)
+
+    def test_shape(self):
+        entities = starting_representation().export_to_entity_list()
+
+        self.assertEqual(entities.shape, (MAX_NUM_OBSERVED_ENTITIES, len(EntityFeature)))
+        self.assertEqual(entities.dtype, np.float32)
+
+    def test_unused_rows_empty(self):
+        rep = starting_representation()
+        entities = rep.export_to_entity_list()
+        num_entities = len(rep.rings) + len(rep.goals) + len(rep.robots)
+
+        np.testing.assert_array_equal(
+            entities[:num_entities, EntityFeature.ID], np.arange(1, num_entities + 1)
+        )
+        self.assertFalse(np.any(entities[num_entities:]))
+
+    def test_starting_dense_parity(self):
+        self.assert_dense_parity(starting_representation())
+
+    def test_ending_dense_parity(self):
+        self.assert_dense_parity(ending_representation())
+
+
+class TestRandomize(unittest.TestCase):
+    def randomize(self, seed):
+        rep = FieldRepresentation()
+        rep.randomize(np.random.default_rng(seed))
+        return rep
+
+    def test_same_seed_same_layout(self):
+        for seed in range(10):
+            first = self.randomize(seed)
+            second = self.randomize(seed)
+
+            self.assertEqual(first.to_json(), second.to_json())
+            np.testing.assert_array_equal(
+                first.export_to_entity_list(), second.export_to_entity_list()
+            )
+
+    def test_different_seeds_differ(self):
+        self.assertNotEqual(self.randomize(0).to_json(), self.randomize(1).to_json())
+
+    def test_entity_counts(self):
+        rep = self.randomize(0)
+        counts = rep.field_counts
+
+        self.assertEqual(counts.get_remaining_goals(), 0)
+        self.assertEqual(counts.get_remaining_robots(), 0)
+        self.assertEqual(counts.get_remaining_rings(), 0)
+
+    def test_chains_spawn_without_errors(self):
+        # Goals and robots spawned in chains are only drawn from the kinds with some left
+        records = []
+        handler = logging.Handler(logging.ERROR)
+        handler.emit = records.append
+        logger = logging.getLogger(REPRESENTATION_LOGGER_NAME)
+        logger.addHandler(handler)
+        try:
+            for seed in range(200):
+                self.randomize(seed)
+        finally:
+            logger.removeHandler(handler)
+
+        self.assertEqual([record.getMessage() for record in records], [])
+
+
+class TestObservationBuffers(unittest.TestCase):
+    def test_dtype(self):
+        obs = starting_representation().export_to_dict()
+
+        for key, arr in obs.items():
+            self.assertEqual(arr.dtype, np.uint8, key)
+
+    def test_buffered_matches_allocated(self):
+        rep = starting_representation()
+        buffers = ObservationBuffers()
+
+        rep.export_to_dict(buffers)
+        rep.robots[0].pose = Pose2D(10, 20, 0)
+        rep.rings.pop()
+
+        expected = rep.export_to_dict()
+        buffered = rep.export_to_dict(buffers)
+
+        for key in expected:
+            np.testing.assert_array_equal(expected[key], buffered[key], err_msg=key)
+
+    def test_copy_and_view(self):
+        rep = starting_representation()
+        buffers = ObservationBuffers()
+
+        view = rep.export_to_dict(buffers, copy=False)
+        copied = rep.export_to_dict(buffers, copy=True)
+
+        self.assertTrue(np.shares_memory(view["location"], buffers.location))
+        self.assertFalse(np.shares_memory(copied["location"], buffers.location))
+
+        rep.rings.clear()
+        rep.export_to_dict(buffers, copy=False)
+
+        self.assertNotEqual(np.count_nonzero(copied["location"]), np.count_nonzero(view["location"]))
+
+
+class TestStateHash(unittest.TestCase):
+    def test_restores_after_undo(self):
+        rep = starting_representation()
+        expected = rep.get_state_hash()
+        host = next(robot for robot in rep.robots if type(robot) is HostRobot)
+        pose, state = host.pose, rep.red_platform.state
+
+        rep.set_pose(host, Pose2D(pose.x + 1, pose.y))
+        rep.set_platform_state(rep.red_platform, PlatformState.RIGHT)
+        self.assertNotEqual(rep.get_state_hash(), expected)
+        self.assertEqual(rep.get_state_hash(), rep.compute_state_hash())
+
+        rep.set_pose(host, pose)
+        rep.set_platform_state(rep.red_platform, state)
+        self.assertEqual(rep.get_state_hash(), expected)
+
+    def test_capture_release_and_place(self):
+        rep = starting_representation()
+        host = next(robot for robot in rep.robots if type(robot) is HostRobot)
+        first, second = rep.rings[:2]
+        goal = rep.goals[0]
+
+        rep.capture(host, first, second)
+        self.assertEqual(rep.get_state_hash(), rep.compute_state_hash())
+
+        rep.release(host, first, Pose2D(10, 10))
+        self.assertEqual(rep.get_state_hash(), rep.compute_state_hash())
+
+        level = max(goal.ring_containers, key=lambda lvl: goal.ring_containers[lvl].get_remaining_utilization())
+        self.assertTrue(rep.place_ring(host, second, goal, level))
+        self.assertEqual(rep.get_state_hash(), rep.compute_state_hash())
+
+
+class TestChangeRecords(unittest.TestCase):
+    def test_apply_replays_changes(self):
+        rep = starting_representation()
+        replay = FieldRepresentation.from_snapshot(FieldSnapshot.from_bytes(rep.snapshot().to_bytes()))
+        rep.track_changes()
+
+        host = next(robot for robot in rep.robots if type(robot) is HostRobot)
+        goal = rep.goals[0]
+        level = min(goal.ring_containers, key=lambda lvl: goal.ring_containers[lvl].get_remaining_utilization())
+        # One ring more than the level holds, so the last placed leaves the field
+        rings = rep.rings[: goal.ring_containers[level].get_remaining_utilization() + 2]
+
+        rep.set_pose(host, Pose2D(host.pose.x + 1, host.pose.y))
+        rep.capture(host, goal, *rings)
+        rep.release(host, rings[0], Pose2D(10, 10))
+        placed = [rep.place_ring(host, ring, goal, level) for ring in rings[1:]]
+        self.assertEqual(placed[-1], False)
+
+        records = rep.pop_changed_records()
+        self.assertEqual(records[-1][2], REMOVED)
+        self.assertEqual(rep.pop_changed_records(), [])
+
+        replay.apply_records(records)
+        self.assertEqual(replay.snapshot().to_bytes(), rep.snapshot().to_bytes())
+        self.assertEqual(replay.get_state_hash(), rep.get_state_hash())
+
+
+class TestPlatformScore(unittest.TestCase):
+    def test_follows_platform_state(self):
+        rep = ending_representation()
+        for color, platform in [(Color.RED, rep.red_platform), (Color.BLUE, rep.blue_platform)]:
+            for state in [PlatformState.LEVEL, PlatformState.LEFT, PlatformState.LEVEL]:
+                rep.set_platform_state(platform, state)
+                self.assertEqual(rep.get_platform_score(color), platform.get_current_score())
+
+        self.assertGreater(rep.get_platform_score(Color.RED) + rep.get_platform_score(Color.BLUE), 0)
+
+    def assert_platform_parity(self, rep):
+        for color, platform in [(Color.RED, rep.red_platform), (Color.BLUE, rep.blue_platform)]:
+            self.assertEqual(rep.get_platform_score(color), platform.get_current_score())
+        self.assertEqual(rep.get_state_hash(), rep.compute_state_hash())
+
+    def test_follows_platform_contents(self):
+        rep = starting_representation()
+        rep.set_platform_state(rep.red_platform, PlatformState.LEVEL)
+        rep.set_platform_state(rep.blue_platform, PlatformState.LEVEL)
+        goal = next(goal for goal in rep.goals if goal.color == Color.NEUTRAL)
+        robot = next(robot for robot in rep.robots if robot.color == Color.RED)
+        ring = rep.rings[0]
+
+        for ent in [goal, robot, ring]:
+            rep.remove_from_field(ent)
+            rep.add_to_platform(rep.red_platform, ent)
+            self.assert_platform_parity(rep)
+        self.assertEqual(rep.get_platform_score(Color.RED), 70)
+
+        rep.add_to_platform(rep.blue_platform, HostRobot(Color.RED, Pose2D(0, 0)))
+        self.assert_platform_parity(rep)
+
+        rep.set_platform_state(rep.red_platform, PlatformState.LEFT)
+        self.assert_platform_parity(rep)
+        rep.set_platform_state(rep.red_platform, PlatformState.LEVEL)
+
+        for ent in [robot, goal]:
+            rep.remove_from_platform(rep.red_platform, ent)
+            rep.add_to_field(ent)
+            self.assert_platform_parity(rep)
+        self.assertEqual(rep.get_platform_score(Color.RED), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import copy
+import unittest
+from dataclasses import fields
+from src.entities.fieldConfigurations import ending_representation, starting_representation
+from src.entities.fieldRepresentation import FieldRepresentation
+from src.entities.fieldSnapshot import FieldSnapshot
+from src.entities.enumerations import Color
+from src.entities.mathUtils import Pose2D
+from src.entities.platforms import PlatformState
+from src.entities.scoring_elements import GoalLevel
+
+
+def encode(rep):
+    return rep.snapshot().to_bytes()
+
+
+def get_holding_robot(rep):
+    robots = rep.robots + rep.red_platform.robots + rep.blue_platform.robots
+    return next(robot for robot in robots if robot.goals)
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_restore_undoes_changes(self):
+        rep = ending_representation()
+        saved = rep.snapshot()
+        expected = saved.to_bytes()
+
+        host = rep.get_writable(get_holding_robot(rep))
+        host.pose = Pose2D(1, 2)
+        goal = rep.get_writable(host.goals[0])
+        goal.tipped = True
+        rep.red_platform.state = PlatformState.LEFT
+        rep.remove_from_field(rep.rings[0])
+
+        self.assertNotEqual(encode(rep), expected)
+        rep.restore(saved)
+        self.assertEqual(encode(rep), expected)
+
+    def test_bytes_round_trip(self):
+        for rep in [starting_representation(), ending_representation()]:
+            data = encode(rep)
+            restored = FieldRepresentation.from_snapshot(FieldSnapshot.from_bytes(data))
+
+            self.assertEqual(encode(restored), data)
+            self.assertEqual(restored.field_counts, rep.field_counts)
+            self.assertEqual(
+                restored.export_to_entity_list().tolist(), rep.export_to_entity_list().tolist()
+            )
+
+    def test_bytes_keep_ids(self):
+        rep = ending_representation()
+        restored = FieldRepresentation.from_snapshot(FieldSnapshot.from_bytes(encode(rep)))
+        held = get_holding_robot(rep).goals[0]
+
+        self.assertEqual(
+            restored.get_entity_id(get_holding_robot(restored).goals[0]), rep.get_entity_id(held)
+        )
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            FieldSnapshot.from_bytes(b"\0" * 128)
+
+
+def describe(ent):
+    """
+    Type and every field of an entity, with held and scored entities described in turn
+    """
+    described = [type(ent).__name__]
+    for field in fields(ent):
+        value = getattr(ent, field.name)
+        if field.name == "pose":
+            value = (value.x, value.y, value.angle)
+        elif field.name in ["rings", "goals"]:
+            value = [describe(held) for held in value]
+        elif field.name == "ring_containers":
+            value = {
+                level: (container.max_storage, [describe(ring) for ring in container.rings])
+                for level, container in value.items()
+            }
+        described.append((field.name, value))
+    return described
+
+
+def describe_field(rep):
+    platforms = [rep.red_platform, rep.blue_platform]
+    return (
+        [platform.state for platform in platforms],
+        [[describe(ent) for ent in getattr(container, name)] for container in [rep, *platforms]
+         for name in ["rings", "goals", "robots"]],
+        rep.field_counts,
+    )
+
+
+class TestFieldBytes(unittest.TestCase):
+    def test_round_trips_entities(self):
+        for rep in [starting_representation(), ending_representation()]:
+            restored = FieldRepresentation.from_bytes(rep.to_bytes())
+
+            self.assertEqual(describe_field(restored), describe_field(rep))
+            self.assertEqual(restored.get_state_hash(), rep.get_state_hash())
+            self.assertEqual(restored.get_state_hash(), restored.compute_state_hash())
+            for color in [Color.RED, Color.BLUE]:
+                self.assertEqual(restored.get_goal_score(color), rep.get_goal_score(color))
+
+    def test_matches_snapshot_encoding(self):
+        rep = ending_representation()
+
+        self.assertEqual(rep.to_bytes(), encode(rep))
+        self.assertEqual(FieldRepresentation.from_bytes(encode(rep)).to_bytes(), encode(rep))
+
+    def test_rejects_truncated_data(self):
+        data = ending_representation().to_bytes()
+        for end in [10, len(data) - 1]:
+            with self.assertRaises(ValueError):
+                FieldRepresentation.from_bytes(data[:end])
+
+
+class TestFork(unittest.TestCase):
+    def test_fork_shares_entities(self):
+        rep = starting_representation()
+        fork = rep.fork()
+
+        self.assertIs(fork.robots[0], rep.robots[0])
+        self.assertIs(fork.goals[0], rep.goals[0])
+        self.assertIsNot(fork.robots, rep.robots)
+
+    def test_changes_stay_in_branch(self):
+        rep = ending_representation()
+        expected = encode(rep)
+        fork = rep.fork()
+
+        robot = get_holding_robot(fork)
+        held = robot.goals[0]
+        writable_held = fork.get_writable(held)
+        writable_held.tipped = True
+
+        # The goal's holder was copied along with it
+        self.assertIsNot(get_holding_robot(fork), robot)
+        self.assertIs(get_holding_robot(fork).goals[0], writable_held)
+
+        goal = fork.goals[0]
+        ring = goal.get_ring_container(GoalLevel.BASE).rings[0]
+        writable = fork.get_writable(ring)
+        writable.pose = Pose2D(5, 5)
+
+        self.assertIsNot(fork.goals[0], goal)
+        self.assertIs(fork.goals[0].get_ring_container(GoalLevel.BASE).rings[0], writable)
+        self.assertEqual(fork.get_entity_id(writable), rep.get_entity_id(ring))
+        self.assertIs(fork.get_entity(fork.get_entity_id(writable)), writable)
+        self.assertEqual(encode(rep), expected)
+
+        # The parent copies shared entities too, rather than changing the fork's
+        partner = rep.get_writable(rep.robots[0])
+        partner.pose = Pose2D(0, 0)
+        self.assertIsNot(fork.robots[0], partner)
+
+    def test_writable_is_reused(self):
+        fork = starting_representation().fork()
+        host = fork.get_writable(fork.robots[0])
+
+        self.assertIs(fork.get_writable(host), host)
+
+    def test_matches_deepcopy(self):
+        rep = ending_representation()
+
+        self.assertEqual(encode(rep.fork()), encode(copy.deepcopy(rep)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import inspect
+import io
+import json
+import logging
+import unittest
+import numpy as np
+from src.entities.constants import REPRESENTATION_LOGGER_NAME
+from src.entities.fieldRepresentation import FieldRepresentation
+from src.entities.logUtils import SPAWN_SUMMARY_ATTR, SpawnSummaryHandler, get_lazy_logger
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("Message was formatted")
+
+
+class TestLazyLogger(unittest.TestCase):
+    def test_disabled_level(self):
+        log = get_lazy_logger("test/lazy")
+        log.logger.setLevel(logging.WARNING)
+
+        log.info("Value %s", Unformattable())
+        with self.assertLogs(log.logger, logging.WARNING) as logs:
+            log.warning("Value %s", 1)
+
+        self.assertIs(get_lazy_logger("test/lazy"), log)
+        self.assertEqual(logs.output, ["WARNING:test/lazy:Value 1"])
+
+    def test_records_name_caller(self):
+        log = get_lazy_logger("test/lazy")
+        with self.assertLogs(log.logger, logging.DEBUG) as logs:
+            line = inspect.currentframe().f_lineno + 1
+            log.error("Value %s", 1)
+            log.log(logging.ERROR, "Value %s", 2)
+
+        for record, lineno in zip(logs.records, (line, line + 1)):
+            self.assertEqual(record.filename, "testLogUtils.py")
+            self.assertEqual(record.lineno, lineno)
+            self.assertEqual(record.funcName, "test_records_name_caller")
+
+
+class TestSpawnSummary(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(REPRESENTATION_LOGGER_NAME)
+        self.level = self.logger.level
+
+    def tearDown(self):
+        self.logger.setLevel(self.level)
+
+    def test_one_record_per_reset(self):
+        rep = FieldRepresentation()
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            self.logger.setLevel(logging.INFO)
+            rep.randomize(np.random.default_rng(0))
+
+        self.assertEqual(len(logs.records), 1)
+        spawns = getattr(logs.records[0], SPAWN_SUMMARY_ATTR)
+        self.assertEqual(spawns["Ring@field"], len(rep.rings))
+        self.assertEqual(sum(spawns.values()), len(rep._registry))
+
+    def test_handler_batches(self):
+        stream = io.StringIO()
+        handler = SpawnSummaryHandler(stream, batch_size=2)
+        self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+        try:
+            rep = FieldRepresentation()
+            for seed in range(3):
+                rep.randomize(np.random.default_rng(seed))
+            self.assertEqual(len(stream.getvalue().splitlines()), 2)
+        finally:
+            self.logger.removeHandler(handler)
+            handler.close()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line["reset"] for line in lines], [0, 1, 2])
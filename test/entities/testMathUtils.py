@@ -1,8 +1,21 @@
 import math
 import unittest
+import numpy as np
 from src.entities.constants import GOAL_RADIUS, RING_RADIUS, ROBOT_RADIUS
 from src.entities.enumerations import Color
-from src.entities.mathUtils import Pose2D, distance_between_points, distance_between_entities
+from src.entities.mathUtils import (
+    Pose2D,
+    Pose2DArray,
+    distance_between_points,
+    distance_between_entities,
+    distance_between_entity_arrays,
+    get_colliding_indices,
+    get_entity_arrays,
+    get_pairwise_distances,
+    get_pairwise_entity_distances,
+    is_colliding_front_array,
+    is_colliding_rear_array,
+)
 from src.entities.robots import HostRobot, OpposingRobot, PartnerRobot
 from src.entities.scoring_elements import BlueGoal, HighNeutralGoal, RedGoal, Ring
 
@@ -147,6 +160,36 @@ class TestCollisionsEnabled(unittest.TestCase):
         self.assertFalse(g1.is_colliding(r1))
 
 
+class TestCollidingIndices(unittest.TestCase):
+    def test_matches_is_colliding(self):
+        probe = HostRobot(Color.RED, Pose2D(0, 0, 0))
+        entities = [
+            Ring(Pose2D(0, RING_RADIUS, 0)),
+            Ring(Pose2D(ROBOT_RADIUS, 0, 0)),
+            Ring(Pose2D(ROBOT_RADIUS * 1.01, 0, 0)),
+            HighNeutralGoal(Pose2D(0, GOAL_RADIUS, 0)),
+            RedGoal(Pose2D(GOAL_RADIUS * 0.5, GOAL_RADIUS * 0.5, 0)),
+            BlueGoal(Pose2D(-GOAL_RADIUS * 1.01, 0, 0)),
+            OpposingRobot(Color.BLUE, Pose2D(-ROBOT_RADIUS, -ROBOT_RADIUS, 0)),
+        ]
+
+        indices = get_colliding_indices(
+            probe.pose,
+            probe.radius,
+            np.array([ent.pose.x for ent in entities]),
+            np.array([ent.pose.y for ent in entities]),
+            np.array([ent.radius for ent in entities]),
+        )
+
+        self.assertEqual(
+            list(indices), [i for i, ent in enumerate(entities) if ent.is_colliding(probe)]
+        )
+
+    def test_no_entities(self):
+        indices = get_colliding_indices(Pose2D(0, 0), RING_RADIUS, np.array([]), np.array([]), np.array([]))
+        self.assertEqual(len(indices), 0)
+
+
 class TestDistanceBetweenEntities(unittest.TestCase):
     def test_distance_between_entities(self):
         ent1 = Ring(Pose2D(0, 1))
@@ -163,5 +206,72 @@ class TestDistanceBetweenEntities(unittest.TestCase):
         self.assertEqual(dist, 0)
 
 
+class TestPose2DArray(unittest.TestCase):
+    def setUp(self):
+        self.entities = [
+            Ring(Pose2D(0, 0, (math.pi / 2))),
+            Ring(Pose2D(0, RING_RADIUS, 0)),
+            Ring(Pose2D(0, -RING_RADIUS, 0)),
+            Ring(Pose2D(RING_RADIUS, 0, 0)),
+            RedGoal(Pose2D(0, 0, (math.pi / 2))),
+            BlueGoal(Pose2D(GOAL_RADIUS * 0.5, GOAL_RADIUS * 0.5, 0)),
+            RedGoal(Pose2D(0, GOAL_RADIUS, 0)),
+            RedGoal(Pose2D(0, -GOAL_RADIUS, 0)),
+            PartnerRobot(Color.RED, Pose2D(0, 0, (math.pi / 2))),
+            OpposingRobot(Color.BLUE, Pose2D(-ROBOT_RADIUS * 0.5, -ROBOT_RADIUS * 0.3, 0)),
+            PartnerRobot(Color.RED, Pose2D(0, ROBOT_RADIUS, 0)),
+            HostRobot(Color.BLUE, Pose2D(ROBOT_RADIUS + 8, 1, -1.2)),
+        ]
+        self.poses, self.radii = get_entity_arrays(self.entities)
+
+    def test_indexing(self):
+        pose = self.poses[5]
+
+        self.assertIsInstance(pose, Pose2D)
+        self.assertEqual((pose.x, pose.y, pose.angle), (GOAL_RADIUS * 0.5, GOAL_RADIUS * 0.5, 0))
+        self.assertEqual(self.poses[2:5].shape, (3,))
+        self.assertEqual(len(Pose2DArray(np.zeros(4), np.ones(4))), 4)
+
+    def test_dist_to(self):
+        poses = Pose2DArray([5, 10], [10, 10])
+
+        np.testing.assert_array_equal(poses.distTo(Pose2D(10, 10)), [5, 0])
+        np.testing.assert_array_equal(poses.distTo(poses[::-1]), [5, 5])
+
+    def test_pairwise_distances(self):
+        dist = get_pairwise_distances(self.poses)
+
+        self.assertEqual(dist.shape, (len(self.entities), len(self.entities)))
+        for i, ent1 in enumerate(self.entities):
+            for j, ent2 in enumerate(self.entities):
+                self.assertEqual(dist[i, j], distance_between_points(ent1.pose, ent2.pose))
+
+    def test_pairwise_entity_distances(self):
+        rings, ring_radii = get_entity_arrays(self.entities[:4])
+        dist = get_pairwise_entity_distances(rings, ring_radii, self.poses, self.radii)
+
+        self.assertEqual(dist.shape, (4, len(self.entities)))
+        for i, ent1 in enumerate(self.entities[:4]):
+            for j, ent2 in enumerate(self.entities):
+                self.assertEqual(dist[i, j], distance_between_entities(ent1, ent2))
+
+    def test_elementwise_entity_distances(self):
+        dist = distance_between_entity_arrays(
+            self.poses, self.radii, self.poses[::-1], self.radii[::-1]
+        )
+
+        for ent1, ent2, value in zip(self.entities, self.entities[::-1], dist):
+            self.assertEqual(value, distance_between_entities(ent1, ent2))
+
+    def test_front_and_rear_collisions(self):
+        front = is_colliding_front_array(self.poses[:, None], self.radii[:, None], self.poses[None, :])
+        rear = is_colliding_rear_array(self.poses[:, None], self.radii[:, None], self.poses[None, :])
+
+        for i, ent1 in enumerate(self.entities):
+            for j, ent2 in enumerate(self.entities):
+                self.assertEqual(front[i, j], ent1.is_colliding_front(ent2))
+                self.assertEqual(rear[i, j], ent1.is_colliding_rear(ent2))
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from src.entities.fieldConfigurations import ending_representation
+from src.entities.fieldRepresentation import FieldRepresentation
+from src.entities.mathUtils import Pose2D
+from src.entities.rasterRenderer import ALLIANCE_RGB, RING_RGB, RasterRenderer
+from src.entities.robots import HostRobot
+from src.entities.enumerations import Color
+from src.entities.scoring_elements import RedGoal, Ring
+
+
+class TestRasterRenderer(unittest.TestCase):
+    def setUp(self):
+        self.renderer = RasterRenderer(scale=2)
+
+    def get_pixel(self, frame, x, y):
+        col = int(round((x + 72) * self.renderer.scale))
+        row = int(round((144 - y) * self.renderer.scale))
+        return tuple(frame[row, col])
+
+    def test_frame_buffer_reused(self):
+        frame = self.renderer.render(ending_representation())
+
+        self.assertEqual(frame.shape, (self.renderer.height, self.renderer.width, 3))
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertEqual(self.renderer.frame_size, (frame.shape[1], frame.shape[0]))
+        self.assertIs(self.renderer.render(ending_representation()), frame)
+
+    def test_entities_drawn_at_pose(self):
+        rep = FieldRepresentation(
+            robots=[HostRobot(Color.BLUE, Pose2D(-40, 70, 0))],
+            goals=[RedGoal(Pose2D(30, 70, 0))],
+            rings=[Ring(Pose2D(0, 70))],
+        )
+        frame = self.renderer.render(rep)
+
+        self.assertEqual(self.get_pixel(frame, 30, 70), ALLIANCE_RGB[Color.RED])
+        self.assertEqual(self.get_pixel(frame, 0, 70), RING_RGB)
+        # The heading marker covers the center of a robot
+        self.assertEqual(self.get_pixel(frame, -40 - 5, 70), ALLIANCE_RGB[Color.BLUE])
+        self.assertEqual(self.get_pixel(frame, 50, 110), (255, 255, 255))
+
+    def test_entities_off_frame(self):
+        rep = FieldRepresentation(
+            robots=[HostRobot(Color.RED, Pose2D(-75, -3, 1))],
+            rings=[Ring(Pose2D(500, 500))],
+        )
+        self.renderer.render(rep)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import math
+import random
+import unittest
+from collections import Counter
+from src.entities.enumerations import Color
+from src.entities.mathUtils import Pose2D, distance_between_entities
+from src.entities.robots import HostRobot
+from src.entities.scoring_elements import LowNeutralGoal, Ring
+from src.entities.spatialIndex import SpatialGrid
+
+
+def random_entities(count, seed=0):
+    rng = random.Random(seed)
+    entities = []
+    for i in range(count):
+        pose = Pose2D(rng.uniform(-72, 72), rng.uniform(0, 144))
+        entities.append(LowNeutralGoal(pose) if i % 5 == 0 else Ring(pose))
+    return entities
+
+
+class TestSpatialGrid(unittest.TestCase):
+    def setUp(self):
+        self.entities = random_entities(300)
+        self.grid = SpatialGrid()
+        for ent in self.entities:
+            self.grid.insert(ent, type(ent).__name__)
+
+    def test_within_matches_brute_force(self):
+        probe = HostRobot(Color.RED, Pose2D(0, 0))
+        for x, y in [(0, 72), (-70, 10), (40, 140), (100, 200)]:
+            for distance in [0, 2, 15]:
+                probe.pose = Pose2D(x, y)
+                expected = [
+                    ent for ent in self.entities if distance_between_entities(ent, probe) <= distance
+                ]
+
+                self.assertEqual(expected, self.grid.get_within(probe.pose, distance, probe.radius))
+
+    def test_colliding_matches_brute_force(self):
+        probe = HostRobot(Color.RED, Pose2D(0, 0))
+        for x, y in [(0, 72), (-70, 10), (40, 140), (100, 200)]:
+            probe.pose = Pose2D(x, y)
+            expected = [ent for ent in self.entities if ent.is_colliding(probe)]
+
+            self.assertEqual(expected, self.grid.get_colliding(probe.pose, probe.radius))
+
+    def test_tags(self):
+        goals = self.grid.get_within(Pose2D(0, 72), 200, tags=("LowNeutralGoal",))
+        self.assertEqual(goals, self.entities[::5])
+
+    def test_exclude(self):
+        ent = self.entities[0]
+        self.assertIn(ent, self.grid.get_colliding(ent.pose, ent.radius))
+        self.assertNotIn(ent, self.grid.get_colliding(ent.pose, ent.radius, exclude=ent))
+
+    def test_update_and_remove(self):
+        ent = self.entities[1]
+        ent.pose = Pose2D(500, 500)
+        self.grid.update(ent)
+
+        self.assertEqual(self.grid.get_colliding(Pose2D(500, 500), 1), [ent])
+
+        self.grid.remove(ent)
+        self.assertNotIn(ent, self.grid)
+        self.assertEqual(self.grid.get_colliding(Pose2D(500, 500), 1), [])
+        self.assertEqual(len(self.grid), len(self.entities) - 1)
+
+    def test_stats(self):
+        self.grid.stats = Counter()
+        self.grid.get_within(Pose2D(0, 72), 200)
+        self.grid.get_colliding(Pose2D(0, 72), 5)
+        self.grid.get_colliding(Pose2D(0, 72), 5)
+
+        self.assertEqual(self.grid.stats["proximity_queries"], 1)
+        self.assertEqual(self.grid.stats["collision_queries"], 2)
+        # The first query reaches every cell
+        self.assertGreaterEqual(self.grid.stats["entities_scanned"], len(self.entities))
+
+        self.grid.stats = None
+        self.assertEqual(len(self.grid.get_within(Pose2D(0, 72), 200)), len(self.entities))
+
+
+class TestFirstCollider(unittest.TestCase):
+    def test_first_along_path(self):
+        near = Ring(Pose2D(0, 30))
+        far = Ring(Pose2D(0, 60))
+        grid = SpatialGrid()
+        grid.insert(far)
+        grid.insert(near)
+
+        ent, fraction = grid.get_first_collider(Pose2D(0, 0), Pose2D(0, 100), 5)
+
+        self.assertIs(ent, near)
+        self.assertAlmostEqual(fraction, 0.25)
+
+    def test_clear_path(self):
+        grid = SpatialGrid()
+        grid.insert(Ring(Pose2D(20, 50)))
+
+        self.assertEqual(grid.get_first_collider(Pose2D(0, 0), Pose2D(0, 100), 5), (None, 1.0))
+
+    def test_already_colliding(self):
+        ring = Ring(Pose2D(1, 1))
+        grid = SpatialGrid()
+        grid.insert(ring)
+
+        self.assertEqual(grid.get_first_collider(Pose2D(0, 0), Pose2D(-50, 0), 5), (ring, 0.0))
+
+    def test_diagonal(self):
+        ring = Ring(Pose2D(50, 50))
+        grid = SpatialGrid()
+        grid.insert(ring)
+
+        ent, fraction = grid.get_first_collider(Pose2D(0, 0), Pose2D(100, 100), 5)
+
+        self.assertIs(ent, ring)
+        self.assertAlmostEqual(fraction, (math.sqrt(2) * 50 - 5) / (math.sqrt(2) * 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
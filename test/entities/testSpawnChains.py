@@ -0,0 +1,34 @@
+import unittest
+import numpy as np
+from src.entities.spawnChains import get_chain_length_probabilities, sample_chain_length
+
+
+class TestSpawnChains(unittest.TestCase):
+    def test_probabilities(self):
+        probabilities = get_chain_length_probabilities(0.5, 0.5, 4)
+
+        # Additional entities spawn with chances of 0.25, 0.125 and 0.0625
+        np.testing.assert_allclose(
+            probabilities,
+            [0.75, 0.25 * 0.875, 0.25 * 0.125 * 0.9375, 0.25 * 0.125 * 0.0625],
+        )
+        self.assertAlmostEqual(probabilities.sum(), 1)
+
+    def test_samples_match_probabilities(self):
+        rng = np.random.default_rng(0)
+        num_samples = 20000
+        lengths = [sample_chain_length(rng, 0.4, 0.9, 10) for _ in range(num_samples)]
+
+        counts = np.bincount(lengths, minlength=11)[1:]
+        expected = get_chain_length_probabilities(0.4, 0.9, 10) * num_samples
+        self.assertTrue(np.all(np.abs(counts - expected) <= (4 * np.sqrt(expected)) + 1))
+
+    def test_limit(self):
+        rng = np.random.default_rng(0)
+
+        self.assertEqual(sample_chain_length(rng, 0.5, 0.5, 0), 0)
+        self.assertTrue(all(sample_chain_length(rng, 1.0, 1.0, 3) == 3 for _ in range(10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
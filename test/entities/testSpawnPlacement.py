@@ -0,0 +1,40 @@
+import unittest
+import numpy as np
+from src.entities.constants import FIELD_WIDTH_IN
+from src.entities.fieldRepresentation import FieldCounts, FieldRepresentation
+from src.entities.mathUtils import get_entity_arrays, get_pairwise_entity_distances
+from src.entities.spawnPlacement import RAMP_MASK, SpawnPlacer
+
+
+class TestSpawnPlacer(unittest.TestCase):
+    def test_placed_entities_do_not_overlap(self):
+        placer = SpawnPlacer(np.random.default_rng(0))
+        placed = [(*placer.sample_and_place(radius), radius) for radius in [12, 4, 4, 10] * 10]
+
+        for idx, (x, y, radius) in enumerate(placed):
+            self.assertFalse(RAMP_MASK[y, x])
+            for other_x, other_y, other_radius in placed[:idx]:
+                self.assertGreater(np.hypot(x - other_x, y - other_y), radius + other_radius)
+
+    def test_full_field_raises(self):
+        blocked = np.ones((5, 5), dtype=bool)
+        blocked[2, 2] = False
+        placer = SpawnPlacer(np.random.default_rng(0), blocked)
+
+        self.assertEqual(placer.sample_and_place(1), (2, 2))
+        self.assertRaises(ValueError, placer.sample, 1)
+
+    def test_randomize_does_not_overlap(self):
+        for seed in range(5):
+            rep = FieldRepresentation()
+            rep.randomize(np.random.default_rng(seed), FieldCounts(max_rings=100))
+            poses, radii = get_entity_arrays(rep.robots + rep.goals + rep.rings)
+
+            self.assertTrue(np.all((poses.x >= -FIELD_WIDTH_IN / 2) & (poses.x <= FIELD_WIDTH_IN / 2)))
+            dist = get_pairwise_entity_distances(poses, radii)
+            np.fill_diagonal(dist, np.inf)
+            self.assertTrue(np.all(dist > 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
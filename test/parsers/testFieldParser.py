@@ -0,0 +1,54 @@
+import json
+import unittest
+import numpy as np
+from src.entities.enumerations import GoalLevel
+from src.entities.fieldArrays import ArrayFieldRepresentation
+from src.entities.fieldConfigurations import ending_representation, starting_representation
+from src.parsers.fieldParser import FieldParser
+
+ARRAY_FIELDS = (
+    "kind", "x", "y", "angle", "radius", "color", "tipped", "owner", "platform", "ring_counts", "ring_capacity",
+    "place_level",
+)
+
+
+class TestFieldParser(unittest.TestCase):
+    def test_round_trip(self):
+        for rep in [starting_representation(), ending_representation()]:
+            parsed = FieldParser().parse_representation(json.loads(rep.as_json()))
+
+            self.assertEqual(parsed.to_bytes(), rep.to_bytes())
+            self.assertEqual(parsed.field_counts, rep.field_counts)
+
+    def test_legacy_layout(self):
+        ring = {"position": {"x": 1, "y": 2, "angle": 0}}
+        goal = {
+            "color": 2,
+            "level": 10,
+            "position": {"x": 0, "y": 0, "angle": 0},
+            "ring_containers": {"HIGH": {"max_storage": 8, "rings": [ring]}},
+            "tipped": False,
+        }
+        platform = {"state": 0, "rings": [], "goals": [], "robots": []}
+        rep = FieldParser().parse_representation(
+            {"rings": [ring], "goals": [goal], "robots": [], "red_platform": platform, "blue_platform": platform}
+        )
+
+        self.assertEqual(rep.field_counts.rings, 2)
+        self.assertEqual(rep.field_counts.high_neutral_goals, 1)
+        self.assertEqual(rep.goals[0].get_ring_container(GoalLevel.HIGH).get_utilization(), 1)
+        self.assertEqual(rep.goals[0].get_ring_container(GoalLevel.BASE).max_storage, 8)
+
+    def test_parse_arrays(self):
+        for rep in [starting_representation(), ending_representation()]:
+            data = json.loads(rep.as_json())
+            arrays = FieldParser().parse_arrays(data)
+            expected = ArrayFieldRepresentation.from_representation(FieldParser().parse_representation(data))
+
+            self.assertEqual(arrays.count, expected.count)
+            for name in ARRAY_FIELDS:
+                np.testing.assert_array_equal(
+                    getattr(arrays, name)[: arrays.count], getattr(expected, name)[: expected.count], name
+                )
+            np.testing.assert_array_equal(arrays.platform_state, expected.platform_state)
+            self.assertEqual(arrays.field_counts, expected.field_counts)
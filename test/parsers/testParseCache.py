@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from src.entities.fieldConfigurations import ending_representation
+from src.parsers.configParser import dict_config_parser
+from src.parsers.parseCache import ParseCache
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.tmp.name, "cache"), max_entries=2)
+        self.config_path = self.write("config.json", json.dumps({"X": 1, "Y": [1.5, "Test"], "Z": None}))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_config_hits(self):
+        first = dict_config_parser(self.config_path, self.cache)
+        second = dict_config_parser(self.config_path, self.cache)
+
+        self.assertEqual(first, {"X": 1, "Y": [1.5, "Test"], "Z": None})
+        self.assertEqual(second, first)
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_shared_between_caches(self):
+        dict_config_parser(self.config_path, self.cache)
+        other = ParseCache(self.cache.directory)
+        other.load_config(self.config_path)
+
+        self.assertEqual((other.stats.hits, other.stats.misses), (1, 0))
+
+    def test_changed_file(self):
+        self.cache.load_config(self.config_path)
+        os.utime(self.config_path, ns=(0, 0))
+        self.cache.load_config(self.config_path)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+        self.write("config.json", json.dumps({"X": 2}))
+        self.assertEqual(self.cache.load_config(self.config_path), {"X": 2})
+        self.assertEqual(self.cache.stats.misses, 2)
+
+    def test_field(self):
+        rep = ending_representation()
+        path = self.write("field.json", rep.as_json())
+
+        self.cache.load_field(path)
+        loaded = self.cache.load_field(path)
+
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertEqual(loaded.to_bytes(), rep.to_bytes())
+
+    def test_eviction(self):
+        paths = [self.write(f"config{i}.json", json.dumps({"X": i})) for i in range(3)]
+        for path in paths:
+            self.cache.load_config(path)
+
+        entries = [name for name in os.listdir(self.cache.directory) if name.endswith(".bin")]
+        self.assertEqual(len(entries), 2)
+
+    def test_invalidate(self):
+        self.cache.load_config(self.config_path)
+        self.cache.invalidate(self.config_path)
+        self.cache.load_config(self.config_path)
+        self.cache.clear()
+        self.cache.load_config(self.config_path)
+
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (0, 3))
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from src.entities.fieldArrays import ArrayFieldRepresentation
+from src.entities.fieldConfigurations import ending_representation, starting_representation
+from src.parsers.scenarioLoader import iter_scenario_texts, load_scenarios, write_scenarios
+
+
+class TestScenarioLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.reps = [starting_representation(), ending_representation(), starting_representation()]
+        self.path = os.path.join(self.tmp.name, "scenarios.jsonl")
+        write_scenarios(self.path, self.reps)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_lines(self):
+        loaded = list(load_scenarios(self.path))
+
+        self.assertEqual([rep.to_bytes() for rep in loaded], [rep.to_bytes() for rep in self.reps])
+
+    def test_directory(self):
+        with open(os.path.join(self.tmp.name, "single.json"), "w") as file:
+            file.write(ending_representation().as_json())
+        with open(os.path.join(self.tmp.name, "notes.txt"), "w") as file:
+            file.write("not a scenario")
+
+        self.assertEqual(len(list(iter_scenario_texts(self.tmp.name))), 4)
+
+    def test_workers(self):
+        loaded = list(load_scenarios(self.path, workers=2, chunk_size=1))
+        arrays = list(load_scenarios(self.path, arrays=True, workers=2, chunk_size=1))
+
+        self.assertEqual([rep.to_bytes() for rep in loaded], [rep.to_bytes() for rep in self.reps])
+        self.assertTrue(all(isinstance(field, ArrayFieldRepresentation) for field in arrays))
+        self.assertEqual([field.count for field in arrays], [field.count for field in load_scenarios(self.path, arrays=True)])
@@ -0,0 +1,101 @@
+import os
+import random
+import sys
+import unittest
+import numpy as np
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+# The rl_training package imports entities as a top-level package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from entities.enumerations import ObservationMode
+from rl_training.batchedEnvironment import BatchedTippingPointEnv
+from rl_training.environment import TippingPointEnv
+
+
+def make_actions(num_envs, num_steps, seed):
+    # Walks in one direction for a while so robots reach entities, mixed with every interaction
+    rs = np.random.RandomState(seed)
+    walks = np.repeat(rs.randint(1, 5, size=(num_steps // 10, num_envs)), 10, axis=0)
+    interactions = rs.randint(5, 10, size=(num_steps, num_envs))
+    return np.where(rs.rand(num_steps, num_envs) < 0.5, walks, interactions)
+
+
+def run(env, actions, seed, env_seed=None):
+    # Unseeded fields are randomized with the shared random module, so each run is seeded separately
+    random.seed(seed)
+    if env_seed is not None:
+        env.seed(env_seed)
+    results = [env.reset()]
+    for step_actions in actions:
+        results.append(env.step(step_actions))
+    return results
+
+
+class TestBatchedTippingPointEnv(unittest.TestCase):
+    def assertObservationEqual(self, first, second):
+        self.assertEqual(first.keys(), second.keys())
+        for key in first:
+            np.testing.assert_array_equal(first[key], second[key], err_msg=key)
+
+    def assertMatchesDummyVecEnv(self, observation_mode, num_envs, steps, num_steps, env_seed=None):
+        actions = make_actions(num_envs, num_steps, seed=1)
+        expected = run(
+            DummyVecEnv(
+                [lambda: TippingPointEnv(steps, observation_mode=observation_mode)] * num_envs
+            ),
+            actions,
+            seed=7,
+            env_seed=env_seed,
+        )
+        actual = run(
+            BatchedTippingPointEnv(num_envs, steps, observation_mode=observation_mode),
+            actions,
+            # The random module is never used by seeded fields
+            seed=7 if env_seed is None else 8,
+            env_seed=env_seed,
+        )
+
+        self.assertObservationEqual(expected[0], actual[0])
+        for (obs, rewards, dones, infos), (b_obs, b_rewards, b_dones, b_infos) in zip(
+            expected[1:], actual[1:]
+        ):
+            self.assertObservationEqual(obs, b_obs)
+            np.testing.assert_array_equal(rewards, b_rewards)
+            np.testing.assert_array_equal(dones, b_dones)
+            for info, b_info in zip(infos, b_infos):
+                self.assertEqual("terminal_observation" in info, "terminal_observation" in b_info)
+                if "terminal_observation" in info:
+                    self.assertObservationEqual(
+                        info["terminal_observation"], b_info["terminal_observation"]
+                    )
+
+    def test_entity_list_matches_environment(self):
+        self.assertMatchesDummyVecEnv(ObservationMode.ENTITY_LIST, 4, 50, 200)
+
+    def test_seeded_matches_environment(self):
+        self.assertMatchesDummyVecEnv(ObservationMode.ENTITY_LIST, 3, 20, 60, env_seed=5)
+
+    def test_dense_matches_environment(self):
+        self.assertMatchesDummyVecEnv(ObservationMode.DENSE, 2, 10, 30)
+
+    def test_episodes_end(self):
+        env = BatchedTippingPointEnv(3, 5)
+        env.reset()
+        for _ in range(4):
+            _, _, dones, _ = env.step(np.zeros(3))
+            self.assertFalse(dones.any())
+
+        _, rewards, dones, infos = env.step(np.zeros(3))
+        self.assertTrue(dones.all())
+        self.assertTrue(all("terminal_observation" in info for info in infos))
+        self.assertTrue(np.isin(rewards, [-1, 0.5, 1]).all())
+
+    def test_env_method(self):
+        env = BatchedTippingPointEnv(3, 5)
+
+        self.assertEqual(env.env_method("seed", 7, indices=[0, 2]), [[7, 8, 9]] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,380 @@
+import copy
+import os
+import sys
+import tempfile
+import unittest
+import cv2
+import matplotlib.pyplot as plt
+import numpy as np
+
+# The rl_training package imports entities as a top-level package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from entities.enumerations import Color, ObservationMode, RewardMode
+from entities.fieldConfigurations import starting_representation
+from entities.fieldRepresentation import FieldRepresentation, FieldState
+from entities.mathUtils import Pose2D
+from entities.platforms import BluePlatform, PlatformState, RedPlatform
+from entities.robots import HostRobot, OpposingRobot
+from entities.scoring_elements import LowNeutralGoal, Ring
+from rl_training.environment import SCORE_DELTA_SCALE, TippingPointEnv
+from rl_training.videoWriter import VideoWriter
+
+
+UP = 1
+DOWN = 2
+LEFT = 3
+RIGHT = 4
+
+
+def make_env(rep, steps=100):
+    env = TippingPointEnv(steps)
+    env.field_state = FieldState(rep, steps)
+    return env
+
+
+class TestObservationModes(unittest.TestCase):
+    def test_dense_observation(self):
+        env = TippingPointEnv(10)
+        obs, _, _, _ = env.step(0)
+
+        self.assertEqual(set(obs.keys()), set(env.observation_space.spaces.keys()))
+        self.assertEqual(obs["location"].shape, (145, 145, 100))
+
+    def test_entity_list_observation(self):
+        env = TippingPointEnv(10, observation_mode=ObservationMode.ENTITY_LIST)
+
+        obs, _, _, _ = env.step(0)
+        self.assertTrue(env.observation_space.contains(obs))
+
+        obs = env.reset()
+        self.assertTrue(env.observation_space.contains(obs))
+
+
+class TestMoveCollision(unittest.TestCase):
+    def test_move_into_free_space(self):
+        host = HostRobot(Color.RED, Pose2D(0, 60, 0))
+        env = make_env(FieldRepresentation(robots=[host]))
+
+        env.step(UP)
+        self.assertEqual((host.pose.x, host.pose.y), (0, 61))
+
+        env.step(RIGHT)
+        self.assertEqual((host.pose.x, host.pose.y), (1, 61))
+
+    def test_blocked_by_field_entity(self):
+        host = HostRobot(Color.RED, Pose2D(0, 60, 0))
+        ring = Ring(Pose2D(0, 60 + host.radius + 1, 0))
+        env = make_env(FieldRepresentation(robots=[host], rings=[ring]))
+
+        env.step(UP)
+        self.assertEqual((host.pose.x, host.pose.y), (0, 60))
+
+    def test_blocked_by_platform_entity(self):
+        host = HostRobot(Color.RED, Pose2D(0, 100, 0))
+        opponent = OpposingRobot(Color.BLUE, Pose2D(0, 100 + host.radius + 1, 0))
+        rep = FieldRepresentation(
+            robots=[host],
+            red_platform=RedPlatform(PlatformState.LEVEL),
+            blue_platform=BluePlatform(PlatformState.LEVEL, robots=[opponent]),
+        )
+        env = make_env(rep)
+
+        env.step(UP)
+        self.assertEqual((host.pose.x, host.pose.y), (0, 100))
+
+        env.step(DOWN)
+        self.assertEqual((host.pose.x, host.pose.y), (0, 99))
+
+    def test_matches_per_entity_check(self):
+        rep = starting_representation()
+        host = rep.robots[0]
+        env = make_env(rep, 1000)
+        others = [*rep.robots[1:], *rep.goals, *rep.rings]
+
+        for action in [UP] * 40 + [LEFT] * 30 + [DOWN] * 40:
+            before = host.pose
+            env.step(action)
+            direction = env._map_movement(action)
+            candidate = HostRobot(Color.RED, Pose2D(before.x + direction[0], before.y + direction[1]))
+            blocked = any(ent.is_colliding(candidate) for ent in others)
+
+            self.assertEqual(host.pose is before, blocked)
+
+
+class TestAdjacency(unittest.TestCase):
+    GOAL_IN = 5
+    GOAL_OUT = 6
+    RING_IN = 7
+
+    def test_goal_capture_and_release(self):
+        host = HostRobot(Color.RED, Pose2D(0, 60, 0))
+        goal = LowNeutralGoal(Pose2D(host.radius + 13.97, 60, 0))
+        env = make_env(FieldRepresentation(robots=[host], goals=[goal]))
+        rep = env.field_state.get_current_representation()
+
+        self.assertEqual(env._detect_adjacents(host, rep), ([goal], []))
+
+        env.step(self.GOAL_IN)
+        self.assertEqual(host.goals, [goal])
+        self.assertEqual(rep.goals, [])
+        self.assertEqual(env._detect_adjacents(host, rep), ([], []))
+
+        env.step(self.GOAL_OUT)
+        self.assertEqual(host.goals, [])
+        self.assertEqual(rep.goals, [goal])
+
+        # The released goal is placed just in front of the host
+        self.assertEqual(env._detect_adjacents(host, rep), ([goal], []))
+
+    def test_stacked_goal_capture(self):
+        host = HostRobot(Color.RED, Pose2D(0, 60, 0))
+        pose = Pose2D(host.radius + 13.97, 60, 0)
+        goals = [LowNeutralGoal(pose), LowNeutralGoal(pose)]
+        env = make_env(FieldRepresentation(robots=[host], goals=list(goals)))
+        rep = env.field_state.get_current_representation()
+        goal_ids = [rep.get_entity_id(goal) for goal in goals]
+
+        env.step(self.GOAL_IN)
+        self.assertIs(host.goals[0], goals[1])
+        self.assertEqual(len(rep.goals), 1)
+        self.assertIs(rep.goals[0], goals[0])
+
+        env.step(self.GOAL_IN)
+        self.assertEqual([id(goal) for goal in host.goals], [id(goals[1]), id(goals[0])])
+        self.assertEqual(rep.goals, [])
+
+        env.step(self.GOAL_OUT)
+        self.assertIs(rep.goals[0], goals[0])
+        self.assertEqual([rep.get_entity_id(goal) for goal in goals], goal_ids)
+
+    def test_ring_capture(self):
+        host = HostRobot(Color.RED, Pose2D(0, 60, 0))
+        rings = [Ring(Pose2D(-host.radius - 5, 60, 0)), Ring(Pose2D(0, 60 - host.radius - 5, 0))]
+        env = make_env(FieldRepresentation(robots=[host], rings=list(rings)))
+        rep = env.field_state.get_current_representation()
+
+        self.assertEqual(env._detect_adjacents(host, rep), ([], rings))
+
+        env.step(self.RING_IN)
+        self.assertEqual(host.rings, rings)
+        self.assertEqual(rep.rings, [])
+
+        # Captured rings no longer block movement
+        env.step(LEFT)
+        self.assertEqual((host.pose.x, host.pose.y), (-1, 60))
+
+    def test_reset_rebuilds_index(self):
+        env = TippingPointEnv(100)
+        env.step(UP)
+        env.reset()
+
+        rep = env.field_state.get_current_representation()
+        host = [robot for robot in rep.robots if type(robot) is HostRobot][0]
+        index = env._get_spatial_index(rep)
+
+        self.assertIn(host, index)
+        self.assertTrue(all(ring in index for ring in rep.rings))
+
+
+class TestSeeding(unittest.TestCase):
+    def run_episode(self, env, seed):
+        observations = [env.reset(seed=seed)]
+        for action in [UP, 5, 7, RIGHT, 9, 6, DOWN, 8, LEFT, 5]:
+            observations.append(env.step(action)[0])
+        return observations
+
+    def test_reset_seed_repeats_episode(self):
+        env = TippingPointEnv(100, ObservationMode.ENTITY_LIST)
+        first = self.run_episode(env, 3)
+        second = self.run_episode(env, 3)
+
+        for obs, obs_again in zip(first, second):
+            np.testing.assert_array_equal(obs["entities"], obs_again["entities"])
+
+    def test_seed_matches_reset_seed(self):
+        env = TippingPointEnv(100, ObservationMode.ENTITY_LIST)
+        seeded = TippingPointEnv(100, ObservationMode.ENTITY_LIST)
+
+        self.assertEqual(seeded.seed(3), [3])
+        np.testing.assert_array_equal(
+            env.reset(seed=3)["entities"], seeded.reset()["entities"]
+        )
+
+        # Later resets continue from the generator rather than reseeding
+        self.assertFalse(
+            np.array_equal(env.reset()["entities"], env.reset(seed=3)["entities"])
+        )
+
+
+class TestForkedField(unittest.TestCase):
+    def test_stepping_fork_matches_deepcopy(self):
+        env = TippingPointEnv(300)
+        env.reset(seed=1)
+        rep = env.field_state.get_current_representation()
+        expected = rep.snapshot().to_bytes()
+
+        forked = make_env(rep.fork(), 300)
+        copied = make_env(copy.deepcopy(rep), 300)
+        for action in np.random.RandomState(0).randint(0, 10, size=250):
+            forked.step(action)
+            copied.step(action)
+
+        forked_bytes = forked.field_state.get_current_representation().snapshot().to_bytes()
+        self.assertEqual(
+            forked_bytes, copied.field_state.get_current_representation().snapshot().to_bytes()
+        )
+        self.assertNotEqual(forked_bytes, expected)
+        self.assertEqual(rep.snapshot().to_bytes(), expected)
+
+
+class TestStateHash(unittest.TestCase):
+    def assert_hash_current(self, env):
+        rep = env.field_state.get_current_representation()
+        self.assertEqual(rep.get_state_hash(), rep.compute_state_hash())
+
+    def test_random_actions(self):
+        env = TippingPointEnv(300)
+        for seed in range(3):
+            env.reset(seed=seed)
+            self.assert_hash_current(env)
+            for action in np.random.RandomState(seed).randint(0, 10, size=250):
+                env.step(action)
+                self.assert_hash_current(env)
+
+    def test_random_actions_on_fork(self):
+        env = TippingPointEnv(300)
+        env.reset(seed=1)
+        rep = env.field_state.get_current_representation()
+        expected = rep.get_state_hash()
+
+        forked = make_env(rep.fork(), 300)
+        for action in np.random.RandomState(1).randint(0, 10, size=250):
+            forked.step(action)
+        self.assert_hash_current(forked)
+        self.assertNotEqual(forked.field_state.get_current_representation().get_state_hash(), expected)
+        self.assertEqual(rep.get_state_hash(), expected)
+
+
+class TestScores(unittest.TestCase):
+    def assert_scores_current(self, rep):
+        robots = rep.robots + rep.red_platform.robots + rep.blue_platform.robots
+        for color in [Color.RED, Color.BLUE]:
+            self.assertEqual(rep.get_goal_score(color), sum(goal.get_current_score(color) for goal in rep.goals))
+            for robot in robots:
+                self.assertEqual(
+                    rep.get_held_goal_score(robot, color),
+                    sum(goal.get_current_score(color) for goal in robot.goals),
+                )
+
+    def test_random_actions(self):
+        env = TippingPointEnv(300)
+        for seed in range(3):
+            env.reset(seed=seed)
+            rep = env.field_state.get_current_representation()
+            self.assert_scores_current(rep)
+            for action in np.random.RandomState(seed).randint(0, 10, size=250):
+                env.step(action)
+                self.assert_scores_current(rep)
+
+    def test_random_actions_on_fork(self):
+        env = TippingPointEnv(300)
+        env.reset(seed=1)
+        rep = env.field_state.get_current_representation()
+        expected = [rep.get_goal_score(color) for color in [Color.RED, Color.BLUE]]
+
+        forked = make_env(rep.fork(), 300)
+        for action in np.random.RandomState(1).randint(0, 10, size=250):
+            forked.step(action)
+        self.assert_scores_current(forked.field_state.get_current_representation())
+        self.assertEqual([rep.get_goal_score(color) for color in [Color.RED, Color.BLUE]], expected)
+
+
+class TestRewardModes(unittest.TestCase):
+    def run_episode(self, env, seed):
+        env.reset(seed=seed)
+        rep = env.field_state.get_current_representation()
+        robots = rep.robots + rep.red_platform.robots + rep.blue_platform.robots
+        host = next(robot for robot in robots if type(robot) is HostRobot)
+        start_margin = env._get_score_margin(host, rep)
+        start_potential = env._get_potential(host, rep)
+
+        rewards, done = [], False
+        for action in np.random.RandomState(seed).randint(0, 10, size=env.MAX_STEPS):
+            _, reward, done, info = env.step(action)
+            rewards.append(reward)
+        self.assertTrue(done)
+        return rewards, info["score_margin"] - start_margin, start_potential
+
+    def test_sparse_rewards_last_step(self):
+        rewards, _, _ = self.run_episode(TippingPointEnv(200), 0)
+
+        self.assertTrue(all(reward == 0 for reward in rewards[:-1]))
+        self.assertIn(rewards[-1], (-1, 1 / 2, 1))
+
+    def test_score_delta_sums_to_margin(self):
+        sparse, _, _ = self.run_episode(TippingPointEnv(200), 17)
+        rewards, margin_change, _ = self.run_episode(
+            TippingPointEnv(200, reward_mode=RewardMode.SCORE_DELTA), 17
+        )
+
+        self.assertNotEqual(margin_change, 0)
+        self.assertAlmostEqual(sum(rewards), margin_change / SCORE_DELTA_SCALE + sparse[-1])
+
+    def test_shaping_telescopes(self):
+        env = TippingPointEnv(
+            200,
+            reward_mode=RewardMode.SCORE_DELTA,
+            goal_distance_weight=1.0,
+            rings_held_weight=0.5,
+            shaping_gamma=1.0,
+        )
+        sparse, _, _ = self.run_episode(TippingPointEnv(200), 3)
+        unshaped, _, _ = self.run_episode(TippingPointEnv(200, reward_mode=RewardMode.SCORE_DELTA), 3)
+        rewards, margin_change, start_potential = self.run_episode(env, 3)
+
+        self.assertNotEqual(rewards, unshaped)
+        self.assertAlmostEqual(
+            sum(rewards), margin_change / SCORE_DELTA_SCALE + sparse[-1] - start_potential
+        )
+
+
+class TestRecording(unittest.TestCase):
+    def test_streams_rgb_frames(self):
+        env = TippingPointEnv(10)
+        env.reset(seed=0)
+        height, width, _ = env.render(mode="rgb_array").shape
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "episode.mp4")
+            with VideoWriter(path, (width, height), 30) as video:
+                for _ in range(10):
+                    env.step(env.action_space.sample())
+                    video.write(env.render(mode="rgb_array"))
+
+            capture = cv2.VideoCapture(path)
+            self.assertEqual(int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), 10)
+            self.assertEqual(int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), width)
+            capture.release()
+
+
+class TestLiveRender(unittest.TestCase):
+    def test_figure_reused(self):
+        env = TippingPointEnv(20)
+        env.reset(seed=0)
+        num_figures = len(plt.get_fignums())
+
+        ax = env.render()
+        for _ in range(5):
+            env.step(env.action_space.sample())
+            self.assertIs(env.render(), ax)
+        env.reset(seed=1)
+        self.assertIs(env.render(), ax)
+        self.assertEqual(len(plt.get_fignums()), num_figures + 1)
+
+        env.close()
+        self.assertEqual(len(plt.get_fignums()), num_figures)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import glob
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+# The rl_training package imports entities as a top-level package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from entities.enumerations import ObservationMode
+from rl_training.environment import TippingPointEnv
+from rl_training.episodeLog import EpisodeLog
+
+
+class TestEpisodeLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def record_episode(self, steps=60, **kwargs):
+        env = TippingPointEnv(steps, observation_mode=ObservationMode.ENTITY_LIST, record_dir=self.tmp.name, **kwargs)
+        obs = [env.reset(seed=3)["entities"]]
+        states = [env.field_state.get_current_representation().snapshot().to_bytes()]
+        env.action_space.seed(3)
+
+        done = False
+        while not done:
+            step_obs, _, done, _ = env.step(env.action_space.sample())
+            obs.append(step_obs["entities"])
+            states.append(env.field_state.get_current_representation().snapshot().to_bytes())
+        return env, obs, states
+
+    def get_logs(self):
+        return sorted(glob.glob(os.path.join(self.tmp.name, "*.npz")))
+
+    def test_rebuilds_every_step(self):
+        _, _, states = self.record_episode(keyframe_interval=7)
+        log = EpisodeLog(self.get_logs()[0])
+
+        self.assertEqual(log.num_steps, len(states) - 1)
+        for step in [0, 6, 7, 8, 30, log.num_steps]:
+            self.assertEqual(log.get_representation(step).snapshot().to_bytes(), states[step], step)
+        for step, rep in log.iter_representations(5):
+            self.assertEqual(rep.snapshot().to_bytes(), states[step], step)
+
+        with self.assertRaises(IndexError):
+            log.get_representation(log.num_steps + 1)
+
+    def test_dataset_matches_observations(self):
+        _, obs, _ = self.record_episode()
+        dataset = EpisodeLog(self.get_logs()[0]).get_dataset()
+
+        np.testing.assert_array_equal(dataset["observations"], obs[:-1])
+        np.testing.assert_array_equal(dataset["next_observations"], obs[1:])
+        self.assertEqual(dataset["actions"].shape, (len(obs) - 1,))
+        self.assertTrue(dataset["terminals"][-1])
+        self.assertFalse(dataset["terminals"][:-1].any())
+
+    def test_render_range(self):
+        self.record_episode()
+        log = EpisodeLog(self.get_logs()[0])
+
+        path = os.path.join(self.tmp.name, "replay.mp4")
+        self.assertEqual(log.render(path, 10, 20), 10)
+        self.assertGreater(os.path.getsize(path), 0)
+
+    def test_logs_unfinished_episodes(self):
+        env, _, _ = self.record_episode()
+        env.reset()
+        env.step(0)
+        env.close()
+
+        logs = self.get_logs()
+        self.assertEqual(len(logs), 2)
+        log = EpisodeLog(logs[1])
+        self.assertEqual(log.num_steps, 1)
+        self.assertFalse(log.dones.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+
+# The rl_training package imports entities as a top-level package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from entities.enumerations import Color
+from entities.fieldRepresentation import FieldRepresentation, FieldState
+from entities.mathUtils import Pose2D
+from entities.robots import HostRobot
+from entities.scoring_elements import RedGoal, Ring
+from rl_training.environment import TippingPointEnv
+from rl_training.mctsPlanner import MCTSPlanner, NUM_ACTIONS, random_policy
+
+# Ring release is disabled, so both of the last actions place rings
+RING_PLACE = (8, 9)
+
+
+def make_ring_placement_env():
+    # The host holds a ring next to its own goal in its zone, placing it scores right away
+    host = HostRobot(Color.RED, Pose2D(30, 20, 0), rings=[Ring(Pose2D(30, 20))])
+    goal = RedGoal(Pose2D(30 + host.radius + 13.97, 20, 0))
+    env = TippingPointEnv(20)
+    env.field_state = FieldState(FieldRepresentation(robots=[host], goals=[goal]), 20)
+    return env
+
+
+class TestMCTSPlanner(unittest.TestCase):
+    def test_finds_scoring_action(self):
+        env = make_ring_placement_env()
+        planner = MCTSPlanner(node_budget=300, time_limit=60, rollout_depth=3, seed=0)
+
+        self.assertIn(planner.plan(env.field_state), RING_PLACE)
+        self.assertEqual(planner.simulations, 300)
+
+    def test_field_is_unchanged(self):
+        env = TippingPointEnv(30)
+        env.reset(seed=0)
+        rep = env.field_state.get_current_representation()
+        expected = rep.get_state_hash()
+
+        MCTSPlanner(node_budget=50, time_limit=60, seed=0).plan(env.field_state)
+        self.assertEqual(rep.get_state_hash(), expected)
+
+    def test_time_limit_stops_search(self):
+        env = TippingPointEnv(1000)
+        env.reset(seed=0)
+        planner = MCTSPlanner(node_budget=10 ** 6, time_limit=0.2, seed=0)
+
+        action = planner.plan(env.field_state)
+        self.assertIn(action, range(NUM_ACTIONS))
+        self.assertLess(planner.simulations, 10 ** 6)
+        self.assertLess(planner.elapsed, 2)
+
+    def test_requires_a_simulation(self):
+        with self.assertRaises(ValueError):
+            MCTSPlanner(node_budget=0)
+
+        env = make_ring_placement_env()
+        planner = MCTSPlanner(node_budget=1, time_limit=0, seed=0)
+        self.assertIn(planner.plan(env.field_state), range(NUM_ACTIONS))
+        self.assertEqual(planner.simulations, 1)
+
+    def test_reuses_reached_node(self):
+        env = TippingPointEnv(30)
+        env.reset(seed=0)
+        planner = MCTSPlanner(node_budget=100, time_limit=60, seed=0)
+
+        env.step(planner.plan(env.field_state))
+        rep = env.field_state.get_current_representation()
+        node = planner.table[(rep.get_state_hash(), env.field_state.get_current_time())]
+        visits = node.visits
+
+        planner.plan(env.field_state)
+        self.assertGreater(visits, 0)
+        self.assertEqual(node.visits, visits + 100)
+
+    def test_parallel_rollouts(self):
+        env = make_ring_placement_env()
+        with MCTSPlanner(
+            node_budget=40, time_limit=60, opposing_policy=random_policy, num_workers=2, seed=0
+        ) as planner:
+            action = planner.plan(env.field_state)
+
+        self.assertIn(action, range(NUM_ACTIONS))
+        self.assertEqual(planner.simulations, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+# The rl_training package imports entities as a top-level package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from entities.enumerations import ObservationMode
+from rl_training.environment import TippingPointEnv
+from rl_training.sharedMemoryVecEnv import SharedMemoryVecEnv
+
+
+class TestSharedMemoryVecEnv(unittest.TestCase):
+    def test_workers_match_environment(self):
+        # Workers start slowly, so only the dense layout that motivates the shared buffers is checked
+        observation_mode = ObservationMode.DENSE
+        num_envs, steps, seed = 2, 4, 10
+        actions = np.random.RandomState(0).randint(0, 10, size=(9, num_envs))
+
+        env = SharedMemoryVecEnv(
+            [lambda: TippingPointEnv(steps, observation_mode, copy_observations=False)]
+            * num_envs,
+            seed=seed,
+        )
+        try:
+            observations = [env.reset()]
+            results = [env.step(step_actions) for step_actions in actions]
+            observations += [obs for obs, _, _, _ in results]
+        finally:
+            env.close()
+        self.assertEqual([process.exitcode for process in env.processes], [0] * num_envs)
+
+        # Each worker runs like a single environment seeded with the base seed plus its index
+        for idx in range(num_envs):
+            ref = TippingPointEnv(steps, observation_mode)
+            ref_obs = ref.reset(seed=seed + idx)
+
+            for step, (step_actions, (_, rewards, dones, infos)) in enumerate(zip(actions, results)):
+                for key in ref_obs:
+                    np.testing.assert_array_equal(ref_obs[key], observations[step][key][idx], err_msg=key)
+
+                ref_obs, reward, done, _ = ref.step(step_actions[idx])
+                self.assertEqual(reward, rewards[idx])
+                self.assertEqual(done, dones[idx])
+                if done:
+                    for key in ref_obs:
+                        np.testing.assert_array_equal(
+                            ref_obs[key], infos[idx]["terminal_observation"][key]
+                        )
+                    ref_obs = ref.reset()
+
+    def test_returned_observations_kept(self):
+        # Learners hold the observation of a step until after the next one
+        env = SharedMemoryVecEnv([lambda: TippingPointEnv(4, copy_observations=False)] * 2, seed=0)
+        try:
+            obs = env.reset()
+            kept = {key: value.copy() for key, value in obs.items()}
+            next_obs, _, _, _ = env.step(np.array([1, 2]))
+        finally:
+            env.close()
+
+        self.assertTrue(any(np.any(kept[key] != next_obs[key]) for key in kept))
+        for key in kept:
+            np.testing.assert_array_equal(kept[key], obs[key], err_msg=key)
+
+
+if __name__ == "__main__":
+    unittest.main()
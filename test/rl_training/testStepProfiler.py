@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+import numpy as np
+from stable_baselines3.common.logger import Logger
+
+# The rl_training package imports entities as a top-level package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from entities.enumerations import ObservationMode
+from rl_training.environment import TippingPointEnv
+from rl_training.stepProfiler import StepProfiler
+
+
+def run(env, steps):
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    observations = []
+    for _ in range(steps):
+        obs, _, done, _ = env.step(env.action_space.sample())
+        observations.append(obs["entities"])
+        if done:
+            env.reset()
+    return observations
+
+
+class TestStepProfiler(unittest.TestCase):
+    def setUp(self):
+        self.env = TippingPointEnv(50, observation_mode=ObservationMode.ENTITY_LIST)
+        self.profiler = StepProfiler(track_allocations=True)
+        self.profiler.attach(self.env)
+
+    def test_breakdown(self):
+        run(self.env, 120)
+
+        phases = self.profiler.phases
+        self.assertEqual(phases["step"].calls, 120)
+        self.assertEqual(phases["reset"].calls, 3)
+        self.assertEqual(phases["observation"].calls, 120)
+        self.assertAlmostEqual(
+            sum(stats.own for name, stats in phases.items() if name != "reset"), phases["step"].total, places=6
+        )
+        self.assertEqual(self.profiler.counters["proximity_queries"], phases["adjacency"].calls * 2)
+        self.assertGreater(self.profiler.counters["entities_scanned"], 0)
+
+        rows = self.profiler.get_breakdown()
+        self.assertAlmostEqual(sum(row[3] for row in rows), 100)
+        self.assertIn("step (other)", self.profiler.format_breakdown())
+
+    def test_unchanged_behavior(self):
+        profiled = run(self.env, 60)
+        self.profiler.detach(self.env)
+
+        self.assertNotIn("step", self.env.__dict__)
+        self.assertIsNone(self.env._get_spatial_index(self.env.field_state.get_current_representation()).stats)
+        plain = run(TippingPointEnv(50, observation_mode=ObservationMode.ENTITY_LIST), 60)
+        for profiled_obs, obs in zip(profiled, plain):
+            np.testing.assert_array_equal(profiled_obs, obs)
+
+    def test_record(self):
+        run(self.env, 20)
+        logger = Logger(None, [])
+        self.profiler.record(logger)
+
+        self.assertIn("profile/observation_us", logger.name_to_value)
+        self.assertIn("profile/step_other_percent", logger.name_to_value)
+
+        self.profiler.reset_stats()
+        run(self.env, 10)
+        self.assertEqual(self.profiler.phases["step"].calls, 10)
+
+    def tearDown(self):
+        if "step" in self.env.__dict__:
+            self.profiler.detach(self.env)